@@ -23,5 +23,9 @@ def mock_requests():
         patch=mock.DEFAULT,
     )
     patcher.start()
+    # Used by the euphro tools client
+    session_patcher = mock.patch("requests.Session.request")
+    session_patcher.start()
     yield
+    session_patcher.stop()
     patcher.stop()
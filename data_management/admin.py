@@ -4,20 +4,17 @@ from uuid import UUID
 from django.contrib import admin, messages
 from django.contrib.admin import helpers
 from django.core.exceptions import PermissionDenied
-from django.db.models import (
-    CharField,
-    DateTimeField,
-    F,
-    OuterRef,
-    QuerySet,
-    Subquery,
-    UUIDField,
-)
+from django.db.models import F, QuerySet
 from django.db.models.functions import Coalesce
-from django.http import Http404, HttpRequest, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+)
 from django.template.defaultfilters import filesizeformat
 from django.template.response import TemplateResponse
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils import timezone
 from django.utils.formats import date_format
 from django.utils.html import format_html
@@ -27,6 +24,14 @@ from django.utils.translation import gettext_lazy as _
 
 from lab.admin.mixins import LabAdminAllowedMixin
 
+from .analytics import (
+    ANALYTICS_DEFAULT_PERIOD_DAYS,
+    ANALYTICS_PERIOD_DAYS,
+    THROUGHPUT_PERCENTILES,
+    ThroughputSummary,
+    get_backlog_forecast,
+    get_throughput_summaries,
+)
 from .models import (
     FromDataDeletionStatus,
     LifecycleOperation,
@@ -40,6 +45,7 @@ from .operations import (
     FromDataDeletionStartError,
     trigger_from_data_deletion,
 )
+from .progress import PROGRESS_POLL_SECONDS, get_operation_progress
 
 BADGE_CLASS_BY_STATE: dict[str, str] = {
     LifecycleState.HOT: "fr-badge fr-badge--success fr-badge--no-icon fr-badge--sm",
@@ -306,6 +312,7 @@ class ProjectDataAdmin(LabAdminAllowedMixin, admin.ModelAdmin):
         "cooling_eligible_at",
         "last_operation_lifecycle",
         "last_operation",
+        "last_operation_progress",
     )
     list_display_links = None
     list_filter = (
@@ -316,30 +323,17 @@ class ProjectDataAdmin(LabAdminAllowedMixin, admin.ModelAdmin):
     ordering = ("cooling_eligible_at", "project__name")
 
     def get_queryset(self, request: HttpRequest):
-        last_operation_queryset = (
-            LifecycleOperation.objects.filter(project_data_id=OuterRef("pk"))
-            .annotate(operation_sort_ts=Coalesce("started_at", "finished_at"))
-            .order_by(
-                F("operation_sort_ts").desc(nulls_last=True),
-                F("finished_at").desc(nulls_last=True),
-            )
-        )
         return (
             super()
             .get_queryset(request)
             .select_related("project")
             .annotate(
-                last_operation_id=Subquery(
-                    last_operation_queryset.values("operation_id")[:1],
-                    output_field=UUIDField(),
-                ),
-                last_operation_type=Subquery(
-                    last_operation_queryset.values("type")[:1],
-                    output_field=CharField(),
-                ),
-                last_operation_datetime=Subquery(
-                    last_operation_queryset.values("operation_sort_ts")[:1],
-                    output_field=DateTimeField(),
+                last_operation_id=F("last_lifecycle_operation_id"),
+                last_operation_type=F("last_lifecycle_operation__type"),
+                last_operation_status=F("last_lifecycle_operation__status"),
+                last_operation_datetime=Coalesce(
+                    "last_lifecycle_operation__started_at",
+                    "last_lifecycle_operation__finished_at",
                 ),
             )
         )
@@ -349,6 +343,88 @@ class ProjectDataAdmin(LabAdminAllowedMixin, admin.ModelAdmin):
         extra_context["title"] = gettext("Project data lifecycle")
         return super().changelist_view(request, extra_context)
 
+    def get_urls(self):
+        return [
+            path(
+                "analytics/",
+                self.admin_site.admin_view(self.analytics_view),
+                name="data_management_projectdata_analytics",
+            ),
+            path(
+                "<path:object_id>/progress/",
+                self.admin_site.admin_view(self.progress_view),
+                name="data_management_projectdata_progress",
+            ),
+            *super().get_urls(),
+        ]
+
+    def progress_view(self, request: HttpRequest, object_id: str) -> JsonResponse:
+        """Progress of the last operation of a project, polled by the
+        changelist."""
+        project_data = self.get_object(request, object_id)
+        if project_data is None or project_data.last_lifecycle_operation_id is None:
+            raise Http404
+        if not self.has_view_permission(request, obj=project_data):
+            raise PermissionDenied
+        operation = LifecycleOperation.objects.filter(
+            operation_id=project_data.last_lifecycle_operation_id
+        ).first()
+        if operation is None:
+            raise Http404
+        response = JsonResponse(get_operation_progress(operation))
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    def analytics_view(self, request: HttpRequest) -> TemplateResponse:
+        """Throughput of lifecycle operations and cooling backlog forecast."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        period = request.GET.get("period", "")
+        period_days = (
+            int(period)
+            if period in map(str, ANALYTICS_PERIOD_DAYS)
+            else ANALYTICS_DEFAULT_PERIOD_DAYS
+        )
+        context = {
+            **self.admin_site.each_context(request),
+            "title": gettext("Lifecycle throughput"),
+            "opts": self.model._meta,
+            "period_days": period_days,
+            "periods": ANALYTICS_PERIOD_DAYS,
+            "percentiles": THROUGHPUT_PERCENTILES,
+            "summaries": [
+                self._throughput_summary_row(summary)
+                for summary in get_throughput_summaries(period_days)
+            ],
+            "forecast": get_backlog_forecast(period_days),
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request, "admin/data_management/projectdata/analytics.html", context
+        )
+
+    @staticmethod
+    def _throughput_summary_row(summary: ThroughputSummary) -> dict:
+        def _format_rate(bytes_per_second: float | None) -> str | None:
+            if bytes_per_second is None:
+                return None
+            return "%s/s" % filesizeformat(bytes_per_second)
+
+        return {
+            "type": LifecycleOperationType(summary.type).label,
+            "succeeded_count": summary.succeeded_count,
+            "failed_count": summary.failed_count,
+            "failure_rate": (
+                summary.failure_rate * 100 if summary.failure_rate is not None else None
+            ),
+            "throughput": _format_rate(summary.bytes_per_second),
+            "files_per_second": summary.files_per_second,
+            "percentiles": [
+                _format_rate(summary.percentiles.get(percentile))
+                for percentile in THROUGHPUT_PERCENTILES
+            ],
+        }
+
     def has_add_permission(self, request: HttpRequest, obj=None) -> bool:
         return False
 
@@ -408,6 +484,10 @@ class ProjectDataAdmin(LabAdminAllowedMixin, admin.ModelAdmin):
     def _get_last_operation_id(obj: ProjectData) -> UUID | None:
         return obj.last_operation_id  # type: ignore[attr-defined]
 
+    @staticmethod
+    def _get_last_operation_status(obj: ProjectData) -> str | None:
+        return obj.last_operation_status  # type: ignore[attr-defined]
+
     @admin.display(description=_("Last operation lifecycle"))
     def last_operation_lifecycle(self, obj: ProjectData) -> str | None:
         operation_type = self._get_last_operation_type(obj)
@@ -442,6 +522,21 @@ class ProjectDataAdmin(LabAdminAllowedMixin, admin.ModelAdmin):
             ),
         )
 
+    @admin.display(description=_("Progress"))
+    def last_operation_progress(self, obj: ProjectData) -> str | None:
+        if self._get_last_operation_status(obj) not in (
+            LifecycleOperationStatus.PENDING,
+            LifecycleOperationStatus.RUNNING,
+        ):
+            return None
+        # Filled in by project-data-progress.js
+        return format_html(
+            '<span data-progress-url="{}" data-progress-poll-seconds="{}">'
+            "&hellip;</span>",
+            reverse("admin:data_management_projectdata_progress", args=[obj.pk]),
+            PROGRESS_POLL_SECONDS,
+        )
+
     @staticmethod
     def _operation_lifecycle_states(operation_type: str) -> tuple[str, str]:
         if operation_type == LifecycleOperationType.COOL:
@@ -0,0 +1,214 @@
+"""Throughput of lifecycle operations and forecast of the cooling backlog.
+
+Finished operations are aggregated by day and type in
+LifecycleOperationDailyStats. `refresh_daily_stats` only recomputes the days
+from the latest aggregated one, so that its cost does not grow with the
+history, and summaries are computed from the daily aggregates."""
+
+from __future__ import annotations
+
+import dataclasses
+import math
+from datetime import date, timedelta
+from typing import Iterable
+
+from django.db.models import BigIntegerField, Count, Max, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import (
+    LifecycleOperation,
+    LifecycleOperationDailyStats,
+    LifecycleOperationStatus,
+    LifecycleOperationType,
+)
+from .scheduler import (
+    annotate_estimated_size,
+    get_default_project_size,
+    get_eligible_projects,
+)
+
+ANALYTICS_PERIOD_DAYS = (7, 30, 90)
+ANALYTICS_DEFAULT_PERIOD_DAYS = 30
+THROUGHPUT_PERCENTILES = (50, 90, 99)
+
+
+@dataclasses.dataclass
+class ThroughputSummary:
+    type: str
+    succeeded_count: int = 0
+    failed_count: int = 0
+    bytes_total: int = 0
+    files_total: int = 0
+    duration_seconds: float = 0
+    # Bytes per second of operations, by percentile
+    percentiles: dict[int, float] = dataclasses.field(default_factory=dict)
+
+    @property
+    def failure_rate(self) -> float | None:
+        count = self.succeeded_count + self.failed_count
+        return self.failed_count / count if count else None
+
+    @property
+    def bytes_per_second(self) -> float | None:
+        if not self.duration_seconds:
+            return None
+        return self.bytes_total / self.duration_seconds
+
+    @property
+    def files_per_second(self) -> float | None:
+        if not self.duration_seconds:
+            return None
+        return self.files_total / self.duration_seconds
+
+
+@dataclasses.dataclass
+class BacklogForecast:
+    # Cooling-eligible HOT projects, as selected by the cooling scheduler
+    project_count: int
+    bytes_total: int
+    # Cooled per day over the period
+    projects_per_day: float
+    bytes_per_day: float
+    drain_date: date | None
+
+
+def refresh_daily_stats() -> int:
+    """Aggregate operations finished since the latest aggregated day (included,
+    as it may have been partial). Returns the number of aggregated days."""
+    operations = LifecycleOperation.objects.filter(
+        status__in=[
+            LifecycleOperationStatus.SUCCEEDED,
+            LifecycleOperationStatus.FAILED,
+        ],
+        finished_at__isnull=False,
+    )
+    latest_day = LifecycleOperationDailyStats.objects.aggregate(day=Max("day"))["day"]
+    if latest_day is not None:
+        operations = operations.filter(finished_at__date__gte=latest_day)
+
+    stats: dict[tuple[date, str], LifecycleOperationDailyStats] = {}
+    for operation in operations.only(
+        "type", "status", "started_at", "finished_at", "bytes_total", "files_total"
+    ).iterator():
+        day = timezone.localdate(operation.finished_at)
+        if (day, operation.type) not in stats:
+            stats[(day, operation.type)] = LifecycleOperationDailyStats(
+                day=day, type=operation.type, throughputs=[]
+            )
+        _add_operation(stats[(day, operation.type)], operation)
+
+    LifecycleOperationDailyStats.objects.bulk_create(
+        stats.values(),
+        update_conflicts=True,
+        unique_fields=["day", "type"],
+        update_fields=[
+            "succeeded_count",
+            "failed_count",
+            "bytes_total",
+            "files_total",
+            "duration_seconds",
+            "throughputs",
+        ],
+    )
+    return len({day for day, _ in stats})
+
+
+def get_throughput_summaries(period_days: int) -> list[ThroughputSummary]:
+    summaries = {
+        operation_type: ThroughputSummary(type=operation_type)
+        for operation_type in LifecycleOperationType.values
+    }
+    throughputs: dict[str, list[float]] = {
+        operation_type: [] for operation_type in summaries
+    }
+    for stats in _get_period_stats(period_days):
+        summary = summaries[stats.type]
+        summary.succeeded_count += stats.succeeded_count
+        summary.failed_count += stats.failed_count
+        summary.bytes_total += stats.bytes_total
+        summary.files_total += stats.files_total
+        summary.duration_seconds += stats.duration_seconds
+        throughputs[stats.type].extend(stats.throughputs)
+    for operation_type, summary in summaries.items():
+        summary.percentiles = _percentiles(throughputs[operation_type])
+    return list(summaries.values())
+
+
+def get_backlog_forecast(period_days: int) -> BacklogForecast:
+    """Forecast when the cooling backlog is drained, at the pace of the
+    cooling operations of the period. Projects becoming eligible in the
+    meantime are not accounted for."""
+    default_bytes_total, _ = get_default_project_size()
+    backlog = annotate_estimated_size(get_eligible_projects(timezone.now())).aggregate(
+        project_count=Count("pk"),
+        bytes_total=Sum(
+            Coalesce(
+                "estimated_bytes_total",
+                Value(default_bytes_total),
+                output_field=BigIntegerField(),
+            )
+        ),
+    )
+    cooled = [
+        stats
+        for stats in _get_period_stats(period_days)
+        if stats.type == LifecycleOperationType.COOL
+    ]
+    forecast = BacklogForecast(
+        project_count=backlog["project_count"],
+        bytes_total=backlog["bytes_total"] or 0,
+        projects_per_day=sum(stats.succeeded_count for stats in cooled) / period_days,
+        bytes_per_day=sum(stats.bytes_total for stats in cooled) / period_days,
+        drain_date=None,
+    )
+
+    if forecast.bytes_total and forecast.bytes_per_day:
+        drain_days = forecast.bytes_total / forecast.bytes_per_day
+    elif forecast.projects_per_day:
+        # Sizes of the backlog unknown
+        drain_days = forecast.project_count / forecast.projects_per_day
+    else:
+        return forecast
+    forecast.drain_date = timezone.localdate() + timedelta(days=math.ceil(drain_days))
+    return forecast
+
+
+def _get_period_stats(period_days: int) -> Iterable[LifecycleOperationDailyStats]:
+    return LifecycleOperationDailyStats.objects.filter(
+        day__gt=timezone.localdate() - timedelta(days=period_days)
+    )
+
+
+def _add_operation(
+    stats: LifecycleOperationDailyStats, operation: LifecycleOperation
+) -> None:
+    if operation.status == LifecycleOperationStatus.FAILED:
+        stats.failed_count += 1
+        return
+    stats.succeeded_count += 1
+    if (
+        operation.started_at is None
+        or operation.finished_at is None
+        or operation.bytes_total is None
+        or operation.files_total is None
+    ):
+        return
+    duration = (operation.finished_at - operation.started_at).total_seconds()
+    if duration <= 0:
+        return
+    stats.bytes_total += operation.bytes_total
+    stats.files_total += operation.files_total
+    stats.duration_seconds += duration
+    stats.throughputs.append(operation.bytes_total / duration)
+
+
+def _percentiles(values: list[float]) -> dict[int, float]:
+    """Nearest-rank percentiles."""
+    if not values:
+        return {}
+    values = sorted(values)
+    return {
+        percentile: values[max(math.ceil(percentile / 100 * len(values)) - 1, 0)]
+        for percentile in THROUGHPUT_PERCENTILES
+    }
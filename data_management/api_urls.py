@@ -30,4 +30,9 @@ urlpatterns = (
         api_views.LifecycleOperationCallbackAPIView.as_view(),
         name="operations-callback",
     ),
+    path(
+        "operations/callbacks",
+        api_views.LifecycleOperationCallbackBatchAPIView.as_view(),
+        name="operations-callback-batch",
+    ),
 )
@@ -1,14 +1,11 @@
 from __future__ import annotations
 
-import json
 import logging
 import uuid
-from typing import Any, cast
+from typing import Any
 
 from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
-from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
@@ -24,15 +21,18 @@ from lab.api_views.permissions import (
 )
 from lab.models import Project
 
-from .models import (
-    FromDataDeletionStatus,
-    LifecycleOperation,
-    LifecycleOperationStatus,
-    LifecycleOperationType,
-    LifecycleState,
-    ProjectData,
-    verify_operation,
+from .callbacks import (
+    CALLBACK_BATCH_CHUNK_SIZE,
+    FROM_DATA_DELETION_PHASE,
+    PROGRESS_PHASE,
+    LifecycleOperationCallbackSerializer,
+    apply_callback,
+    apply_callback_chunk,
+    get_callback_data,
+    get_locked_operation,
+    record_progress_callback,
 )
+from .models import LifecycleOperation, LifecycleState, ProjectData
 from .operations import (
     LifecycleOperationNotAllowedError,
     LifecycleOperationStartError,
@@ -44,20 +44,8 @@ from .serializers import LifecycleOperationDetailSerializer
 
 logger = logging.getLogger(__name__)
 
-TERMINAL_OPERATION_STATUSES = (
-    LifecycleOperationStatus.SUCCEEDED,
-    LifecycleOperationStatus.FAILED,
-)
-CALLBACK_STATUS_CHOICES = (
-    LifecycleOperationStatus.SUCCEEDED,
-    LifecycleOperationStatus.FAILED,
-)
-FROM_DATA_DELETION_PHASE = "FROM_DATA_DELETION"
-CALLBACK_PHASE_CHOICES = (FROM_DATA_DELETION_PHASE,)
-FROM_DATA_DELETION_STATUS_CHOICES = (
-    FromDataDeletionStatus.SUCCEEDED,
-    FromDataDeletionStatus.FAILED,
-)
+# Maximum number of callbacks of a batch
+CALLBACK_BATCH_MAX_SIZE = 1000
 
 
 class ProjectCoolTriggerAPIView(APIView):
@@ -149,97 +137,102 @@ class LifecycleOperationDetailAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class LifecycleOperationCallbackSerializer(serializers.Serializer):
-    operation_id = serializers.UUIDField()
-    phase = serializers.ChoiceField(
-        choices=CALLBACK_PHASE_CHOICES,
-        required=False,
-    )
-    status = serializers.ChoiceField(choices=CALLBACK_STATUS_CHOICES, required=False)
-    bytes_copied = serializers.IntegerField(
-        required=False, allow_null=True, min_value=0
-    )
-    files_copied = serializers.IntegerField(
-        required=False, allow_null=True, min_value=0
-    )
-    bytes_total = serializers.IntegerField(required=False, allow_null=True, min_value=0)
-    files_total = serializers.IntegerField(required=False, allow_null=True, min_value=0)
-    error_message = serializers.CharField(
-        required=False, allow_blank=True, allow_null=True
-    )
-    error_details = serializers.JSONField(required=False, allow_null=True)
-    from_data_deletion_status = serializers.ChoiceField(
-        choices=FROM_DATA_DELETION_STATUS_CHOICES,
-        required=False,
-    )
-    error = serializers.JSONField(required=False, allow_null=True)
+class LifecycleOperationCallbackAPIView(APIView):
+    authentication_classes = [EuphrosyneAdminJWTAuthentication]
+    permission_classes = [IsAuthenticated]
 
-    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
-        phase = attrs.get("phase")
-        if phase == FROM_DATA_DELETION_PHASE:
-            if "from_data_deletion_status" not in attrs:
-                raise serializers.ValidationError(
-                    {
-                        "from_data_deletion_status": _(
-                            "This field is required for deletion callbacks."
-                        )
-                    }
+    def post(self, request: Request) -> Response:
+        serializer = LifecycleOperationCallbackSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        callback_data = get_callback_data(serializer)
+
+        if callback_data.get("phase") == PROGRESS_PHASE:
+            record_progress_callback(callback_data)
+            return Response(status=status.HTTP_202_ACCEPTED)
+
+        with transaction.atomic():
+            operation = get_locked_operation(callback_data["operation_id"])
+            if operation is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            project_data = None
+            if callback_data.get("phase") != FROM_DATA_DELETION_PHASE:
+                project_data = ProjectData.objects.select_for_update().get(
+                    pk=operation.project_data_id
                 )
-            return attrs
+            apply_callback(operation, project_data, callback_data)
+
+        return Response(status=status.HTTP_200_OK)
 
-        if "status" not in attrs:
-            raise serializers.ValidationError({"status": _("This field is required.")})
-        return attrs
+
+class LifecycleOperationCallbackBatchSerializer(serializers.Serializer):
+    callbacks = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=CALLBACK_BATCH_MAX_SIZE,
+    )
 
     def create(self, validated_data: dict[str, Any]) -> dict[str, Any]:
-        raise NotImplementedError("LifecycleOperationCallbackSerializer is read-only.")
+        raise NotImplementedError(
+            "LifecycleOperationCallbackBatchSerializer is read-only."
+        )
 
     def update(self, instance: Any, validated_data: dict[str, Any]) -> Any:
-        raise NotImplementedError("LifecycleOperationCallbackSerializer is read-only.")
+        raise NotImplementedError(
+            "LifecycleOperationCallbackBatchSerializer is read-only."
+        )
 
 
-class LifecycleOperationCallbackAPIView(APIView):
+class LifecycleOperationCallbackBatchAPIView(APIView):
+    """Apply many callbacks in one request.
+
+    Callbacks are applied by chunks of CALLBACK_BATCH_CHUNK_SIZE, each in its
+    own transaction, in operation primary key order so that concurrent
+    batches lock rows in the same order. Results are returned in the order of
+    the request, with the status code the callback would have got alone."""
+
     authentication_classes = [EuphrosyneAdminJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request: Request) -> Response:
-        callback_data = self._validated_callback_data(request)
-        operation_id = callback_data["operation_id"]
-
-        with transaction.atomic():
-            operation = _get_locked_operation(operation_id)
-            if operation is None:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-
-            if callback_data.get("phase") == FROM_DATA_DELETION_PHASE:
-                _handle_from_data_deletion_callback(operation, callback_data)
-                return Response(status=status.HTTP_200_OK)
-
-            project_data = ProjectData.objects.select_for_update().get(
-                pk=operation.project_data_id
+        batch_serializer = LifecycleOperationCallbackBatchSerializer(data=request.data)
+        batch_serializer.is_valid(raise_exception=True)
+
+        results: list[dict[str, Any]] = []
+        callbacks: list[tuple[int, dict[str, Any]]] = []
+        for index, item in enumerate(batch_serializer.validated_data["callbacks"]):
+            serializer = LifecycleOperationCallbackSerializer(data=item)
+            if not serializer.is_valid():
+                results.append(
+                    {
+                        "operation_id": item.get("operation_id"),
+                        "status_code": status.HTTP_400_BAD_REQUEST,
+                        "errors": serializer.errors,
+                    }
+                )
+                continue
+            callback_data = get_callback_data(serializer)
+            results.append(
+                {
+                    "operation_id": str(callback_data["operation_id"]),
+                    "status_code": status.HTTP_200_OK,
+                }
             )
-
-            if operation.status in TERMINAL_OPERATION_STATUSES:
-                return Response(status=status.HTTP_200_OK)
-
-            callback_status = cast(str, callback_data["status"])
-            if callback_status == LifecycleOperationStatus.FAILED:
-                _handle_failed_callback(operation, project_data, callback_data)
+            if callback_data.get("phase") == PROGRESS_PHASE:
+                record_progress_callback(callback_data)
+                results[index]["status_code"] = status.HTTP_202_ACCEPTED
             else:
-                _handle_success_callback(operation, project_data, callback_data)
-
-        return Response(status=status.HTTP_200_OK)
+                callbacks.append((index, callback_data))
+
+        # Sorting is stable: callbacks of an operation keep their order
+        callbacks.sort(key=lambda callback: callback[1]["operation_id"])
+        for start in range(0, len(callbacks), CALLBACK_BATCH_CHUNK_SIZE):
+            end = start + CALLBACK_BATCH_CHUNK_SIZE
+            for index, found in apply_callback_chunk(callbacks[start:end]):
+                results[index]["status_code"] = (
+                    status.HTTP_200_OK if found else status.HTTP_404_NOT_FOUND
+                )
 
-    @staticmethod
-    def _validated_callback_data(request: Request) -> dict[str, Any]:
-        serializer = LifecycleOperationCallbackSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        data = dict(serializer.validated_data)
-        received_at = timezone.now()
-        data["received_at"] = received_at
-        if data.get("phase") != FROM_DATA_DELETION_PHASE:
-            data["finished_at"] = received_at
-        return data
+        return Response({"results": results}, status=status.HTTP_200_OK)
 
 
 class ProjectLifecycleAPIView(APIView):
@@ -251,7 +244,10 @@ class ProjectLifecycleAPIView(APIView):
 
     def get(self, request: Request, project_slug: str) -> Response:
 
-        project = get_object_or_404(Project, slug=project_slug)
+        project = get_object_or_404(
+            Project.objects.select_related("project_data__last_lifecycle_operation"),
+            slug=project_slug,
+        )
         project_data = ProjectData.for_project(project)
         last_operation = project_data.last_lifecycle_operation
 
@@ -265,202 +261,3 @@ class ProjectLifecycleAPIView(APIView):
             },
             status=status.HTTP_200_OK,
         )
-
-
-def _serialize_error_details(error_payload: Any) -> str | None:
-    if error_payload is None:
-        return None
-    if isinstance(error_payload, str):
-        return error_payload
-    return json.dumps(error_payload, sort_keys=True)
-
-
-def _transition_project_to_error(project_data: ProjectData) -> None:
-    if project_data.lifecycle_state == LifecycleState.ERROR:
-        return
-    if project_data.can_transition_to(LifecycleState.ERROR):
-        project_data.transition_to(LifecycleState.ERROR)
-    else:
-        logger.warning(
-            "Skipping invalid transition to ERROR for project_data=%s from state=%s",
-            project_data.pk,
-            project_data.lifecycle_state,
-        )
-
-
-def _verified_target_state(operation_type: str) -> LifecycleState:
-    if operation_type == LifecycleOperationType.COOL:
-        return LifecycleState.COOL
-    return LifecycleState.HOT
-
-
-def _get_locked_operation(operation_id: Any) -> LifecycleOperation | None:
-    try:
-        return (
-            LifecycleOperation.objects.select_for_update()
-            .select_related("project_data")
-            .get(operation_id=operation_id)
-        )
-    except LifecycleOperation.DoesNotExist:
-        return None
-
-
-def _handle_from_data_deletion_callback(
-    operation: LifecycleOperation,
-    callback_data: dict[str, Any],
-) -> None:
-    if operation.from_data_deletion_status == FromDataDeletionStatus.NOT_REQUESTED:
-        return
-
-    if operation.from_data_deletion_status in (
-        FromDataDeletionStatus.SUCCEEDED,
-        FromDataDeletionStatus.FAILED,
-    ):
-        return
-
-    deletion_status = cast(str, callback_data["from_data_deletion_status"])
-    if deletion_status == FromDataDeletionStatus.SUCCEEDED:
-        operation.from_data_deletion_status = FromDataDeletionStatus.SUCCEEDED
-        operation.from_data_deleted_at = callback_data["received_at"]
-        operation.from_data_deletion_error = None
-    else:
-        error_payload = callback_data.get("error")
-        operation.from_data_deletion_status = FromDataDeletionStatus.FAILED
-        operation.from_data_deleted_at = None
-        operation.from_data_deletion_error = (
-            _serialize_error_details(error_payload)
-            or "Tools API reported source data deletion failure."
-        )
-
-    operation.save(
-        update_fields=[
-            "from_data_deletion_status",
-            "from_data_deleted_at",
-            "from_data_deletion_error",
-        ]
-    )
-
-
-def _handle_failed_callback(
-    operation: LifecycleOperation,
-    project_data: ProjectData,
-    callback_data: dict[str, Any],
-) -> None:
-    error_message = cast(str | None, callback_data.get("error_message"))
-    error_details_payload = callback_data.get("error_details")
-
-    operation.status = LifecycleOperationStatus.FAILED
-    operation.error_message = error_message or "Tools API reported operation failure."
-    operation.error_details = _serialize_error_details(error_details_payload)
-    operation.finished_at = callback_data["finished_at"]
-    operation.save(
-        update_fields=[
-            "status",
-            "error_message",
-            "error_details",
-            "finished_at",
-        ]
-    )
-    _transition_project_to_error(project_data)
-
-
-def _handle_success_callback(
-    operation: LifecycleOperation,
-    project_data: ProjectData,
-    callback_data: dict[str, Any],
-) -> None:
-    bytes_copied = cast(int | None, callback_data.get("bytes_copied"))
-    files_copied = cast(int | None, callback_data.get("files_copied"))
-    bytes_total = cast(int | None, callback_data.get("bytes_total"))
-    files_total = cast(int | None, callback_data.get("files_total"))
-
-    operation.bytes_copied = bytes_copied
-    operation.files_copied = files_copied
-    if files_total is not None:
-        operation.files_total = files_total
-    if bytes_total is not None:
-        operation.bytes_total = bytes_total
-
-    if verify_operation(operation):
-        _handle_verified_success(operation, project_data, callback_data)
-        return
-
-    _handle_verification_failure(
-        operation,
-        project_data,
-        bytes_copied=bytes_copied,
-        files_copied=files_copied,
-        finished_at=callback_data["finished_at"],
-    )
-
-
-def _handle_verified_success(
-    operation: LifecycleOperation,
-    project_data: ProjectData,
-    callback_data: dict[str, Any],
-) -> None:
-    operation.status = LifecycleOperationStatus.SUCCEEDED
-    operation.error_message = None
-    operation.error_details = None
-    operation.finished_at = callback_data["finished_at"]
-
-    try:
-        project_data.transition_to(
-            _verified_target_state(operation.type), operation=operation
-        )
-    except ValueError as error:
-        operation.status = LifecycleOperationStatus.FAILED
-        operation.error_message = "Project lifecycle transition failed."
-        operation.error_details = str(error)
-        _transition_project_to_error(project_data)
-
-    operation.save(
-        update_fields=[
-            "status",
-            "bytes_total",
-            "files_total",
-            "bytes_copied",
-            "files_copied",
-            "error_message",
-            "error_details",
-            "finished_at",
-        ]
-    )
-
-
-def _handle_verification_failure(
-    operation: LifecycleOperation,
-    project_data: ProjectData,
-    *,
-    bytes_copied: int | None,
-    files_copied: int | None,
-    finished_at: Any,
-) -> None:
-    verification_error = {
-        "reason": "verification_mismatch",
-        "expected": {
-            "bytes_total": operation.bytes_total,
-            "files_total": operation.files_total,
-        },
-        "received": {
-            "bytes_copied": bytes_copied,
-            "files_copied": files_copied,
-        },
-    }
-    operation.status = LifecycleOperationStatus.FAILED
-    operation.error_message = "Verification failed."
-    operation.error_details = json.dumps(verification_error, sort_keys=True)
-    operation.finished_at = finished_at
-    operation.save(
-        update_fields=[
-            "status",
-            "bytes_total",
-            "files_total",
-            "bytes_copied",
-            "files_copied",
-            "error_message",
-            "error_details",
-            "finished_at",
-        ]
-    )
-    _transition_project_to_error(project_data)
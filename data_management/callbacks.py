@@ -0,0 +1,379 @@
+"""Callbacks of the tools API reporting the progress and the end of lifecycle
+operations, received by the callback endpoints or fetched by the reconciler."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, cast
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from .models import (
+    FromDataDeletionStatus,
+    LifecycleOperation,
+    LifecycleOperationStatus,
+    LifecycleOperationType,
+    LifecycleState,
+    ProjectData,
+    verify_operation,
+)
+from .progress import ProgressSample, record_progress
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_OPERATION_STATUSES = (
+    LifecycleOperationStatus.SUCCEEDED,
+    LifecycleOperationStatus.FAILED,
+)
+CALLBACK_STATUS_CHOICES = (
+    LifecycleOperationStatus.SUCCEEDED,
+    LifecycleOperationStatus.FAILED,
+)
+FROM_DATA_DELETION_PHASE = "FROM_DATA_DELETION"
+PROGRESS_PHASE = "PROGRESS"
+CALLBACK_PHASE_CHOICES = (FROM_DATA_DELETION_PHASE, PROGRESS_PHASE)
+# Maximum number of callbacks applied in a transaction
+CALLBACK_BATCH_CHUNK_SIZE = 50
+FROM_DATA_DELETION_STATUS_CHOICES = (
+    FromDataDeletionStatus.SUCCEEDED,
+    FromDataDeletionStatus.FAILED,
+)
+
+
+class LifecycleOperationCallbackSerializer(serializers.Serializer):
+    operation_id = serializers.UUIDField()
+    phase = serializers.ChoiceField(
+        choices=CALLBACK_PHASE_CHOICES,
+        required=False,
+    )
+    status = serializers.ChoiceField(choices=CALLBACK_STATUS_CHOICES, required=False)
+    bytes_copied = serializers.IntegerField(
+        required=False, allow_null=True, min_value=0
+    )
+    files_copied = serializers.IntegerField(
+        required=False, allow_null=True, min_value=0
+    )
+    bytes_total = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    files_total = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    error_message = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    error_details = serializers.JSONField(required=False, allow_null=True)
+    from_data_deletion_status = serializers.ChoiceField(
+        choices=FROM_DATA_DELETION_STATUS_CHOICES,
+        required=False,
+    )
+    error = serializers.JSONField(required=False, allow_null=True)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        phase = attrs.get("phase")
+        if phase == FROM_DATA_DELETION_PHASE:
+            if "from_data_deletion_status" not in attrs:
+                raise serializers.ValidationError(
+                    {
+                        "from_data_deletion_status": _(
+                            "This field is required for deletion callbacks."
+                        )
+                    }
+                )
+            return attrs
+
+        if phase == PROGRESS_PHASE:
+            if attrs.get("bytes_copied") is None and attrs.get("files_copied") is None:
+                raise serializers.ValidationError(
+                    _("Progress callbacks require bytes_copied or files_copied.")
+                )
+            return attrs
+
+        if "status" not in attrs:
+            raise serializers.ValidationError({"status": _("This field is required.")})
+        return attrs
+
+    def create(self, validated_data: dict[str, Any]) -> dict[str, Any]:
+        raise NotImplementedError("LifecycleOperationCallbackSerializer is read-only.")
+
+    def update(self, instance: Any, validated_data: dict[str, Any]) -> Any:
+        raise NotImplementedError("LifecycleOperationCallbackSerializer is read-only.")
+
+
+def get_callback_data(
+    serializer: LifecycleOperationCallbackSerializer,
+) -> dict[str, Any]:
+    data = dict(serializer.validated_data)
+    received_at = timezone.now()
+    data["received_at"] = received_at
+    if data.get("phase") is None:
+        data["finished_at"] = received_at
+    return data
+
+
+def record_progress_callback(callback_data: dict[str, Any]) -> None:
+    # Throttled, without locking: see data_management.progress
+    record_progress(
+        callback_data["operation_id"],
+        ProgressSample(
+            received_at=callback_data["received_at"],
+            bytes_copied=callback_data.get("bytes_copied"),
+            files_copied=callback_data.get("files_copied"),
+            bytes_total=callback_data.get("bytes_total"),
+            files_total=callback_data.get("files_total"),
+        ),
+    )
+
+
+def apply_callback(
+    operation: LifecycleOperation,
+    project_data: ProjectData | None,
+    callback_data: dict[str, Any],
+) -> None:
+    """Apply a status or deletion callback to a locked operation. The project
+    data must be locked too, except for deletion callbacks."""
+    if callback_data.get("phase") == FROM_DATA_DELETION_PHASE:
+        _handle_from_data_deletion_callback(operation, callback_data)
+        return
+
+    if operation.status in TERMINAL_OPERATION_STATUSES:
+        return
+
+    project_data = cast(ProjectData, project_data)
+    callback_status = cast(str, callback_data["status"])
+    if callback_status == LifecycleOperationStatus.FAILED:
+        _handle_failed_callback(operation, project_data, callback_data)
+    else:
+        _handle_success_callback(operation, project_data, callback_data)
+
+
+def apply_callback_chunk(
+    callbacks: list[tuple[int, dict[str, Any]]],
+) -> list[tuple[int, bool]]:
+    """Apply callbacks sorted by operation in a single transaction. Operations
+    then project data are locked in primary key order. Returns whether the
+    operation of each callback index was found."""
+    results: list[tuple[int, bool]] = []
+    with transaction.atomic():
+        operations = {
+            operation.pk: operation
+            for operation in LifecycleOperation.objects.select_for_update()
+            .filter(
+                operation_id__in={
+                    callback_data["operation_id"] for _, callback_data in callbacks
+                }
+            )
+            .order_by("pk")
+        }
+        project_datas = ProjectData.objects.select_for_update().in_bulk(
+            sorted({operation.project_data_id for operation in operations.values()})
+        )
+        for index, callback_data in callbacks:
+            operation = operations.get(callback_data["operation_id"])
+            if operation is None:
+                results.append((index, False))
+                continue
+            # Share the locked instance, e.g. for lifecycle transitions
+            operation.project_data = project_datas[operation.project_data_id]
+            apply_callback(operation, operation.project_data, callback_data)
+            results.append((index, True))
+    return results
+
+
+def _serialize_error_details(error_payload: Any) -> str | None:
+    if error_payload is None:
+        return None
+    if isinstance(error_payload, str):
+        return error_payload
+    return json.dumps(error_payload, sort_keys=True)
+
+
+def _transition_project_to_error(project_data: ProjectData) -> None:
+    if project_data.lifecycle_state == LifecycleState.ERROR:
+        return
+    if project_data.can_transition_to(LifecycleState.ERROR):
+        project_data.transition_to(LifecycleState.ERROR)
+    else:
+        logger.warning(
+            "Skipping invalid transition to ERROR for project_data=%s from state=%s",
+            project_data.pk,
+            project_data.lifecycle_state,
+        )
+
+
+def _verified_target_state(operation_type: str) -> LifecycleState:
+    if operation_type == LifecycleOperationType.COOL:
+        return LifecycleState.COOL
+    return LifecycleState.HOT
+
+
+def get_locked_operation(operation_id: Any) -> LifecycleOperation | None:
+    try:
+        return (
+            LifecycleOperation.objects.select_for_update()
+            .select_related("project_data")
+            .get(operation_id=operation_id)
+        )
+    except LifecycleOperation.DoesNotExist:
+        return None
+
+
+def _handle_from_data_deletion_callback(
+    operation: LifecycleOperation,
+    callback_data: dict[str, Any],
+) -> None:
+    if operation.from_data_deletion_status == FromDataDeletionStatus.NOT_REQUESTED:
+        return
+
+    if operation.from_data_deletion_status in (
+        FromDataDeletionStatus.SUCCEEDED,
+        FromDataDeletionStatus.FAILED,
+    ):
+        return
+
+    deletion_status = cast(str, callback_data["from_data_deletion_status"])
+    if deletion_status == FromDataDeletionStatus.SUCCEEDED:
+        operation.from_data_deletion_status = FromDataDeletionStatus.SUCCEEDED
+        operation.from_data_deleted_at = callback_data["received_at"]
+        operation.from_data_deletion_error = None
+    else:
+        error_payload = callback_data.get("error")
+        operation.from_data_deletion_status = FromDataDeletionStatus.FAILED
+        operation.from_data_deleted_at = None
+        operation.from_data_deletion_error = (
+            _serialize_error_details(error_payload)
+            or "Tools API reported source data deletion failure."
+        )
+
+    operation.save(
+        update_fields=[
+            "from_data_deletion_status",
+            "from_data_deleted_at",
+            "from_data_deletion_error",
+        ]
+    )
+
+
+def _handle_failed_callback(
+    operation: LifecycleOperation,
+    project_data: ProjectData,
+    callback_data: dict[str, Any],
+) -> None:
+    error_message = cast(str | None, callback_data.get("error_message"))
+    error_details_payload = callback_data.get("error_details")
+
+    operation.status = LifecycleOperationStatus.FAILED
+    operation.error_message = error_message or "Tools API reported operation failure."
+    operation.error_details = _serialize_error_details(error_details_payload)
+    operation.finished_at = callback_data["finished_at"]
+    operation.save(
+        update_fields=[
+            "status",
+            "error_message",
+            "error_details",
+            "finished_at",
+        ]
+    )
+    _transition_project_to_error(project_data)
+
+
+def _handle_success_callback(
+    operation: LifecycleOperation,
+    project_data: ProjectData,
+    callback_data: dict[str, Any],
+) -> None:
+    bytes_copied = cast(int | None, callback_data.get("bytes_copied"))
+    files_copied = cast(int | None, callback_data.get("files_copied"))
+    bytes_total = cast(int | None, callback_data.get("bytes_total"))
+    files_total = cast(int | None, callback_data.get("files_total"))
+
+    operation.bytes_copied = bytes_copied
+    operation.files_copied = files_copied
+    if files_total is not None:
+        operation.files_total = files_total
+    if bytes_total is not None:
+        operation.bytes_total = bytes_total
+
+    if verify_operation(operation):
+        _handle_verified_success(operation, project_data, callback_data)
+        return
+
+    _handle_verification_failure(
+        operation,
+        project_data,
+        bytes_copied=bytes_copied,
+        files_copied=files_copied,
+        finished_at=callback_data["finished_at"],
+    )
+
+
+def _handle_verified_success(
+    operation: LifecycleOperation,
+    project_data: ProjectData,
+    callback_data: dict[str, Any],
+) -> None:
+    operation.status = LifecycleOperationStatus.SUCCEEDED
+    operation.error_message = None
+    operation.error_details = None
+    operation.finished_at = callback_data["finished_at"]
+
+    try:
+        project_data.transition_to(
+            _verified_target_state(operation.type), operation=operation
+        )
+    except ValueError as error:
+        operation.status = LifecycleOperationStatus.FAILED
+        operation.error_message = "Project lifecycle transition failed."
+        operation.error_details = str(error)
+        _transition_project_to_error(project_data)
+
+    operation.save(
+        update_fields=[
+            "status",
+            "bytes_total",
+            "files_total",
+            "bytes_copied",
+            "files_copied",
+            "error_message",
+            "error_details",
+            "finished_at",
+        ]
+    )
+
+
+def _handle_verification_failure(
+    operation: LifecycleOperation,
+    project_data: ProjectData,
+    *,
+    bytes_copied: int | None,
+    files_copied: int | None,
+    finished_at: Any,
+) -> None:
+    verification_error = {
+        "reason": "verification_mismatch",
+        "expected": {
+            "bytes_total": operation.bytes_total,
+            "files_total": operation.files_total,
+        },
+        "received": {
+            "bytes_copied": bytes_copied,
+            "files_copied": files_copied,
+        },
+    }
+    operation.status = LifecycleOperationStatus.FAILED
+    operation.error_message = "Verification failed."
+    operation.error_details = json.dumps(verification_error, sort_keys=True)
+    operation.finished_at = finished_at
+    operation.save(
+        update_fields=[
+            "status",
+            "bytes_total",
+            "files_total",
+            "bytes_copied",
+            "files_copied",
+            "error_message",
+            "error_details",
+            "finished_at",
+        ]
+    )
+    _transition_project_to_error(project_data)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import threading
 from datetime import date, datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max, Q
 from django.utils import timezone
 
 if TYPE_CHECKING:
@@ -72,3 +75,103 @@ def sync_project_cooling_eligible_at(project: Project) -> ProjectData:
         project_data.save(update_fields=["cooling_eligible_at"])
 
     return project_data
+
+
+# Projects marked for an eligibility sync, by database alias. Connections are
+# per thread, and so is the registry.
+_pending_syncs = threading.local()
+
+
+def _get_pending_project_ids(using: str) -> set[int]:
+    if not hasattr(_pending_syncs, "project_ids"):
+        _pending_syncs.project_ids = {}
+    return _pending_syncs.project_ids.setdefault(using, set())
+
+
+def _flush_pending_syncs(using: str) -> None:
+    project_ids = _get_pending_project_ids(using)
+    if project_ids:
+        sync_many(set(project_ids))
+        project_ids.clear()
+
+
+def schedule_cooling_eligible_at_sync(
+    project_id: int, using: str = DEFAULT_DB_ALIAS
+) -> None:
+    """Sync the eligibility of a project once the current transaction is
+    committed. Projects marked several times in a transaction are synced once,
+    with the other marked projects (immediately in autocommit mode).
+
+    Every call registers a callback, as Django drops callbacks of rolled back
+    blocks: the first one run flushes the registry, the others find it empty.
+    Projects marked in a rolled back block are synced with the next commit,
+    which is harmless as a sync recomputes the eligibility."""
+    _get_pending_project_ids(using).add(project_id)
+    transaction.on_commit(lambda: _flush_pending_syncs(using), using=using)
+
+
+def sync_many(project_ids: Iterable[int]) -> int:
+    """Sync the eligibility of several projects (see
+    sync_project_cooling_eligible_at) with a constant number of queries.
+    Returns the number of created or updated ProjectData."""
+    # pylint: disable=import-outside-toplevel
+    from lab.projects.models import Project
+
+    from .models import ProjectData
+
+    project_ids = set(project_ids)
+    if not project_ids:
+        return 0
+    projects = Project.objects.filter(pk__in=project_ids).annotate(
+        latest_embargo_date=Max("runs__embargo_date"),
+        latest_non_embargo_end_date=Max(
+            "runs__end_date", filter=Q(runs__embargo_date__isnull=True)
+        ),
+    )
+    project_data_by_project_id = {
+        project_data.project_id: project_data
+        for project_data in ProjectData.objects.filter(project_id__in=project_ids)
+    }
+    to_create: list[ProjectData] = []
+    to_update: list[ProjectData] = []
+    for project in projects:
+        cooling_eligible_at = _compute_cooling_eligible_at_from_dates(
+            created=project.created,
+            latest_embargo_date=project.latest_embargo_date,  # type: ignore
+            latest_non_embargo_end_date=(
+                project.latest_non_embargo_end_date  # type: ignore
+            ),
+        )
+        project_data = project_data_by_project_id.get(project.pk)
+        if project_data is None:
+            to_create.append(
+                ProjectData(project=project, cooling_eligible_at=cooling_eligible_at)
+            )
+        elif project_data.cooling_eligible_at != cooling_eligible_at:
+            project_data.cooling_eligible_at = cooling_eligible_at
+            to_update.append(project_data)
+    ProjectData.objects.bulk_create(to_create, ignore_conflicts=True)
+    ProjectData.objects.bulk_update(to_update, ["cooling_eligible_at"])
+    return len(to_create) + len(to_update)
+
+
+def _compute_cooling_eligible_at_from_dates(
+    *,
+    created: datetime | None,
+    latest_embargo_date: date | None,
+    latest_non_embargo_end_date: datetime | None,
+) -> date:
+    """Same as compute_cooling_eligible_at, from aggregated run dates."""
+    candidates = [
+        candidate
+        for candidate in (
+            latest_embargo_date,
+            _run_cooling_eligible_at(
+                end_date=latest_non_embargo_end_date, embargo_date=None
+            ),
+        )
+        if candidate is not None
+    ]
+    if candidates:
+        return max(candidates)
+    return _datetime_to_date((created or timezone.now()) + COOLING_DELAY_DELTA)
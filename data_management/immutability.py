@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import contextlib
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 from django.core.exceptions import PermissionDenied
 from django.utils.translation import gettext_lazy as _
@@ -21,6 +23,12 @@ IMMUTABLE_LIFECYCLE_STATES = frozenset(
     }
 )
 PROJECT_IMMUTABLE_ERROR = "PROJECT_IMMUTABLE"
+
+# Lifecycle states by project id, for the current request (see
+# LifecycleStateCacheMiddleware). None outside of requests.
+_request_lifecycle_states: ContextVar[dict[int, str] | None] = ContextVar(
+    "request_lifecycle_states", default=None
+)
 PROJECT_IMMUTABLE_MESSAGE = _(
     "Project is read-only while lifecycle_state is COOL or COOLING. "
     "Restore the project to HOT to modify files or create runs."
@@ -48,12 +56,51 @@ def is_lifecycle_state_immutable(lifecycle_state: str) -> bool:
     return lifecycle_state in IMMUTABLE_LIFECYCLE_STATES
 
 
+@contextlib.contextmanager
+def lifecycle_state_cache() -> Iterator[None]:
+    """Memoize lifecycle states looked up in the block."""
+    token = _request_lifecycle_states.set({})
+    try:
+        yield
+    finally:
+        _request_lifecycle_states.reset(token)
+
+
+def forget_lifecycle_state(project_id: int) -> None:
+    states = _request_lifecycle_states.get()
+    if states is not None:
+        states.pop(project_id, None)
+
+
+def get_lifecycle_state(project: "Project") -> str:
+    """Return the lifecycle state of a project without any side effect.
+
+    Projects without ProjectData are HOT: eligibility is neither computed nor
+    stored here (see ProjectData.for_project)."""
+    project_data_field = ProjectData._meta.get_field("project").remote_field
+    if project_data_field.is_cached(project):  # type: ignore[union-attr]
+        try:
+            return project.project_data.lifecycle_state  # type: ignore[union-attr]
+        except ProjectData.DoesNotExist:
+            return LifecycleState.HOT
+    states = _request_lifecycle_states.get()
+    if states is not None and project.pk in states:
+        return states[project.pk]
+    lifecycle_state = (
+        ProjectData.objects.filter(project_id=project.pk)
+        .values_list("lifecycle_state", flat=True)
+        .first()
+    ) or LifecycleState.HOT
+    if states is not None:
+        states[project.pk] = lifecycle_state
+    return lifecycle_state
+
+
 def is_project_data_immutable(project: "Project") -> bool:
-    project_data = ProjectData.for_project(project)
-    return is_lifecycle_state_immutable(project_data.lifecycle_state)
+    return is_lifecycle_state_immutable(get_lifecycle_state(project))
 
 
 def ensure_project_data_writable(project: "Project") -> None:
-    project_data = ProjectData.for_project(project)
-    if is_lifecycle_state_immutable(project_data.lifecycle_state):
-        raise ProjectImmutableError(lifecycle_state=project_data.lifecycle_state)
+    lifecycle_state = get_lifecycle_state(project)
+    if is_lifecycle_state_immutable(lifecycle_state):
+        raise ProjectImmutableError(lifecycle_state=lifecycle_state)
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from data_management.reconciler import (
+    STUCK_OPERATION_TIMEOUT_HOURS,
+    reconcile_stuck_operations,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Ask the tools API the status of lifecycle operations stuck in PENDING or "
+        "RUNNING, and apply it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout-hours",
+            type=float,
+            default=STUCK_OPERATION_TIMEOUT_HOURS,
+            help="Hours without activity after which an operation is checked.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        report = reconcile_stuck_operations(
+            timeout=timedelta(hours=options["timeout_hours"])
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Checked %s operation(s): %s reconciled, %s failed, %s running, "
+                "%s error(s)."
+                % (
+                    report.checked,
+                    report.reconciled,
+                    report.failed,
+                    report.running,
+                    report.errors,
+                )
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from data_management.analytics import refresh_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Aggregate finished lifecycle operations by day for the analytics page."
+
+    def handle(self, *args, **options) -> None:
+        day_count = refresh_daily_stats()
+        self.stdout.write(
+            self.style.SUCCESS("Aggregated %s day(s) of operations." % day_count)
+        )
@@ -1,15 +1,85 @@
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand
 
-from data_management.scheduler import run_cooling_scheduler
+from data_management.scheduler import (
+    COOLING_BATCH_LIMIT,
+    COOLING_DISPATCH_CONCURRENCY,
+    COOLING_MAX_BATCH_SIZE,
+    CoolingBudget,
+    estimate_cooling_budget,
+    run_cooling_scheduler,
+)
 
 
 class Command(BaseCommand):
     help = "Schedule eligible projects for daily cooling."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window-hours",
+            type=float,
+            help=(
+                "Length of the cooling window. The amount of data to cool is "
+                "estimated from the throughput of previous cooling operations."
+            ),
+        )
+        parser.add_argument(
+            "--max-bytes", type=int, help="Maximum number of bytes to cool."
+        )
+        parser.add_argument(
+            "--max-files", type=int, help="Maximum number of files to cool."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help=(
+                "Number of cooling requests sent at once "
+                "(default: %s with a budget, 1 otherwise)."
+                % COOLING_DISPATCH_CONCURRENCY
+            ),
+        )
+
     def handle(self, *args, **options) -> None:
-        enqueued_count = run_cooling_scheduler()
+        budget = self._get_budget(options)
+        if budget is None:
+            enqueued_count = run_cooling_scheduler(
+                concurrency=options["concurrency"] or 1
+            )
+        else:
+            self.stdout.write(
+                "Cooling budget: %s byte(s), %s file(s)." % (budget.bytes, budget.files)
+            )
+            enqueued_count = run_cooling_scheduler(
+                limit=COOLING_MAX_BATCH_SIZE,
+                budget=budget,
+                concurrency=options["concurrency"] or COOLING_DISPATCH_CONCURRENCY,
+            )
         self.stdout.write(
             self.style.SUCCESS(
                 "Cooling scheduler completed. Enqueued %s project(s)." % enqueued_count
             )
         )
+
+    def _get_budget(self, options) -> CoolingBudget | None:
+        budget = None
+        if options["window_hours"] is not None:
+            budget = estimate_cooling_budget(timedelta(hours=options["window_hours"]))
+            if budget is None:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "No cooling history to estimate a budget from. "
+                        "Scheduling at most %s project(s)." % COOLING_BATCH_LIMIT
+                    )
+                )
+        if options["max_bytes"] is not None or options["max_files"] is not None:
+            budget = budget or CoolingBudget()
+            budget.bytes = _min(budget.bytes, options["max_bytes"])
+            budget.files = _min(budget.files, options["max_files"])
+        return budget
+
+
+def _min(value: int | None, limit: int | None) -> int | None:
+    if value is None or limit is None:
+        return limit if value is None else value
+    return min(value, limit)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from data_management.eligibility import sync_many
+from lab.projects.models import Project
+
+# Number of projects synced per batch of queries
+SYNC_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Recompute cooling eligibility of all projects."
+
+    def handle(self, *args, **options) -> None:
+        project_ids = list(Project.objects.values_list("pk", flat=True))
+        synced_count = 0
+        for start in range(0, len(project_ids), SYNC_BATCH_SIZE):
+            end = start + SYNC_BATCH_SIZE
+            synced_count += sync_many(project_ids[start:end])
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Updated cooling eligibility of %s project(s)." % synced_count
+            )
+        )
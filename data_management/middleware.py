@@ -0,0 +1,12 @@
+from .immutability import lifecycle_state_cache
+
+
+class LifecycleStateCacheMiddleware:
+    """Look up the lifecycle state of a project at most once per request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with lifecycle_state_cache():
+            return self.get_response(request)
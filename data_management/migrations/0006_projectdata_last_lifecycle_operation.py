@@ -0,0 +1,48 @@
+# Generated by Django 6.0.7 on 2026-10-18 03:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_last_lifecycle_operation(apps, schema_editor):
+    LifecycleOperation = apps.get_model("data_management", "LifecycleOperation")
+    ProjectData = apps.get_model("data_management", "ProjectData")
+
+    last_operations = (
+        LifecycleOperation.objects.filter(project_data_id=OuterRef("pk"))
+        .annotate(operation_sort_ts=Coalesce("started_at", "finished_at"))
+        .order_by(
+            F("operation_sort_ts").desc(nulls_last=True),
+            F("finished_at").desc(nulls_last=True),
+        )
+    )
+    ProjectData.objects.update(
+        last_lifecycle_operation=Subquery(last_operations.values("operation_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("data_management", "0005_lifecycleoperation_from_data_deletion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="projectdata",
+            name="last_lifecycle_operation",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="data_management.lifecycleoperation",
+            ),
+        ),
+        migrations.RunPython(
+            backfill_last_lifecycle_operation,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.7 on 2026-10-18 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("data_management", "0006_projectdata_last_lifecycle_operation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lifecycleoperation",
+            name="progress_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
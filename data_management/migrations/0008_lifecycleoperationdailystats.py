@@ -0,0 +1,48 @@
+# Generated by Django 6.0.7 on 2026-10-18 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("data_management", "0007_lifecycleoperation_progress_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LifecycleOperationDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[("COOL", "Cool"), ("RESTORE", "Restore")],
+                        max_length=16,
+                    ),
+                ),
+                ("succeeded_count", models.PositiveIntegerField(default=0)),
+                ("failed_count", models.PositiveIntegerField(default=0)),
+                ("bytes_total", models.PositiveBigIntegerField(default=0)),
+                ("files_total", models.PositiveBigIntegerField(default=0)),
+                ("duration_seconds", models.FloatField(default=0)),
+                ("throughputs", models.JSONField(default=list)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "type"), name="unique_lifecycle_daily_stats"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -10,7 +10,7 @@ import uuid
 from typing import TYPE_CHECKING
 
 from django.db import models
-from django.db.models import F
+from django.db.models import F, OuterRef, QuerySet, Subquery
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -71,6 +71,8 @@ class LifecycleOperation(models.Model):
     files_total = models.PositiveBigIntegerField(null=True, blank=True)
     bytes_copied = models.PositiveBigIntegerField(null=True, blank=True)
     files_copied = models.PositiveBigIntegerField(null=True, blank=True)
+    # Last write of bytes_copied / files_copied by a progress callback
+    progress_updated_at = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(null=True, blank=True)
     error_details = models.TextField(null=True, blank=True)
     from_data_deletion_status = models.CharField(
@@ -96,6 +98,14 @@ class ProjectData(models.Model):
         default=LifecycleState.HOT,
     )
     cooling_eligible_at = models.DateField(null=True, blank=True)
+    # Latest operation (see last_lifecycle_operations), maintained by signals
+    last_lifecycle_operation = models.ForeignKey(
+        LifecycleOperation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
 
     @classmethod
     def for_project(cls, project: Project) -> "ProjectData":
@@ -111,19 +121,6 @@ class ProjectData(models.Model):
             project_data.save(update_fields=["cooling_eligible_at"])
         return project_data
 
-    @property
-    def last_lifecycle_operation(self) -> LifecycleOperation | None:
-        return (
-            self.lifecycle_operations.annotate(
-                operation_sort_ts=Coalesce("started_at", "finished_at")
-            )
-            .order_by(
-                F("operation_sort_ts").desc(nulls_last=True),
-                F("finished_at").desc(nulls_last=True),
-            )
-            .first()
-        )
-
     def is_cooling_eligible(self) -> bool:
         """Return True when cooling_eligible_at is set and in the past."""
         if self.cooling_eligible_at is None:
@@ -192,6 +189,54 @@ class ProjectData(models.Model):
         ]
 
 
+class LifecycleOperationDailyStats(models.Model):
+    """Aggregates of the lifecycle operations finished on a day, maintained by
+    data_management.analytics."""
+
+    day = models.DateField()
+    type = models.CharField(max_length=16, choices=LifecycleOperationType.choices)
+    succeeded_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    # Totals of succeeded operations with a known size and duration
+    bytes_total = models.PositiveBigIntegerField(default=0)
+    files_total = models.PositiveBigIntegerField(default=0)
+    duration_seconds = models.FloatField(default=0)
+    # Bytes per second of each of these operations, for percentiles
+    throughputs = models.JSONField(default=list)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "type"], name="unique_lifecycle_daily_stats"
+            )
+        ]
+
+
+def last_lifecycle_operations(
+    project_data_id: int | OuterRef,
+) -> QuerySet[LifecycleOperation]:
+    """Operations of a project, latest first: by start date, or by end date
+    for operations which were never started."""
+    return (
+        LifecycleOperation.objects.filter(project_data_id=project_data_id)
+        .annotate(operation_sort_ts=Coalesce("started_at", "finished_at"))
+        .order_by(
+            F("operation_sort_ts").desc(nulls_last=True),
+            F("finished_at").desc(nulls_last=True),
+        )
+    )
+
+
+def refresh_last_lifecycle_operation(project_data_id: int) -> None:
+    """Point ProjectData.last_lifecycle_operation to the latest operation, in a
+    single UPDATE statement."""
+    ProjectData.objects.filter(pk=project_data_id).update(
+        last_lifecycle_operation=Subquery(
+            last_lifecycle_operations(OuterRef("pk")).values("operation_id")[:1]
+        )
+    )
+
+
 def verify_operation(
     operation: "LifecycleOperation",
 ) -> bool:
@@ -243,9 +243,10 @@ def _get_locked_project_data(project_id: int) -> ProjectData | None:
         return None
 
     project_data = ProjectData.for_project(project)
+    # The last operation is joined for retry checks, but not locked
     return (
-        ProjectData.objects.select_for_update()
-        .select_related("project")
+        ProjectData.objects.select_for_update(of=("self", "project"))
+        .select_related("project", "last_lifecycle_operation")
         .get(pk=project_data.pk)
     )
 
@@ -0,0 +1,94 @@
+"""Progress of running lifecycle operations, reported by the tools API.
+
+Progress callbacks can be frequent. A sample is written to the operation row at
+most once every PROGRESS_WRITE_INTERVAL_SECONDS with a single conditional
+UPDATE, so that no row is locked while the interval has not elapsed. A sample
+completing the copy is always written, so the final progress is never dropped.
+The row is the only store of progress, shared by every worker: the admin polls
+it."""
+
+from __future__ import annotations
+
+import dataclasses
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.db.models import Q
+
+from .models import LifecycleOperation, LifecycleOperationStatus
+from .serializers import compute_progress
+
+PROGRESS_WRITE_INTERVAL_SECONDS = 30
+# Delay between two progress requests of the admin changelist
+PROGRESS_POLL_SECONDS = 15
+
+
+@dataclasses.dataclass
+class ProgressSample:
+    received_at: datetime
+    bytes_copied: int | None = None
+    files_copied: int | None = None
+    bytes_total: int | None = None
+    files_total: int | None = None
+
+
+def record_progress(operation_id: uuid.UUID | str, sample: ProgressSample) -> bool:
+    """Write the sample to a running operation if its last write is old
+    enough or if it completes the copy. Returns True if the row was written."""
+    fields = {
+        name: value
+        for name, value in dataclasses.asdict(sample).items()
+        if name != "received_at" and value is not None
+    }
+    return bool(
+        LifecycleOperation.objects.filter(
+            Q(progress_updated_at__isnull=True)
+            | Q(
+                progress_updated_at__lte=sample.received_at
+                - timedelta(seconds=PROGRESS_WRITE_INTERVAL_SECONDS)
+            )
+            | _completed_query("bytes", sample.bytes_copied, sample.bytes_total)
+            | _completed_query("files", sample.files_copied, sample.files_total),
+            operation_id=operation_id,
+            status=LifecycleOperationStatus.RUNNING,
+        ).update(progress_updated_at=sample.received_at, **fields)
+    )
+
+
+def _completed_query(unit: str, copied: int | None, total: int | None) -> Q:
+    """Match operations of which the sample copied all bytes (or files), its
+    total defaulting to the one already written."""
+    if copied is None:
+        return Q(pk__isnull=True)
+    if total is not None:
+        # Always true, or always false (an empty Q would be dropped from an OR)
+        return Q(pk__isnull=not 0 < total <= copied)
+    return Q(**{f"{unit}_total__gt": 0, f"{unit}_total__lte": copied})
+
+
+def get_operation_progress(operation: LifecycleOperation) -> dict[str, Any]:
+    """Latest written progress of an operation and its average throughput."""
+    updated_at = operation.progress_updated_at or operation.finished_at
+    bytes_per_second = None
+    if updated_at and operation.started_at and operation.bytes_copied:
+        elapsed = (updated_at - operation.started_at).total_seconds()
+        if elapsed > 0:
+            bytes_per_second = operation.bytes_copied / elapsed
+
+    return {
+        "operation_id": operation.operation_id,
+        "status": operation.status,
+        "bytes_copied": operation.bytes_copied,
+        "files_copied": operation.files_copied,
+        "bytes_total": operation.bytes_total,
+        "files_total": operation.files_total,
+        "progress": compute_progress(
+            bytes_total=operation.bytes_total,
+            bytes_copied=operation.bytes_copied,
+            files_total=operation.files_total,
+            files_copied=operation.files_copied,
+        ),
+        "bytes_per_second": bytes_per_second,
+        "updated_at": updated_at,
+    }
@@ -0,0 +1,186 @@
+"""Reconciliation of lifecycle operations stuck in PENDING or RUNNING, e.g.
+when the tools API crashed or a callback was lost.
+
+Such operations block further operations of their project and hide it from the
+cooling scheduler. Their status is asked to the tools API and applied like
+callbacks. Operations unknown to the tools API are marked FAILED."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import uuid
+from datetime import timedelta
+from typing import Any
+
+import requests
+from django.db.models import QuerySet
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from euphro_tools.project_data import post_lifecycle_operations_status
+
+from .callbacks import (
+    CALLBACK_BATCH_CHUNK_SIZE,
+    LifecycleOperationCallbackSerializer,
+    apply_callback_chunk,
+    get_callback_data,
+)
+from .models import LifecycleOperation, LifecycleOperationStatus
+
+logger = logging.getLogger(__name__)
+
+# Operations without activity (start or progress) for this long are checked
+STUCK_OPERATION_TIMEOUT_HOURS = 24
+# Number of operations of a status request to the tools API
+RECONCILE_BATCH_SIZE = 100
+TOOLS_API_TIMEOUT_SECONDS = 30
+UNKNOWN_OPERATION_ERROR_MESSAGE = "Operation unknown to tools API."
+ACTIVE_OPERATION_STATUSES = (
+    LifecycleOperationStatus.PENDING,
+    LifecycleOperationStatus.RUNNING,
+)
+
+
+@dataclasses.dataclass
+class ReconcileReport:
+    checked: int = 0
+    # Operations which ended according to the tools API
+    reconciled: int = 0
+    # Operations unknown to the tools API, marked FAILED
+    failed: int = 0
+    # Operations still in progress according to the tools API
+    running: int = 0
+    # Operations which could not be checked
+    errors: int = 0
+
+
+def get_stuck_operations(timeout: timedelta) -> QuerySet[LifecycleOperation]:
+    return (
+        LifecycleOperation.objects.annotate(
+            last_activity_at=Coalesce("progress_updated_at", "started_at")
+        )
+        .filter(
+            status__in=ACTIVE_OPERATION_STATUSES,
+            last_activity_at__lte=timezone.now() - timeout,
+        )
+        .order_by("pk")
+    )
+
+
+def reconcile_stuck_operations(
+    *,
+    timeout: timedelta = timedelta(hours=STUCK_OPERATION_TIMEOUT_HOURS),
+    batch_size: int = RECONCILE_BATCH_SIZE,
+) -> ReconcileReport:
+    report = ReconcileReport()
+    operation_ids = list(
+        get_stuck_operations(timeout).values_list("operation_id", flat=True)
+    )
+    for start in range(0, len(operation_ids), batch_size):
+        end = start + batch_size
+        _reconcile_batch(operation_ids[start:end], report)
+    logger.info(
+        "Reconciled stuck lifecycle operations: %s checked, %s reconciled, "
+        "%s failed, %s running, %s errors",
+        report.checked,
+        report.reconciled,
+        report.failed,
+        report.running,
+        report.errors,
+    )
+    return report
+
+
+def _reconcile_batch(operation_ids: list[uuid.UUID], report: ReconcileReport):
+    report.checked += len(operation_ids)
+    try:
+        response = post_lifecycle_operations_status(
+            operation_ids=[str(operation_id) for operation_id in operation_ids],
+            timeout=TOOLS_API_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        items = response.json()["operations"]
+        if not isinstance(items, list):
+            raise TypeError("operations is not a list")
+    except (requests.RequestException, ValueError, KeyError, TypeError) as error:
+        # The tools API being unavailable does not mean operations are lost
+        logger.error(
+            "Could not get the status of %s lifecycle operations: %s",
+            len(operation_ids),
+            error,
+        )
+        report.errors += len(operation_ids)
+        return
+
+    unknown_operation_ids = set(operation_ids)
+    callbacks: list[dict[str, Any]] = []
+    malformed = False
+    for item in items:
+        if not isinstance(item, dict):
+            logger.warning("Ignoring lifecycle operation status %s", item)
+            malformed = True
+            continue
+        callback_data = _check_status_item(item, unknown_operation_ids, report)
+        if callback_data is not None:
+            callbacks.append(callback_data)
+
+    if malformed:
+        # The operations of malformed items can not be told from unknown ones:
+        # they are left for a later run
+        report.errors += len(unknown_operation_ids)
+        unknown_operation_ids.clear()
+
+    for operation_id in unknown_operation_ids:
+        serializer = LifecycleOperationCallbackSerializer(
+            data={
+                "operation_id": operation_id,
+                "status": LifecycleOperationStatus.FAILED,
+                "error_message": UNKNOWN_OPERATION_ERROR_MESSAGE,
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        callbacks.append(get_callback_data(serializer))
+    report.failed += len(unknown_operation_ids)
+    report.reconciled += len(callbacks) - len(unknown_operation_ids)
+
+    callbacks.sort(key=lambda callback_data: callback_data["operation_id"])
+    for start in range(0, len(callbacks), CALLBACK_BATCH_CHUNK_SIZE):
+        end = start + CALLBACK_BATCH_CHUNK_SIZE
+        apply_callback_chunk(list(enumerate(callbacks[start:end])))
+
+
+def _check_status_item(
+    item: dict[str, Any],
+    unknown_operation_ids: set[uuid.UUID],
+    report: ReconcileReport,
+) -> dict[str, Any] | None:
+    """Callback data of an ended operation of the batch, if any. Operations of
+    the item are removed from `unknown_operation_ids`."""
+    serializer = LifecycleOperationCallbackSerializer(data=item)
+    if item.get("status") in ACTIVE_OPERATION_STATUSES:
+        operation_id = _parse_uuid(item.get("operation_id"))
+        if operation_id in unknown_operation_ids:
+            unknown_operation_ids.discard(operation_id)
+            report.running += 1
+    elif (
+        serializer.is_valid()
+        and serializer.validated_data["operation_id"] in unknown_operation_ids
+    ):
+        unknown_operation_ids.discard(serializer.validated_data["operation_id"])
+        return get_callback_data(serializer)
+    else:
+        # The operation is left for a later run
+        logger.warning("Ignoring lifecycle operation status %s", item)
+        operation_id = _parse_uuid(item.get("operation_id"))
+        if operation_id in unknown_operation_ids:
+            unknown_operation_ids.discard(operation_id)
+            report.errors += 1
+    return None
+
+
+def _parse_uuid(value: Any) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import dataclasses
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from http import HTTPStatus
+from typing import Any
 
 import requests
 from django.conf import settings
 from django.db import connection, transaction
-from django.db.models import Exists, OuterRef, QuerySet
+from django.db.models import Count, Exists, F, OuterRef, QuerySet, Subquery, Sum
 from django.utils import timezone
 
 from euphro_tools.project_data import post_cool_project
@@ -26,6 +29,61 @@ logger = logging.getLogger(__name__)
 COOLING_BATCH_LIMIT = 3
 TOOLS_API_TIMEOUT_SECONDS = 10
 RESTORED_PROJECT_COOLING_GRACE_PERIOD_DAYS = 30
+# Maximum number of cooling requests sent at once to the tools API
+COOLING_DISPATCH_CONCURRENCY = 4
+# Maximum number of projects claimed by a run with a budget
+COOLING_MAX_BATCH_SIZE = 200
+# Number of latest successful cooling operations used to estimate throughput
+# and project sizes
+COOLING_HISTORY_SIZE = 50
+
+
+@dataclasses.dataclass
+class CoolingBudget:
+    """Amount of data a scheduler run may send to cooling. A None limit is not
+    enforced."""
+
+    bytes: int | None = None
+    files: int | None = None
+
+    def allows(self, bytes_total: int, files_total: int) -> bool:
+        return (self.bytes is None or bytes_total <= self.bytes) and (
+            self.files is None or files_total <= self.files
+        )
+
+
+def _get_cooling_history() -> dict[str, Any]:
+    """Totals of the latest successful cooling operations."""
+    latest_operations = LifecycleOperation.objects.filter(
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.SUCCEEDED,
+        started_at__isnull=False,
+        finished_at__isnull=False,
+        bytes_total__isnull=False,
+        files_total__isnull=False,
+    ).order_by("-finished_at")[:COOLING_HISTORY_SIZE]
+    return LifecycleOperation.objects.filter(
+        operation_id__in=latest_operations.values("operation_id")
+    ).aggregate(
+        count=Count("operation_id"),
+        duration=Sum(F("finished_at") - F("started_at")),
+        bytes_total=Sum("bytes_total"),
+        files_total=Sum("files_total"),
+    )
+
+
+def estimate_cooling_budget(window: timedelta) -> CoolingBudget | None:
+    """Return the bytes and files which can be cooled during `window`, at the
+    throughput of the latest successful cooling operations (one at a time).
+    Returns None when there is no history to estimate from."""
+    history = _get_cooling_history()
+    if not history["duration"] or history["duration"] <= timedelta(0):
+        return None
+    ratio = window / history["duration"]
+    return CoolingBudget(
+        bytes=int(history["bytes_total"] * ratio),
+        files=int(history["files_total"] * ratio),
+    )
 
 
 def _is_project_cooling_enabled() -> bool:
@@ -61,22 +119,42 @@ def _mark_operation_failed(
     )
 
 
-def _dispatch_cooling_operation(
+def _request_cooling(
     project_data: ProjectData,
     operation: LifecycleOperation,
-) -> bool:
-    operation_id = operation.operation_id
+) -> requests.Response | requests.RequestException:
+    """Send the cooling request. It does not query the database, so that it
+    can run in a worker thread."""
     try:
-        response = post_cool_project(
+        return post_cool_project(
             project_slug=project_data.project.slug,
-            operation_id=str(operation_id),
+            operation_id=str(operation.operation_id),
             timeout=TOOLS_API_TIMEOUT_SECONDS,
         )
     except requests.RequestException as error:
+        return error
+
+
+def _dispatch_cooling_operation(
+    project_data: ProjectData,
+    operation: LifecycleOperation,
+) -> bool:
+    return _handle_cooling_response(
+        project_data, operation, _request_cooling(project_data, operation)
+    )
+
+
+def _handle_cooling_response(
+    project_data: ProjectData,
+    operation: LifecycleOperation,
+    response: requests.Response | requests.RequestException,
+) -> bool:
+    operation_id = operation.operation_id
+    if isinstance(response, requests.RequestException):
         _mark_operation_failed(
             operation,
             error_message="Tools API request failed.",
-            error_details=str(error),
+            error_details=str(response),
             finished_at=timezone.now(),
         )
         logger.error(
@@ -86,7 +164,7 @@ def _dispatch_cooling_operation(
             operation_id,
             False,
             None,
-            str(error),
+            str(response),
         )
         return False
 
@@ -142,20 +220,61 @@ def _dispatch_cooling_operation(
     return False
 
 
-def run_cooling_scheduler(
-    *,
-    limit: int = COOLING_BATCH_LIMIT,
-) -> int:
-    logger.info("Cooling scheduler run started.")
-    enabled = _is_project_cooling_enabled()
-    logger.info("Cooling scheduler enabled: %s", enabled)
-    if not enabled:
-        logger.info("Cooling scheduler disabled.")
-        logger.info("Cooling scheduler run ended.")
-        return 0
+def get_default_project_size() -> tuple[int, int]:
+    """Average bytes and files of the latest cooling operations."""
+    history = _get_cooling_history()
+    if not history["count"]:
+        return 0, 0
+    return (
+        history["bytes_total"] // history["count"],
+        history["files_total"] // history["count"],
+    )
 
-    now = timezone.now()
 
+def annotate_estimated_size(
+    queryset: QuerySet[ProjectData],
+) -> QuerySet[ProjectData]:
+    """Annotate the totals of the latest measured operation of each project
+    (e.g. a previous restore), if any."""
+    measured_operations = LifecycleOperation.objects.filter(
+        project_data_id=OuterRef("pk"),
+        bytes_total__isnull=False,
+        files_total__isnull=False,
+    ).order_by("-finished_at")
+    return queryset.annotate(
+        estimated_bytes_total=Subquery(measured_operations.values("bytes_total")[:1]),
+        estimated_files_total=Subquery(measured_operations.values("files_total")[:1]),
+    )
+
+
+def _select_within_budget(
+    candidates: list[ProjectData],
+    budget: CoolingBudget,
+    default_size: tuple[int, int],
+) -> list[ProjectData]:
+    """Take projects in order while their cumulated size fits the budget.
+    Projects never measured count for `default_size`. The first project is
+    always taken, so that a large project cannot block the queue."""
+    selected: list[ProjectData] = []
+    bytes_total = files_total = 0
+    for project_data in candidates:
+        estimated_bytes = getattr(project_data, "estimated_bytes_total", None)
+        estimated_files = getattr(project_data, "estimated_files_total", None)
+        bytes_total += (
+            estimated_bytes if estimated_bytes is not None else default_size[0]
+        )
+        files_total += (
+            estimated_files if estimated_files is not None else default_size[1]
+        )
+        if selected and not budget.allows(bytes_total, files_total):
+            break
+        selected.append(project_data)
+    return selected
+
+
+def get_eligible_projects(now: datetime) -> QuerySet[ProjectData]:
+    """HOT projects due for cooling, without a cooling in progress nor a
+    recent restore."""
     active_cool_ops = LifecycleOperation.objects.filter(
         project_data_id=OuterRef("pk"),
         type=LifecycleOperationType.COOL,
@@ -172,7 +291,7 @@ def run_cooling_scheduler(
             now - timedelta(days=RESTORED_PROJECT_COOLING_GRACE_PERIOD_DAYS)
         ),
     )
-    eligible_qs = (
+    return (
         ProjectData.objects.filter(
             lifecycle_state=LifecycleState.HOT,
             cooling_eligible_at__lte=timezone.localdate(),
@@ -183,18 +302,57 @@ def run_cooling_scheduler(
         )
         .filter(has_active_cool=False, has_recent_successful_restore=False)
     )
+
+
+def _send_cooling_requests(
+    claimed: list[tuple[ProjectData, LifecycleOperation]], concurrency: int
+) -> list[requests.Response | requests.RequestException]:
+    if concurrency <= 1 or len(claimed) <= 1:
+        return [_request_cooling(*claim) for claim in claimed]
+    with ThreadPoolExecutor(
+        max_workers=min(concurrency, len(claimed)),
+        thread_name_prefix="cooling-scheduler",
+    ) as executor:
+        return list(executor.map(lambda claim: _request_cooling(*claim), claimed))
+
+
+def run_cooling_scheduler(
+    *,
+    limit: int = COOLING_BATCH_LIMIT,
+    budget: CoolingBudget | None = None,
+    concurrency: int = 1,
+) -> int:
+    """Claim eligible projects and ask the tools API to cool them.
+
+    Without budget, at most `limit` projects are claimed. With a budget,
+    projects are claimed while their expected size fits in it (up to `limit`
+    projects). Cooling requests are sent by `concurrency` threads; the
+    database is only updated from the calling thread."""
+    logger.info("Cooling scheduler run started.")
+    enabled = _is_project_cooling_enabled()
+    logger.info("Cooling scheduler enabled: %s", enabled)
+    if not enabled:
+        logger.info("Cooling scheduler disabled.")
+        logger.info("Cooling scheduler run ended.")
+        return 0
+
+    now = timezone.now()
+
+    eligible_qs = get_eligible_projects(now)
     eligible_count = eligible_qs.count()
     logger.info("Cooling scheduler eligible projects: %s", eligible_count)
 
     enqueued_count = 0
     claimed: list[tuple[ProjectData, LifecycleOperation]] = []
     with transaction.atomic():
-        locked_qs = _apply_locking(eligible_qs)
-        selected = list(
-            locked_qs.select_related("project").order_by("cooling_eligible_at", "pk")[
-                :limit
-            ]
-        )
+        locked_qs = _apply_locking(eligible_qs).select_related("project")
+        if budget is not None:
+            locked_qs = annotate_estimated_size(locked_qs)
+        selected = list(locked_qs.order_by("cooling_eligible_at", "pk")[:limit])
+        if budget is not None:
+            selected = _select_within_budget(
+                selected, budget, get_default_project_size()
+            )
         logger.info("Cooling scheduler processing: %s", len(selected))
 
         for project_data in selected:
@@ -209,8 +367,9 @@ def run_cooling_scheduler(
             )
             claimed.append((project_data, operation))
 
-    for project_data, operation in claimed:
-        if _dispatch_cooling_operation(project_data, operation):
+    responses = _send_cooling_requests(claimed, concurrency)
+    for (project_data, operation), response in zip(claimed, responses):
+        if _handle_cooling_response(project_data, operation, response):
             enqueued_count += 1
 
     logger.info("Cooling scheduler enqueued projects: %s", enqueued_count)
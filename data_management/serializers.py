@@ -17,7 +17,7 @@ def _deserialize_error_details(error_details: str | None) -> Any | None:
         return error_details
 
 
-def _compute_progress(
+def compute_progress(
     *,
     bytes_total: int | None,
     bytes_copied: int | None,
@@ -98,7 +98,7 @@ class LifecycleOperationDetailSerializer(serializers.ModelSerializer):
         )
 
     def get_progress(self, obj: LifecycleOperation) -> float | None:
-        return _compute_progress(
+        return compute_progress(
             bytes_total=obj.bytes_total,
             bytes_copied=obj.bytes_copied,
             files_total=obj.files_total,
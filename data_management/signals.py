@@ -1,10 +1,18 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from lab.projects.models import Project, Run
 from lab.runs.signals import run_scheduled
 
-from .eligibility import sync_project_cooling_eligible_at
+from .eligibility import (
+    schedule_cooling_eligible_at_sync,
+    sync_project_cooling_eligible_at,
+)
+from .immutability import forget_lifecycle_state
+from .models import LifecycleOperation, ProjectData, refresh_last_lifecycle_operation
+
+# Fields ordering lifecycle operations (see models.last_lifecycle_operations)
+LIFECYCLE_OPERATION_SORT_FIELDS = {"started_at", "finished_at"}
 
 
 @receiver(post_save, sender=Project)
@@ -25,7 +33,7 @@ def update_project_eligibility_on_run_embargo_change(
     instance: Run,
     **kwargs,
 ) -> None:
-    sync_project_cooling_eligible_at(instance.project)
+    schedule_cooling_eligible_at_sync(instance.project_id)
 
 
 @receiver(run_scheduled)
@@ -35,4 +43,48 @@ def update_project_eligibility_on_run_scheduled(
     **kwargs,
 ) -> None:
     """Update project eligibility when a run is scheduled."""
-    sync_project_cooling_eligible_at(instance.project)
+    schedule_cooling_eligible_at_sync(instance.project_id)
+
+
+@receiver(post_save, sender=LifecycleOperation)
+def update_last_lifecycle_operation_on_save(
+    sender: type[LifecycleOperation],  # pylint: disable=unused-argument
+    instance: LifecycleOperation,
+    created: bool,
+    update_fields: frozenset[str] | None,
+    **kwargs,
+) -> None:
+    """Keep ProjectData.last_lifecycle_operation up to date, in the transaction
+    creating or finishing the operation."""
+    if (
+        not created
+        and update_fields is not None
+        and not LIFECYCLE_OPERATION_SORT_FIELDS & update_fields
+    ):
+        return
+    _refresh_last_lifecycle_operation(instance)
+
+
+@receiver(post_delete, sender=LifecycleOperation)
+def update_last_lifecycle_operation_on_delete(
+    sender: type[LifecycleOperation],  # pylint: disable=unused-argument
+    instance: LifecycleOperation,
+    **kwargs,
+) -> None:
+    refresh_last_lifecycle_operation(instance.project_data_id)
+
+
+def _refresh_last_lifecycle_operation(operation: LifecycleOperation) -> None:
+    refresh_last_lifecycle_operation(operation.project_data_id)
+    if LifecycleOperation._meta.get_field("project_data").is_cached(operation):
+        # Keep the in-memory project data of the caller consistent
+        operation.project_data.refresh_from_db(fields=["last_lifecycle_operation"])
+
+
+@receiver(post_save, sender=ProjectData)
+def forget_memoized_lifecycle_state(
+    sender: type[ProjectData],  # pylint: disable=unused-argument
+    instance: ProjectData,
+    **kwargs,
+) -> None:
+    forget_lifecycle_state(instance.project_id)
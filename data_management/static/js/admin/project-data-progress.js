@@ -0,0 +1,59 @@
+"use strict";
+{
+  const percentFormat = new Intl.NumberFormat(undefined, {
+    style: "percent",
+    maximumFractionDigits: 1,
+  });
+  const byteUnits = ["B", "KB", "MB", "GB", "TB"];
+
+  function formatBytes(value) {
+    let unitIndex = 0;
+    while (value >= 1024 && unitIndex < byteUnits.length - 1) {
+      value /= 1024;
+      unitIndex += 1;
+    }
+    return `${value.toFixed(1)} ${byteUnits[unitIndex]}`;
+  }
+
+  function formatProgress(progress) {
+    const parts = [];
+    if (progress.progress !== null) {
+      parts.push(percentFormat.format(progress.progress));
+    } else if (progress.bytes_copied !== null) {
+      parts.push(formatBytes(progress.bytes_copied));
+    }
+    if (progress.bytes_per_second !== null) {
+      parts.push(`${formatBytes(progress.bytes_per_second)}/s`);
+    }
+    return parts.join(" – ") || "…";
+  }
+
+  const activeStatuses = ["PENDING", "RUNNING"];
+
+  async function pollProgress(element) {
+    const pollSeconds = Number(element.dataset.progressPollSeconds);
+    try {
+      const response = await fetch(element.dataset.progressUrl, {
+        headers: { Accept: "application/json" },
+      });
+      if (response.ok) {
+        const progress = await response.json();
+        element.textContent = formatProgress(progress);
+        if (!activeStatuses.includes(progress.status)) {
+          return;
+        }
+      } else if (response.status < 500) {
+        return;
+      }
+    } catch {
+      // Network errors are retried at next poll
+    }
+    setTimeout(() => pollProgress(element), pollSeconds * 1000);
+  }
+
+  document.addEventListener("DOMContentLoaded", () => {
+    document
+      .querySelectorAll("[data-progress-url]")
+      .forEach((element) => pollProgress(element));
+  });
+}
@@ -222,6 +222,7 @@ def test_project_data_admin_changelist_displays_requested_lifecycle_fields():
         "cooling_eligible_at",
         "last_operation_lifecycle",
         "last_operation",
+        "last_operation_progress",
     )
     model_admin = admin.site._registry[ProjectData]  # pylint: disable=protected-access
     result = changelist_response.context_data["cl"].result_list[0]
@@ -587,3 +588,49 @@ def test_lifecycle_operation_admin_delete_source_data_action_skips_ineligible_ro
         "detail": gettext("Lifecycle operation must have status succeeded."),
     }
     assert expected_message in response_messages
+
+
+@pytest.mark.django_db
+def test_project_data_admin_returns_last_operation_progress():
+    project_data = ProjectDataFactory()
+    operation = LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.SUCCEEDED,
+        started_at=timezone.now(),
+        finished_at=timezone.now(),
+        bytes_total=10,
+        bytes_copied=10,
+    )
+    client = Client()
+    client.force_login(LabAdminUserFactory())
+
+    response = client.get(
+        reverse("admin:data_management_projectdata_progress", args=[project_data.pk])
+    )
+
+    assert response.status_code == 200
+    assert response.json()["operation_id"] == str(operation.operation_id)
+    assert response.json()["status"] == LifecycleOperationStatus.SUCCEEDED
+    assert response.json()["progress"] == 1.0
+
+
+@pytest.mark.django_db
+def test_project_data_admin_changelist_displays_running_operation_progress():
+    project_data = ProjectDataFactory(lifecycle_state=LifecycleState.COOLING)
+    LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.RUNNING,
+        started_at=timezone.now(),
+    )
+    client = Client()
+    client.force_login(LabAdminUserFactory())
+
+    response = client.get(reverse("admin:data_management_projectdata_changelist"))
+
+    assert (
+        'data-progress-url="%s"'
+        % reverse("admin:data_management_projectdata_progress", args=[project_data.pk])
+        in response.content.decode()
+    )
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.template.defaultfilters import filesizeformat
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from data_management.analytics import (
+    get_backlog_forecast,
+    get_throughput_summaries,
+    refresh_daily_stats,
+)
+from data_management.models import (
+    LifecycleOperation,
+    LifecycleOperationDailyStats,
+    LifecycleOperationStatus,
+    LifecycleOperationType,
+    LifecycleState,
+)
+from euphro_auth.tests.factories import LabAdminUserFactory
+
+from .factories import ProjectDataFactory
+
+
+def _create_finished_operation(  # pylint: disable=too-many-arguments
+    *,
+    days_ago: int = 1,
+    seconds: int = 100,
+    bytes_total: int = 1000,
+    files_total: int = 10,
+    operation_type: str = LifecycleOperationType.COOL,
+    status: str = LifecycleOperationStatus.SUCCEEDED,
+) -> LifecycleOperation:
+    finished_at = timezone.now() - timedelta(days=days_ago)
+    return LifecycleOperation.objects.create(
+        project_data=ProjectDataFactory(lifecycle_state=LifecycleState.COOL),
+        type=operation_type,
+        status=status,
+        started_at=finished_at - timedelta(seconds=seconds),
+        finished_at=finished_at,
+        bytes_total=bytes_total,
+        files_total=files_total,
+    )
+
+
+@pytest.mark.django_db
+def test_refresh_daily_stats_aggregates_finished_operations():
+    _create_finished_operation(seconds=100, bytes_total=1000)
+    _create_finished_operation(seconds=100, bytes_total=3000)
+    _create_finished_operation(status=LifecycleOperationStatus.FAILED)
+    _create_finished_operation(operation_type=LifecycleOperationType.RESTORE)
+    LifecycleOperation.objects.create(
+        project_data=ProjectDataFactory(),
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.RUNNING,
+        started_at=timezone.now(),
+    )
+
+    assert refresh_daily_stats() == 1
+
+    stats = LifecycleOperationDailyStats.objects.get(type=LifecycleOperationType.COOL)
+    assert stats.succeeded_count == 2
+    assert stats.failed_count == 1
+    assert stats.bytes_total == 4000
+    assert stats.duration_seconds == 200
+    assert sorted(stats.throughputs) == [10, 30]
+
+
+@pytest.mark.django_db
+def test_refresh_daily_stats_only_recomputes_latest_days(
+    django_assert_num_queries,
+):
+    _create_finished_operation(days_ago=10)
+    refresh_daily_stats()
+    _create_finished_operation(days_ago=0)
+
+    # Latest day, operations since then, upsert
+    with django_assert_num_queries(3):
+        assert refresh_daily_stats() == 2
+
+    assert LifecycleOperationDailyStats.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_get_throughput_summaries():
+    for seconds in (10, 20, 40, 100):
+        _create_finished_operation(seconds=seconds, bytes_total=1000)
+    _create_finished_operation(status=LifecycleOperationStatus.FAILED)
+    _create_finished_operation(days_ago=40, seconds=1)
+    refresh_daily_stats()
+
+    summary = {
+        summary.type: summary for summary in get_throughput_summaries(period_days=30)
+    }[LifecycleOperationType.COOL]
+
+    assert summary.succeeded_count == 4
+    assert summary.failure_rate == 0.2
+    assert summary.bytes_per_second == 4000 / 170
+    assert summary.files_per_second == 40 / 170
+    assert summary.percentiles == {50: 25, 90: 100, 99: 100}
+
+
+@pytest.mark.django_db
+def test_get_backlog_forecast():
+    # 2 projects (2000 bytes) cooled over the last 10 days
+    _create_finished_operation(bytes_total=1000)
+    _create_finished_operation(bytes_total=1000)
+    refresh_daily_stats()
+    ProjectDataFactory.create_batch(
+        3, cooling_eligible_at=timezone.localdate() - timedelta(days=1)
+    )
+    ProjectDataFactory(cooling_eligible_at=timezone.localdate() + timedelta(days=1))
+
+    forecast = get_backlog_forecast(period_days=10)
+
+    assert forecast.project_count == 3
+    assert forecast.bytes_total == 3000
+    assert forecast.bytes_per_day == 200
+    assert forecast.drain_date == timezone.localdate() + timedelta(days=15)
+
+
+@pytest.mark.django_db
+def test_get_backlog_forecast_without_history():
+    ProjectDataFactory(cooling_eligible_at=timezone.localdate() - timedelta(days=1))
+
+    forecast = get_backlog_forecast(period_days=10)
+
+    assert forecast.project_count == 1
+    assert forecast.drain_date is None
+
+
+@pytest.mark.django_db
+def test_analytics_admin_view():
+    _create_finished_operation()
+    refresh_daily_stats()
+    client = Client()
+    client.force_login(LabAdminUserFactory())
+
+    response = client.get(
+        reverse("admin:data_management_projectdata_analytics"), {"period": "7"}
+    )
+
+    assert response.status_code == 200
+    assert response.context_data["period_days"] == 7
+    assert response.context_data["summaries"][0]["succeeded_count"] == 1
+    assert response.context_data["summaries"][0]["throughput"] == (
+        "%s/s" % filesizeformat(10)
+    )
+
+
+@pytest.mark.django_db
+def test_analytics_admin_view_does_not_refresh_stats():
+    _create_finished_operation()
+    client = Client()
+    client.force_login(LabAdminUserFactory())
+
+    response = client.get(reverse("admin:data_management_projectdata_analytics"))
+
+    assert response.status_code == 200
+    assert not LifecycleOperationDailyStats.objects.exists()
+
+
+@pytest.mark.django_db
+def test_refresh_lifecycle_operation_stats_command():
+    _create_finished_operation()
+
+    call_command("refresh_lifecycle_operation_stats", stdout=StringIO())
+
+    assert LifecycleOperationDailyStats.objects.count() == 1
@@ -455,3 +455,185 @@ def test_callback_from_data_deletion_is_ignored_when_not_requested():
     assert operation.from_data_deletion_status == FromDataDeletionStatus.NOT_REQUESTED
     assert operation.from_data_deleted_at is None
     assert operation.from_data_deletion_error is None
+
+
+@pytest.mark.django_db
+def test_callback_progress_updates_running_operation():
+    operation = _create_operation(lifecycle_state=LifecycleState.COOLING)
+
+    response = Client().post(
+        CALLBACK_URL,
+        data={
+            "operation_id": str(operation.operation_id),
+            "phase": "PROGRESS",
+            "bytes_copied": 4,
+            "files_copied": 1,
+        },
+        headers=_backend_headers(),
+        content_type="application/json",
+    )
+
+    operation.refresh_from_db()
+
+    assert response.status_code == 202
+    assert operation.status == LifecycleOperationStatus.RUNNING
+    assert operation.bytes_copied == 4
+    assert operation.files_copied == 1
+    assert operation.progress_updated_at is not None
+    assert operation.finished_at is None
+    assert operation.project_data.lifecycle_state == LifecycleState.COOLING
+
+
+@pytest.mark.django_db
+def test_callback_progress_requires_copied_counts():
+    operation = _create_operation(lifecycle_state=LifecycleState.COOLING)
+
+    response = Client().post(
+        CALLBACK_URL,
+        data={"operation_id": str(operation.operation_id), "phase": "PROGRESS"},
+        headers=_backend_headers(),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+
+
+BATCH_CALLBACK_URL = "/api/data-management/operations/callbacks"
+
+
+@pytest.mark.django_db
+def test_batch_callback_requires_backend_authentication():
+    response = Client().post(
+        BATCH_CALLBACK_URL,
+        data={"callbacks": [{"operation_id": str(uuid.uuid4()), "status": "FAILED"}]},
+        content_type="application/json",
+    )
+
+    assert response.status_code in {401, 403}
+
+
+@pytest.mark.django_db
+def test_batch_callback_applies_callbacks_and_returns_item_results():
+    succeeded_operation = _create_operation(lifecycle_state=LifecycleState.COOLING)
+    failed_operation = _create_operation(
+        lifecycle_state=LifecycleState.RESTORING,
+        operation_type=LifecycleOperationType.RESTORE,
+    )
+    progress_operation = _create_operation(lifecycle_state=LifecycleState.COOLING)
+    unknown_operation_id = str(uuid.uuid4())
+
+    response = Client().post(
+        BATCH_CALLBACK_URL,
+        data={
+            "callbacks": [
+                {
+                    "operation_id": str(succeeded_operation.operation_id),
+                    "status": "SUCCEEDED",
+                    "bytes_copied": 10,
+                    "files_copied": 2,
+                },
+                {
+                    "operation_id": str(failed_operation.operation_id),
+                    "status": "FAILED",
+                    "error_message": "AzCopy job failed.",
+                },
+                {"operation_id": unknown_operation_id, "status": "FAILED"},
+                {"operation_id": str(progress_operation.operation_id)},
+                {
+                    "operation_id": str(progress_operation.operation_id),
+                    "phase": "PROGRESS",
+                    "bytes_copied": 5,
+                },
+            ]
+        },
+        headers=_backend_headers(),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status_code"] for result in results] == [200, 200, 404, 400, 202]
+    assert results[2]["operation_id"] == unknown_operation_id
+    assert "status" in results[3]["errors"]
+
+    succeeded_operation.refresh_from_db()
+    failed_operation.refresh_from_db()
+    progress_operation.refresh_from_db()
+    assert succeeded_operation.status == LifecycleOperationStatus.SUCCEEDED
+    assert succeeded_operation.project_data.lifecycle_state == LifecycleState.COOL
+    assert failed_operation.status == LifecycleOperationStatus.FAILED
+    assert failed_operation.project_data.lifecycle_state == LifecycleState.ERROR
+    assert progress_operation.status == LifecycleOperationStatus.RUNNING
+    assert progress_operation.bytes_copied == 5
+
+
+@pytest.mark.django_db
+def test_batch_callback_applies_callbacks_of_an_operation_in_order():
+    operation = _create_operation(lifecycle_state=LifecycleState.COOLING)
+
+    response = Client().post(
+        BATCH_CALLBACK_URL,
+        data={
+            "callbacks": [
+                {"operation_id": str(operation.operation_id), "status": "FAILED"},
+                {
+                    "operation_id": str(operation.operation_id),
+                    "status": "SUCCEEDED",
+                    "bytes_copied": 10,
+                    "files_copied": 2,
+                },
+            ]
+        },
+        headers=_backend_headers(),
+        content_type="application/json",
+    )
+
+    operation.refresh_from_db()
+
+    assert response.status_code == 200
+    # The second callback is a no-op on a terminal operation
+    assert operation.status == LifecycleOperationStatus.FAILED
+    assert operation.project_data.lifecycle_state == LifecycleState.ERROR
+
+
+@pytest.mark.django_db
+def test_batch_callback_locks_rows_in_primary_key_order(monkeypatch):
+    monkeypatch.setattr("data_management.api_views.CALLBACK_BATCH_CHUNK_SIZE", 2)
+    operations = [
+        _create_operation(lifecycle_state=LifecycleState.COOLING) for _ in range(3)
+    ]
+    applied_operation_ids = []
+
+    def _apply_callback(operation, *args):
+        applied_operation_ids.append(operation.operation_id)
+
+    monkeypatch.setattr("data_management.callbacks.apply_callback", _apply_callback)
+
+    response = Client().post(
+        BATCH_CALLBACK_URL,
+        data={
+            "callbacks": [
+                {"operation_id": str(operation.operation_id), "status": "FAILED"}
+                for operation in reversed(operations)
+            ]
+        },
+        headers=_backend_headers(),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert applied_operation_ids == sorted(
+        operation.operation_id for operation in operations
+    )
+
+
+@pytest.mark.django_db
+def test_batch_callback_rejects_empty_batch():
+    response = Client().post(
+        BATCH_CALLBACK_URL,
+        data={"callbacks": []},
+        headers=_backend_headers(),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
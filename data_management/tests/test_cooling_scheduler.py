@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import threading
 from datetime import timedelta
+from io import StringIO
 from unittest import mock
 
 import pytest
 import requests
+from django.core.management import call_command
 from django.test.utils import override_settings
 from django.utils import timezone
 
@@ -14,7 +17,11 @@ from data_management.models import (
     LifecycleOperationType,
     LifecycleState,
 )
-from data_management.scheduler import run_cooling_scheduler
+from data_management.scheduler import (
+    CoolingBudget,
+    estimate_cooling_budget,
+    run_cooling_scheduler,
+)
 
 from .factories import ProjectDataFactory
 
@@ -277,3 +284,153 @@ def test_scheduler_skips_projects_with_active_running_cool_operation():
     assert enqueued == 1
     assert project_data_claimed.lifecycle_state == LifecycleState.HOT
     assert project_data_fresh.lifecycle_state == LifecycleState.COOLING
+
+
+def _create_cooled_operation(hours: int, bytes_total: int, files_total: int):
+    finished_at = timezone.now() - timedelta(days=1)
+    return LifecycleOperation.objects.create(
+        project_data=ProjectDataFactory(lifecycle_state=LifecycleState.COOL),
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.SUCCEEDED,
+        started_at=finished_at - timedelta(hours=hours),
+        finished_at=finished_at,
+        bytes_total=bytes_total,
+        files_total=files_total,
+    )
+
+
+@pytest.mark.django_db
+def test_estimate_cooling_budget_from_history():
+    _create_cooled_operation(hours=1, bytes_total=1000, files_total=10)
+    _create_cooled_operation(hours=3, bytes_total=3000, files_total=30)
+    LifecycleOperation.objects.create(
+        project_data=ProjectDataFactory(),
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.FAILED,
+        started_at=timezone.now() - timedelta(hours=10),
+        finished_at=timezone.now(),
+        bytes_total=1,
+        files_total=1,
+    )
+
+    assert estimate_cooling_budget(timedelta(hours=8)) == CoolingBudget(
+        bytes=8000, files=80
+    )
+
+
+@pytest.mark.django_db
+def test_estimate_cooling_budget_without_history():
+    assert estimate_cooling_budget(timedelta(hours=8)) is None
+
+
+@pytest.mark.django_db
+@override_settings(DATA_COOLING_ENABLE=True)
+def test_scheduler_claims_projects_within_budget():
+    # Average project size: 1000 bytes, 10 files
+    _create_cooled_operation(hours=1, bytes_total=1000, files_total=10)
+    eligible_at = timezone.localdate() - timedelta(days=10)
+    project_datas = [
+        ProjectDataFactory(cooling_eligible_at=eligible_at + timedelta(days=index))
+        for index in range(4)
+    ]
+    # Measured by a previous restore
+    LifecycleOperation.objects.create(
+        project_data=project_datas[1],
+        type=LifecycleOperationType.RESTORE,
+        status=LifecycleOperationStatus.FAILED,
+        finished_at=timezone.now() - timedelta(days=60),
+        bytes_total=500,
+        files_total=5,
+    )
+
+    with mock.patch(
+        "data_management.scheduler.post_cool_project",
+        return_value=DummyResponse(status_code=202),
+    ) as post_mock:
+        enqueued = run_cooling_scheduler(
+            limit=10, budget=CoolingBudget(bytes=2600, files=100)
+        )
+
+    for project_data in project_datas:
+        project_data.refresh_from_db()
+
+    assert enqueued == 3
+    assert post_mock.call_count == 3
+    assert [project_data.lifecycle_state for project_data in project_datas] == [
+        LifecycleState.COOLING,
+        LifecycleState.COOLING,
+        LifecycleState.COOLING,
+        LifecycleState.HOT,
+    ]
+
+
+@pytest.mark.django_db
+@override_settings(DATA_COOLING_ENABLE=True)
+def test_scheduler_claims_first_project_over_budget():
+    project_data = ProjectDataFactory(
+        cooling_eligible_at=timezone.localdate() - timedelta(days=1),
+    )
+    LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.RESTORE,
+        status=LifecycleOperationStatus.FAILED,
+        finished_at=timezone.now() - timedelta(days=60),
+        bytes_total=5000,
+        files_total=5,
+    )
+
+    with mock.patch(
+        "data_management.scheduler.post_cool_project",
+        return_value=DummyResponse(status_code=202),
+    ):
+        enqueued = run_cooling_scheduler(budget=CoolingBudget(bytes=1000))
+
+    assert enqueued == 1
+
+
+@pytest.mark.django_db
+@override_settings(DATA_COOLING_ENABLE=True)
+def test_scheduler_sends_requests_concurrently():
+    project_datas = ProjectDataFactory.create_batch(
+        3, cooling_eligible_at=timezone.localdate() - timedelta(days=1)
+    )
+    # Each request waits for the others: it would time out if sent serially
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _post_cool_project(**kwargs):
+        barrier.wait()
+        return DummyResponse(status_code=202)
+
+    with mock.patch(
+        "data_management.scheduler.post_cool_project",
+        side_effect=_post_cool_project,
+    ):
+        enqueued = run_cooling_scheduler(concurrency=3)
+
+    assert enqueued == 3
+    for project_data in project_datas:
+        project_data.refresh_from_db()
+        assert project_data.lifecycle_state == LifecycleState.COOLING
+
+
+@pytest.mark.django_db
+@override_settings(DATA_COOLING_ENABLE=True)
+def test_schedule_project_cooling_command_with_budget():
+    _create_cooled_operation(hours=1, bytes_total=1000, files_total=10)
+
+    with mock.patch(
+        "data_management.management.commands.schedule_project_cooling"
+        ".run_cooling_scheduler",
+        return_value=2,
+    ) as scheduler_mock:
+        call_command(
+            "schedule_project_cooling",
+            window_hours=2,
+            max_files=15,
+            stdout=StringIO(),
+        )
+
+    assert scheduler_mock.call_args.kwargs["budget"] == CoolingBudget(
+        bytes=2000, files=15
+    )
+    assert scheduler_mock.call_args.kwargs["concurrency"] == 4
@@ -4,9 +4,12 @@ from data_management.immutability import (
     PROJECT_IMMUTABLE_ERROR,
     ProjectImmutableError,
     ensure_project_data_writable,
+    get_lifecycle_state,
     is_project_data_immutable,
+    lifecycle_state_cache,
 )
 from data_management.models import LifecycleState, ProjectData
+from lab.models import Project
 from lab.tests.factories import ProjectFactory
 
 
@@ -62,3 +65,73 @@ def test_is_project_immutable(state: LifecycleState, expected: bool):
     project_data.save(update_fields=["lifecycle_state"])
 
     assert is_project_data_immutable(project) is expected
+
+
+@pytest.mark.django_db
+def test_get_lifecycle_state_has_no_side_effects(django_assert_num_queries):
+    project = ProjectFactory()
+    ProjectData.objects.filter(project=project).delete()
+    project = Project.objects.get(pk=project.pk)
+
+    with django_assert_num_queries(1):
+        assert get_lifecycle_state(project) == LifecycleState.HOT
+
+    assert not ProjectData.objects.filter(project=project).exists()
+
+
+@pytest.mark.django_db
+def test_get_lifecycle_state_is_memoized_per_request(django_assert_num_queries):
+    project = ProjectFactory()
+    ProjectData.objects.filter(project=project).update(
+        lifecycle_state=LifecycleState.COOL
+    )
+
+    # Different instances of the same project
+    other_project = Project.objects.get(pk=project.pk)
+    project = Project.objects.get(pk=project.pk)
+
+    with lifecycle_state_cache():
+        with django_assert_num_queries(1):
+            assert is_project_data_immutable(other_project)
+        with django_assert_num_queries(0):
+            assert is_project_data_immutable(project)
+            with pytest.raises(ProjectImmutableError):
+                ensure_project_data_writable(project)
+
+
+@pytest.mark.django_db
+def test_memoized_lifecycle_state_is_forgotten_on_transition():
+    project = ProjectFactory()
+    project_data = ProjectData.objects.get(project=project)
+
+    with lifecycle_state_cache():
+        assert not is_project_data_immutable(Project.objects.get(pk=project.pk))
+        project_data.lifecycle_state = LifecycleState.COOLING
+        project_data.save(update_fields=["lifecycle_state"])
+
+        assert is_project_data_immutable(Project.objects.get(pk=project.pk))
+
+
+@pytest.mark.django_db
+def test_get_lifecycle_state_is_memoized(django_assert_num_queries):
+    cool_project, hot_project, project_without_data = ProjectFactory.create_batch(3)
+    ProjectData.objects.filter(project=cool_project).update(
+        lifecycle_state=LifecycleState.COOL
+    )
+    ProjectData.objects.filter(project=project_without_data).delete()
+    projects = list(
+        Project.objects.filter(
+            pk__in=[cool_project.pk, hot_project.pk, project_without_data.pk]
+        ).order_by("pk")
+    )
+
+    with lifecycle_state_cache():
+        with django_assert_num_queries(3):
+            assert [get_lifecycle_state(project) for project in projects] == [
+                LifecycleState.COOL,
+                LifecycleState.HOT,
+                LifecycleState.HOT,
+            ]
+        with django_assert_num_queries(0):
+            for project in projects:
+                is_project_data_immutable(project)
@@ -2,12 +2,22 @@ from datetime import timedelta
 from importlib import import_module
 
 import pytest
+from django.apps import apps
 from django.utils import timezone
 
+from data_management.models import (
+    LifecycleOperation,
+    LifecycleOperationStatus,
+    LifecycleOperationType,
+    ProjectData,
+)
 from lab.runs.models import Run
 from lab.tests.factories import ProjectFactory, RunFactory
 
 migration = import_module("data_management.migrations.0004_backfill_project_data")
+last_operation_migration = import_module(
+    "data_management.migrations.0006_projectdata_last_lifecycle_operation"
+)
 
 
 @pytest.mark.django_db
@@ -35,3 +45,26 @@ def test_backfill_cooling_eligible_at_ignores_end_date_when_run_has_embargo():
 
     # pylint: disable=protected-access
     assert migration._compute_cooling_eligible_at(project, Run) == embargo_date
+
+
+@pytest.mark.django_db
+def test_backfill_last_lifecycle_operation():
+    project_data = ProjectFactory().project_data
+    LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.SUCCEEDED,
+        started_at=timezone.now() - timedelta(days=2),
+    )
+    restore = LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.RESTORE,
+        status=LifecycleOperationStatus.RUNNING,
+        started_at=timezone.now(),
+    )
+    ProjectData.objects.update(last_lifecycle_operation=None)
+
+    last_operation_migration.backfill_last_lifecycle_operation(apps, None)
+
+    project_data.refresh_from_db()
+    assert project_data.last_lifecycle_operation == restore
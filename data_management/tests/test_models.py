@@ -119,6 +119,55 @@ def test_last_lifecycle_operation_prefers_started_over_pending():
     assert project_data.last_lifecycle_operation == running
 
 
+@pytest.mark.django_db
+def test_last_lifecycle_operation_is_stored_when_operations_change():
+    project_data = create_project_data()
+    base_time = timezone.now()
+    cool = LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.RUNNING,
+        started_at=base_time - timedelta(hours=2),
+    )
+    restore = LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.RESTORE,
+        status=LifecycleOperationStatus.PENDING,
+    )
+
+    assert ProjectData.objects.get(pk=project_data.pk).last_lifecycle_operation == (
+        cool
+    )
+
+    # Finishing an operation may change the order
+    restore.finished_at = base_time
+    restore.save(update_fields=["finished_at"])
+    assert ProjectData.objects.get(pk=project_data.pk).last_lifecycle_operation == (
+        restore
+    )
+
+    restore.delete()
+    assert ProjectData.objects.get(pk=project_data.pk).last_lifecycle_operation == (
+        cool
+    )
+
+
+@pytest.mark.django_db
+def test_last_lifecycle_operation_updates_instance_of_caller():
+    project_data = create_project_data()
+    # Loaded before the operation is created
+    assert project_data.last_lifecycle_operation is None
+
+    operation = LifecycleOperation.objects.create(
+        project_data=project_data,
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.PENDING,
+        started_at=timezone.now(),
+    )
+
+    assert project_data.last_lifecycle_operation == operation
+
+
 @pytest.mark.django_db
 def test_transition_to_cooling_requires_hot_and_eligible():
     eligible_project_data = create_project_data(
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from data_management.models import (
+    LifecycleOperation,
+    LifecycleOperationStatus,
+    LifecycleOperationType,
+    LifecycleState,
+)
+from data_management.progress import (
+    ProgressSample,
+    get_operation_progress,
+    record_progress,
+)
+
+from .factories import ProjectDataFactory
+
+
+def _create_running_operation(**kwargs) -> LifecycleOperation:
+    return LifecycleOperation.objects.create(
+        project_data=ProjectDataFactory(lifecycle_state=LifecycleState.COOLING),
+        type=LifecycleOperationType.COOL,
+        status=LifecycleOperationStatus.RUNNING,
+        started_at=timezone.now() - timedelta(seconds=100),
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+def test_record_progress_throttles_writes():
+    operation = _create_running_operation(bytes_total=1000)
+    now = timezone.now()
+
+    assert record_progress(
+        operation.operation_id, ProgressSample(received_at=now, bytes_copied=100)
+    )
+    assert not record_progress(
+        operation.operation_id,
+        ProgressSample(received_at=now + timedelta(seconds=10), bytes_copied=200),
+    )
+    assert record_progress(
+        operation.operation_id,
+        ProgressSample(received_at=now + timedelta(seconds=31), bytes_copied=300),
+    )
+
+    operation.refresh_from_db()
+    assert operation.bytes_copied == 300
+    assert operation.progress_updated_at == now + timedelta(seconds=31)
+
+
+@pytest.mark.django_db
+def test_record_progress_writes_completing_sample_within_interval():
+    operation = _create_running_operation(bytes_total=1000, files_total=10)
+    now = timezone.now()
+    record_progress(
+        operation.operation_id, ProgressSample(received_at=now, bytes_copied=100)
+    )
+
+    assert not record_progress(
+        operation.operation_id,
+        ProgressSample(received_at=now + timedelta(seconds=5), files_copied=9),
+    )
+    assert record_progress(
+        operation.operation_id,
+        ProgressSample(received_at=now + timedelta(seconds=10), bytes_copied=1000),
+    )
+    assert record_progress(
+        operation.operation_id,
+        ProgressSample(
+            received_at=now + timedelta(seconds=15),
+            files_copied=12,
+            files_total=12,
+        ),
+    )
+
+    operation.refresh_from_db()
+    assert operation.bytes_copied == 1000
+    assert operation.files_copied == 12
+    assert operation.progress_updated_at == now + timedelta(seconds=15)
+
+
+@pytest.mark.django_db
+def test_record_progress_ignores_finished_operation():
+    operation = _create_running_operation(bytes_copied=1000)
+    operation.status = LifecycleOperationStatus.SUCCEEDED
+    operation.save()
+
+    assert not record_progress(
+        operation.operation_id,
+        ProgressSample(received_at=timezone.now(), bytes_copied=10),
+    )
+
+    operation.refresh_from_db()
+    assert operation.bytes_copied == 1000
+
+
+@pytest.mark.django_db
+def test_get_operation_progress_computes_throughput():
+    operation = _create_running_operation(bytes_total=1000)
+    record_progress(
+        operation.operation_id,
+        ProgressSample(
+            received_at=operation.started_at + timedelta(seconds=50),
+            bytes_copied=250,
+            files_copied=3,
+        ),
+    )
+    operation.refresh_from_db()
+
+    progress = get_operation_progress(operation)
+
+    assert progress["progress"] == 0.25
+    assert progress["bytes_per_second"] == 5
+    assert progress["files_copied"] == 3
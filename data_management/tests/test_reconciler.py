@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+import pytest
+import requests
+from django.core.management import call_command
+from django.utils import timezone
+
+from data_management.models import (
+    LifecycleOperation,
+    LifecycleOperationStatus,
+    LifecycleOperationType,
+    LifecycleState,
+)
+from data_management.reconciler import (
+    UNKNOWN_OPERATION_ERROR_MESSAGE,
+    ReconcileReport,
+    get_stuck_operations,
+    reconcile_stuck_operations,
+)
+
+from .factories import ProjectDataFactory
+
+
+class DummyResponse:
+    def __init__(self, status_code: int, data: dict | None = None) -> None:
+        self.status_code = status_code
+        self.data = data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(str(self.status_code))
+
+    def json(self):
+        return self.data
+
+
+def _create_operation(
+    *,
+    started_hours_ago: int = 48,
+    status: str = LifecycleOperationStatus.RUNNING,
+    lifecycle_state: str = LifecycleState.COOLING,
+) -> LifecycleOperation:
+    return LifecycleOperation.objects.create(
+        project_data=ProjectDataFactory(lifecycle_state=lifecycle_state),
+        type=LifecycleOperationType.COOL,
+        status=status,
+        started_at=timezone.now() - timedelta(hours=started_hours_ago),
+        bytes_total=10,
+        files_total=2,
+    )
+
+
+@pytest.mark.django_db
+def test_get_stuck_operations():
+    stuck_operation = _create_operation()
+    _create_operation(started_hours_ago=1)
+    _create_operation(status=LifecycleOperationStatus.SUCCEEDED)
+    progressing_operation = _create_operation()
+    progressing_operation.progress_updated_at = timezone.now()
+    progressing_operation.save()
+
+    assert list(get_stuck_operations(timedelta(hours=24))) == [stuck_operation]
+
+
+@pytest.mark.django_db
+def test_reconcile_applies_tools_api_status():
+    succeeded_operation = _create_operation()
+    running_operation = _create_operation()
+    unknown_operation = _create_operation()
+    pending_operation = _create_operation(
+        status=LifecycleOperationStatus.PENDING, lifecycle_state=LifecycleState.HOT
+    )
+
+    with mock.patch(
+        "data_management.reconciler.post_lifecycle_operations_status",
+        return_value=DummyResponse(
+            200,
+            {
+                "operations": [
+                    {
+                        "operation_id": str(succeeded_operation.operation_id),
+                        "status": "SUCCEEDED",
+                        "bytes_copied": 10,
+                        "files_copied": 2,
+                    },
+                    {
+                        "operation_id": str(running_operation.operation_id),
+                        "status": "RUNNING",
+                    },
+                ]
+            },
+        ),
+    ):
+        report = reconcile_stuck_operations()
+
+    for operation in (
+        succeeded_operation,
+        running_operation,
+        unknown_operation,
+        pending_operation,
+    ):
+        operation.refresh_from_db()
+
+    assert report == ReconcileReport(
+        checked=4, reconciled=1, failed=2, running=1, errors=0
+    )
+    assert succeeded_operation.status == LifecycleOperationStatus.SUCCEEDED
+    assert succeeded_operation.project_data.lifecycle_state == LifecycleState.COOL
+    assert running_operation.status == LifecycleOperationStatus.RUNNING
+    assert unknown_operation.status == LifecycleOperationStatus.FAILED
+    assert unknown_operation.error_message == UNKNOWN_OPERATION_ERROR_MESSAGE
+    assert unknown_operation.project_data.lifecycle_state == LifecycleState.ERROR
+    # Never dispatched: the project stays available
+    assert pending_operation.status == LifecycleOperationStatus.FAILED
+    assert pending_operation.project_data.lifecycle_state == LifecycleState.HOT
+
+
+@pytest.mark.django_db
+def test_reconcile_leaves_operations_when_tools_api_fails():
+    operation = _create_operation()
+
+    with mock.patch(
+        "data_management.reconciler.post_lifecycle_operations_status",
+        side_effect=requests.ConnectionError("boom"),
+    ):
+        report = reconcile_stuck_operations()
+
+    operation.refresh_from_db()
+
+    assert report == ReconcileReport(checked=1, errors=1)
+    assert operation.status == LifecycleOperationStatus.RUNNING
+
+
+@pytest.mark.django_db
+def test_reconcile_leaves_operations_with_invalid_status():
+    operation = _create_operation()
+
+    with mock.patch(
+        "data_management.reconciler.post_lifecycle_operations_status",
+        return_value=DummyResponse(
+            200,
+            {"operations": [{"operation_id": str(operation.operation_id)}]},
+        ),
+    ):
+        report = reconcile_stuck_operations()
+
+    operation.refresh_from_db()
+
+    assert report == ReconcileReport(checked=1, errors=1)
+    assert operation.status == LifecycleOperationStatus.RUNNING
+
+
+@pytest.mark.django_db
+def test_reconcile_leaves_operations_with_malformed_status():
+    succeeded_operation = _create_operation()
+    unlisted_operation = _create_operation()
+
+    with mock.patch(
+        "data_management.reconciler.post_lifecycle_operations_status",
+        return_value=DummyResponse(
+            200,
+            {
+                "operations": [
+                    "malformed",
+                    {
+                        "operation_id": str(succeeded_operation.operation_id),
+                        "status": "SUCCEEDED",
+                        "bytes_copied": 10,
+                        "files_copied": 2,
+                    },
+                ]
+            },
+        ),
+    ):
+        report = reconcile_stuck_operations()
+
+    succeeded_operation.refresh_from_db()
+    unlisted_operation.refresh_from_db()
+
+    assert report == ReconcileReport(checked=2, reconciled=1, errors=1)
+    assert succeeded_operation.status == LifecycleOperationStatus.SUCCEEDED
+    # May be the operation of the malformed item
+    assert unlisted_operation.status == LifecycleOperationStatus.RUNNING
+
+
+@pytest.mark.django_db
+def test_reconcile_queries_tools_api_by_batch():
+    operations = [_create_operation() for _ in range(3)]
+
+    with mock.patch(
+        "data_management.reconciler.post_lifecycle_operations_status",
+        return_value=DummyResponse(
+            200,
+            {
+                "operations": [
+                    {"operation_id": str(operation.operation_id), "status": "RUNNING"}
+                    for operation in operations
+                ]
+            },
+        ),
+    ) as status_mock:
+        report = reconcile_stuck_operations(batch_size=2)
+
+    assert status_mock.call_count == 2
+    assert report.running == 3
+
+
+@pytest.mark.django_db
+def test_reconcile_lifecycle_operations_command():
+    with mock.patch(
+        "data_management.management.commands.reconcile_lifecycle_operations"
+        ".reconcile_stuck_operations",
+        return_value=ReconcileReport(checked=2, failed=2),
+    ) as reconcile_mock:
+        call_command(
+            "reconcile_lifecycle_operations", timeout_hours=6, stdout=StringIO()
+        )
+
+    reconcile_mock.assert_called_once_with(timeout=timedelta(hours=6))
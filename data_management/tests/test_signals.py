@@ -1,15 +1,22 @@
 from datetime import datetime, timedelta
 from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest import mock
 
 import pytest
+from django.core.management import call_command
+from django.db import transaction
 from django.utils import timezone
 
-from data_management.eligibility import compute_cooling_eligible_at
+from data_management.eligibility import compute_cooling_eligible_at, sync_many
 from data_management.models import ProjectData
 from lab.runs.models import Run
 from lab.runs.signals import run_scheduled
 from lab.tests.factories import ProjectFactory, RunFactory
 
+# Run changes sync eligibility once committed: tests of run signals use
+# transactional databases.
+
 
 @pytest.mark.django_db
 def test_project_data_created_with_initial_eligibility():
@@ -21,7 +28,7 @@ def test_project_data_created_with_initial_eligibility():
     assert project_data.cooling_eligible_at == expected
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_setting_embargo_date_sets_project_eligibility():
     run = RunFactory(end_date=None, embargo_date=None)
     project_data = ProjectData.objects.get(project=run.project)
@@ -34,7 +41,7 @@ def test_setting_embargo_date_sets_project_eligibility():
     assert project_data.cooling_eligible_at == embargo_date
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_updating_embargo_date_recomputes_project_eligibility():
     project = ProjectFactory()
     initial_embargo_date = timezone.localdate() + timedelta(days=10)
@@ -53,7 +60,7 @@ def test_updating_embargo_date_recomputes_project_eligibility():
     assert project_data.cooling_eligible_at == updated_embargo_date
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_run_scheduled_updates_project_eligibility_without_embargo():
     project = ProjectFactory()
     early_end_date = timezone.now() + timedelta(days=2)
@@ -69,7 +76,7 @@ def test_run_scheduled_updates_project_eligibility_without_embargo():
     assert project_data.cooling_eligible_at == expected
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_run_scheduled_uses_later_non_embargo_candidate_over_embargo_date():
     project = ProjectFactory()
     embargo_date = timezone.localdate() + timedelta(days=10)
@@ -89,7 +96,7 @@ def test_run_scheduled_uses_later_non_embargo_candidate_over_embargo_date():
     assert project_data.cooling_eligible_at == expected
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_run_scheduled_uses_latest_end_date_even_when_instance_missing_end_date():
     project = ProjectFactory()
     latest_end_date = timezone.now() + timedelta(days=10)
@@ -104,7 +111,7 @@ def test_run_scheduled_uses_latest_end_date_even_when_instance_missing_end_date(
     assert project_data.cooling_eligible_at == expected
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_run_scheduled_keeps_later_embargo_candidate_over_non_embargo_date():
     project = ProjectFactory()
     embargo_date = timezone.localdate() + timedelta(days=40)
@@ -119,7 +126,7 @@ def test_run_scheduled_keeps_later_embargo_candidate_over_non_embargo_date():
     assert project_data.cooling_eligible_at == embargo_date
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_run_save_recomputes_stale_embargo_based_project_eligibility():
     project = ProjectFactory()
     embargo_date = timezone.localdate() + timedelta(days=10)
@@ -139,7 +146,7 @@ def test_run_save_recomputes_stale_embargo_based_project_eligibility():
     assert project_data.cooling_eligible_at == expected
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_run_scheduled_uses_local_date_for_latest_end_date():
     end_date = datetime(2026, 3, 12, 23, 30, tzinfo=dt_timezone.utc)
     run = RunFactory(end_date=end_date, embargo_date=None)
@@ -161,3 +168,102 @@ def test_compute_cooling_eligible_at_uses_local_date_for_project_created_at():
 
     expected = timezone.localdate(created_at + timedelta(days=30 * 24))
     assert compute_cooling_eligible_at(project) == expected
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_saves_sync_project_eligibility_once_per_transaction():
+    project = ProjectFactory()
+    other_project = ProjectFactory()
+    runs = RunFactory.create_batch(3, project=project, embargo_date=None)
+    other_run = RunFactory(project=other_project, embargo_date=None)
+
+    with mock.patch(
+        "data_management.eligibility.sync_many", wraps=sync_many
+    ) as sync_many_mock:
+        with transaction.atomic():
+            for run in [*runs, other_run]:
+                run.save()
+            run_scheduled.send(sender=Run, instance=runs[0])
+
+    sync_many_mock.assert_called_once_with({project.pk, other_project.pk})
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_saves_do_not_sync_project_eligibility_on_rollback():
+    run = RunFactory(end_date=None, embargo_date=None)
+    project_data = ProjectData.objects.get(project=run.project)
+    initial_cooling_eligible_at = project_data.cooling_eligible_at
+
+    with mock.patch("data_management.eligibility.sync_many") as sync_many_mock:
+        try:
+            with transaction.atomic():
+                run.embargo_date = timezone.localdate() + timedelta(days=10)
+                run.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+    sync_many_mock.assert_not_called()
+    project_data.refresh_from_db()
+    assert project_data.cooling_eligible_at == initial_cooling_eligible_at
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_saves_sync_project_eligibility_after_savepoint_rollback():
+    run = RunFactory(end_date=None, embargo_date=None)
+    embargo_date = timezone.localdate() + timedelta(days=10)
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                run.save()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        run.embargo_date = embargo_date
+        run.save()
+
+    project_data = ProjectData.objects.get(project=run.project)
+    assert project_data.cooling_eligible_at == embargo_date
+
+
+@pytest.mark.django_db
+def test_sync_many_matches_single_project_computation(django_assert_num_queries):
+    embargo_project, end_date_project, project_without_runs = (
+        ProjectFactory.create_batch(3)
+    )
+    RunFactory(
+        project=embargo_project,
+        end_date=timezone.now() - timedelta(days=700),
+        embargo_date=timezone.localdate() + timedelta(days=40),
+    )
+    RunFactory(
+        project=end_date_project,
+        end_date=datetime(2026, 3, 12, 23, 30, tzinfo=dt_timezone.utc),
+        embargo_date=None,
+    )
+    RunFactory(project=end_date_project, end_date=None, embargo_date=None)
+    ProjectData.objects.update(cooling_eligible_at=None)
+    ProjectData.objects.filter(project=project_without_runs).delete()
+    projects = [embargo_project, end_date_project, project_without_runs]
+
+    # Projects with run dates, project data, creation, update
+    with django_assert_num_queries(4):
+        assert sync_many(project.pk for project in projects) == 3
+
+    for project in projects:
+        assert ProjectData.objects.get(
+            project=project
+        ).cooling_eligible_at == compute_cooling_eligible_at(project)
+
+
+@pytest.mark.django_db
+def test_sync_project_cooling_eligibility_command():
+    project = ProjectFactory()
+    ProjectData.objects.update(cooling_eligible_at=None)
+
+    call_command("sync_project_cooling_eligibility", stdout=StringIO())
+
+    assert ProjectData.objects.get(
+        project=project
+    ).cooling_eligible_at == compute_cooling_eligible_at(project)
@@ -0,0 +1,180 @@
+"""HTTP client shared by every call to the Euphrosyne Tools API.
+
+Requests go through a single pooled session per process, so that connections
+(and their TLS handshake) are kept alive between calls. Idempotent requests
+are retried with an exponential backoff on connection errors, timeouts and
+gateway errors. Other requests are only retried when the connection could not
+be established, as the tools API may otherwise have received them.
+
+Latency and errors are counted by endpoint, see `get_stats`."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from .utils import build_tools_api_url, get_tools_api_auth_header
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 5
+# Number of retries after the first attempt
+MAX_RETRIES = 2
+# Delay before the first retry, doubled at each retry
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Kept connections to the tools API, at least the concurrency of the cooling
+# scheduler
+POOL_MAX_SIZE = 10
+
+
+@dataclasses.dataclass
+class EndpointStats:
+    # Attempts, retries included
+    requests: int = 0
+    # Attempts which raised or got a non-ok response
+    errors: int = 0
+    retries: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+
+    @property
+    def mean_seconds(self) -> float | None:
+        return self.total_seconds / self.requests if self.requests else None
+
+
+# Sessions by process id, as they must not be shared with forked processes
+# (e.g. web workers)
+_sessions: dict[int, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_stats: dict[str, EndpointStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    pid = os.getpid()
+    with _sessions_lock:
+        if pid not in _sessions:
+            _sessions.clear()
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAX_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[pid] = session
+        return _sessions[pid]
+
+
+# pylint: disable=too-many-arguments
+def request(
+    method: str,
+    path: str,
+    *,
+    endpoint: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    idempotent: bool | None = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send an authorized request to the tools API and return its response,
+    whatever its status. Errors of the last attempt are raised.
+
+    `endpoint` names the counters of the request. It defaults to the path
+    without its query string and should be given for paths holding
+    identifiers. `idempotent` defaults to whether the method is."""
+    method = method.upper()
+    url = build_tools_api_url(path)
+    endpoint = endpoint or f"{method} {path.split('?')[0].lstrip('/')}"
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    headers = {**get_tools_api_auth_header(), **kwargs.pop("headers", {})}
+
+    attempt = 0
+    while True:
+        try:
+            response = _send(
+                endpoint, method, url, timeout=timeout, headers=headers, **kwargs
+            )
+        except requests.RequestException as error:
+            if attempt >= MAX_RETRIES or not _can_retry(error, idempotent):
+                raise
+            logger.warning("Retrying %s %s after error: %s", method, url, error)
+        else:
+            if (
+                attempt >= MAX_RETRIES
+                or not idempotent
+                or response.status_code not in RETRY_STATUS_CODES
+            ):
+                return response
+            logger.warning(
+                "Retrying %s %s after status %s", method, url, response.status_code
+            )
+        _record_retry(endpoint)
+        time.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+        attempt += 1
+
+
+def get_stats() -> dict[str, EndpointStats]:
+    """Counters of the requests sent by this process, by endpoint."""
+    with _stats_lock:
+        return {
+            endpoint: dataclasses.replace(stats) for endpoint, stats in _stats.items()
+        }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def _send(endpoint: str, method: str, url: str, **kwargs: Any) -> requests.Response:
+    start = time.monotonic()
+    ok = False
+    try:
+        response = get_session().request(method, url, **kwargs)
+        ok = bool(response.ok)
+        return response
+    finally:
+        _record_request(endpoint, time.monotonic() - start, ok)
+
+
+def _can_retry(error: requests.RequestException, idempotent: bool) -> bool:
+    if _was_not_sent(error):
+        return True
+    return idempotent and isinstance(
+        error, (requests.ConnectionError, requests.Timeout)
+    )
+
+
+def _was_not_sent(error: requests.RequestException) -> bool:
+    """Whether the connection could not be established (timed out, refused,
+    unresolved host...)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    # Raised by urllib3 as the reason of a MaxRetryError
+    reason = getattr(error.args[0], "reason", error.args[0])
+    return isinstance(reason, NewConnectionError)
+
+
+def _record_request(endpoint: str, duration: float, ok: bool):
+    with _stats_lock:
+        stats = _stats.setdefault(endpoint, EndpointStats())
+        stats.requests += 1
+        stats.total_seconds += duration
+        stats.max_seconds = max(stats.max_seconds, duration)
+        if not ok:
+            stats.errors += 1
+
+
+def _record_retry(endpoint: str):
+    with _stats_lock:
+        _stats.setdefault(endpoint, EndpointStats()).retries += 1
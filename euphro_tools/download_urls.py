@@ -6,8 +6,9 @@ from urllib.parse import urlencode
 
 import requests
 
+from . import client
 from .exceptions import EuphroToolsException
-from .utils import build_tools_api_url, get_run_data_path, get_tools_api_auth_header
+from .utils import build_tools_api_url, get_run_data_path
 
 DataType = typing.Literal["raw_data", "processed_data"]
 
@@ -33,18 +34,17 @@ def fetch_token_for_run_data(
     expiration: datetime | None = None,
     data_request_id: str | None = None,
 ) -> str:
-    token_url = build_tools_api_url(f"/data/{project_slug}/token")
     params = {"path": get_run_data_path(project_slug, run_label, data_type)}
     if expiration:
         params["expiration"] = expiration.isoformat()
     if data_request_id:
         params["data_request"] = data_request_id
     try:
-        request = requests.get(
-            token_url,
+        request = client.request(
+            "GET",
+            f"/data/{project_slug}/token",
+            endpoint="GET data/{project}/token",
             params=params,
-            timeout=5,
-            headers=get_tools_api_auth_header(),
         )
         request.raise_for_status()
     except (requests.HTTPError, requests.ConnectionError) as error:
@@ -61,12 +61,11 @@ def get_storage_info_for_project_images(
     project_slug: str,
 ) -> GetUrlAndTokenForProjectImagesResponse:
     """Get a download URL and token for a project's images."""
-    url = build_tools_api_url(f"/images/projects/{project_slug}/signed-url")
     try:
-        request = requests.get(
-            url,
-            timeout=5,
-            headers=get_tools_api_auth_header(),
+        request = client.request(
+            "GET",
+            f"/images/projects/{project_slug}/signed-url",
+            endpoint="GET images/projects/{project}/signed-url",
         )
         request.raise_for_status()
     except (requests.HTTPError, requests.ConnectionError) as error:
@@ -1,11 +1,10 @@
 import logging
-import os
 from typing import Optional
 
 import requests
 from django.utils.translation import gettext_lazy as _
 
-from euphro_auth.jwt.tokens import EuphroToolsAPIToken
+from . import client
 
 logger = logging.getLogger(__name__)
 
@@ -15,30 +14,26 @@ class RenameFailedError(Exception):
 
 
 def _make_request(
-    url: str, raise_on_error: bool = False
+    path: str, endpoint: str, raise_on_error: bool = False
 ) -> Optional[requests.Response]:
     """Make an authorized request to Euphrosyne tools API."""
-    token = EuphroToolsAPIToken.for_euphrosyne().access_token
     try:
-        return requests.post(
-            url,
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=5,
-        )
+        return client.request("POST", path, endpoint=endpoint)
     except (requests.Timeout, requests.ConnectionError) as error:
         if raise_on_error:
             raise error
         logger.error(
             "Error making call to Euphrosyne Tools API.\nURL: %s\nReason: %s",
-            url,
+            path,
             str(error),
         )
     return None
 
 
 def initialize_project_directory(project_slug: str):
-    base_url = os.environ["EUPHROSYNE_TOOLS_API_URL"]
-    response = _make_request(f"{base_url}/data/{project_slug}/init")
+    response = _make_request(
+        f"/data/{project_slug}/init", endpoint="POST data/{project}/init"
+    )
     if response is not None and not response.ok:
         logger.error(
             "Could not init project %s directory. %s: %s",
@@ -49,8 +44,10 @@ def initialize_project_directory(project_slug: str):
 
 
 def initialize_run_directory(project_slug: str, run_name: str):
-    base_url = os.environ["EUPHROSYNE_TOOLS_API_URL"]
-    response = _make_request(f"{base_url}/data/{project_slug}/runs/{run_name}/init")
+    response = _make_request(
+        f"/data/{project_slug}/runs/{run_name}/init",
+        endpoint="POST data/{project}/runs/{run}/init",
+    )
     if response is not None and not response.ok:
         logger.error(
             "Could not init run %s directory of project %s. %s: %s",
@@ -62,9 +59,9 @@ def initialize_run_directory(project_slug: str, run_name: str):
 
 
 def rename_run_directory(project_slug: str, run_name: str, new_run_name: str):
-    base_url = os.environ["EUPHROSYNE_TOOLS_API_URL"]
     response = _make_request(
-        f"{base_url}/data/{project_slug}/runs/{run_name}/rename/{new_run_name}"
+        f"/data/{project_slug}/runs/{run_name}/rename/{new_run_name}",
+        endpoint="POST data/{project}/runs/{run}/rename/{name}",
     )
     if response is not None and not response.ok:
         logger.error(
@@ -78,12 +75,12 @@ def rename_run_directory(project_slug: str, run_name: str, new_run_name: str):
 
 
 def rename_project_directory(project_slug: str, new_project_slug: str):
-    base_url = os.environ["EUPHROSYNE_TOOLS_API_URL"]
     base_error_message = "Could not update project directory name from %s to %s. %s"
     error = ""
     try:
         response = _make_request(
-            f"{base_url}/data/{project_slug}/rename/{new_project_slug}",
+            f"/data/{project_slug}/rename/{new_project_slug}",
+            endpoint="POST data/{project}/rename/{name}",
             raise_on_error=True,
         )
     except (requests.Timeout, requests.ConnectionError) as e:
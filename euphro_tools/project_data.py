@@ -4,7 +4,7 @@ from urllib.parse import quote, urlencode
 
 import requests
 
-from .utils import build_tools_api_url, get_tools_api_auth_header
+from . import client
 
 
 def post_cool_project(
@@ -14,14 +14,12 @@ def post_cool_project(
     timeout: int,
 ) -> requests.Response:
     project_part = quote(project_slug, safe="")
-    url = build_tools_api_url(
+    return client.request(
+        "POST",
         f"data/projects/{project_part}/cool"
-        f"?operation_id={quote(operation_id, safe='')}"
-    )
-    return requests.post(
-        url,
+        f"?operation_id={quote(operation_id, safe='')}",
+        endpoint="POST data/projects/{project}/cool",
         timeout=timeout,
-        headers=get_tools_api_auth_header(),
     )
 
 
@@ -32,14 +30,12 @@ def post_restore_project(
     timeout: int,
 ) -> requests.Response:
     project_part = quote(project_slug, safe="")
-    url = build_tools_api_url(
+    return client.request(
+        "POST",
         f"data/projects/{project_part}/restore"
-        f"?operation_id={quote(operation_id, safe='')}"
-    )
-    return requests.post(
-        url,
+        f"?operation_id={quote(operation_id, safe='')}",
+        endpoint="POST data/projects/{project}/restore",
         timeout=timeout,
-        headers=get_tools_api_auth_header(),
     )
 
 
@@ -62,11 +58,28 @@ def post_delete_project_source_data(
             "total_size": total_size,
         }
     )
-    url = build_tools_api_url(
-        f"data/projects/{project_part}/delete/{storage_role_part}" f"?{query_string}"
+    return client.request(
+        "POST",
+        f"data/projects/{project_part}/delete/{storage_role_part}?{query_string}",
+        endpoint="POST data/projects/{project}/delete/{storage_role}",
+        timeout=timeout,
     )
-    return requests.post(
-        url,
+
+
+def post_lifecycle_operations_status(
+    *,
+    operation_ids: list[str],
+    timeout: int,
+) -> requests.Response:
+    """Ask the status of lifecycle operations. The tools API answers with
+    `{"operations": [...]}`, each item using the callback payload format, with
+    PENDING or RUNNING statuses for operations still in progress. Unknown
+    operations are left out."""
+    return client.request(
+        "POST",
+        "data/operations/status",
+        json={"operation_ids": operation_ids},
         timeout=timeout,
-        headers=get_tools_api_auth_header(),
+        # Read only
+        idempotent=True,
     )
@@ -0,0 +1,175 @@
+from unittest import mock
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from .. import client
+
+
+@pytest.fixture(name="request_mock")
+def request_mock_fixture():
+    client.reset_stats()
+    with (
+        mock.patch("euphro_tools.client.get_session") as session_mock,
+        mock.patch("euphro_tools.utils._get_euphrosyne_token", return_value="token"),
+    ):
+        yield session_mock.return_value.request
+    client.reset_stats()
+
+
+@pytest.fixture(name="sleep_mock", autouse=True)
+def sleep_mock_fixture():
+    with mock.patch("euphro_tools.client.time.sleep") as sleep_mock:
+        yield sleep_mock
+
+
+def _response(status_code: int) -> mock.Mock:
+    return mock.Mock(status_code=status_code, ok=status_code < 400)
+
+
+def test_get_session_is_reused():
+    assert client.get_session() is client.get_session()
+
+
+def test_get_session_is_recreated_in_forked_process():
+    session = client.get_session()
+    with mock.patch("euphro_tools.client.os.getpid", return_value=-1):
+        assert client.get_session() is not session
+
+
+def test_request(request_mock: mock.MagicMock):
+    request_mock.return_value = _response(200)
+
+    response = client.request(
+        "get", "/data/project/token", params={"path": "path"}, timeout=10
+    )
+
+    assert response is request_mock.return_value
+    request_mock.assert_called_once_with(
+        "GET",
+        "https://tools/data/project/token",
+        timeout=10,
+        headers={"Authorization": "Bearer token"},
+        params={"path": "path"},
+    )
+
+
+def test_request_retries_idempotent_request_with_backoff(
+    request_mock: mock.MagicMock, sleep_mock: mock.MagicMock
+):
+    request_mock.side_effect = [
+        requests.ConnectionError(),
+        _response(503),
+        _response(200),
+    ]
+
+    response = client.request("GET", "/vms")
+
+    assert response.status_code == 200
+    assert request_mock.call_count == 3
+    assert [call.args[0] for call in sleep_mock.call_args_list] == [
+        client.RETRY_BACKOFF_SECONDS,
+        client.RETRY_BACKOFF_SECONDS * 2,
+    ]
+
+
+def test_request_returns_last_response_after_retries(request_mock: mock.MagicMock):
+    request_mock.return_value = _response(502)
+
+    response = client.request("GET", "/vms")
+
+    assert response.status_code == 502
+    assert request_mock.call_count == client.MAX_RETRIES + 1
+
+
+def test_request_raises_last_error_after_retries(request_mock: mock.MagicMock):
+    request_mock.side_effect = requests.ReadTimeout()
+
+    with pytest.raises(requests.ReadTimeout):
+        client.request("GET", "/vms")
+
+    assert request_mock.call_count == client.MAX_RETRIES + 1
+
+
+def test_request_does_not_retry_non_idempotent_request(
+    request_mock: mock.MagicMock,
+):
+    request_mock.side_effect = requests.ReadTimeout()
+
+    with pytest.raises(requests.ReadTimeout):
+        client.request("POST", "/data/project/init")
+    request_mock.side_effect = None
+    request_mock.return_value = _response(503)
+    assert client.request("POST", "/data/project/init").status_code == 503
+
+    assert request_mock.call_count == 2
+
+
+def test_request_retries_non_idempotent_request_not_sent(
+    request_mock: mock.MagicMock,
+):
+    request_mock.side_effect = [requests.ConnectTimeout(), _response(202)]
+
+    assert client.request("POST", "/data/project/init").status_code == 202
+
+
+def test_request_retries_non_idempotent_request_refused(
+    request_mock: mock.MagicMock,
+):
+    refused = NewConnectionError(mock.Mock(), "Connection refused")
+    request_mock.side_effect = [
+        requests.ConnectionError(MaxRetryError(mock.Mock(), "/", reason=refused)),
+        _response(202),
+    ]
+
+    assert client.request("POST", "/data/project/init").status_code == 202
+
+
+def test_request_does_not_retry_non_idempotent_request_reset(
+    request_mock: mock.MagicMock,
+):
+    request_mock.side_effect = requests.ConnectionError("Connection reset")
+
+    with pytest.raises(requests.ConnectionError):
+        client.request("POST", "/data/project/init")
+
+    assert request_mock.call_count == 1
+
+
+def test_request_retries_request_marked_idempotent(request_mock: mock.MagicMock):
+    request_mock.side_effect = [_response(504), _response(200)]
+
+    client.request("POST", "/data/operations/status", idempotent=True)
+
+    assert request_mock.call_count == 2
+
+
+def test_request_does_not_retry_client_errors(request_mock: mock.MagicMock):
+    request_mock.return_value = _response(404)
+
+    assert client.request("GET", "/data/available/project").status_code == 404
+    assert request_mock.call_count == 1
+
+
+def test_get_stats(request_mock: mock.MagicMock):
+    request_mock.side_effect = [
+        requests.ConnectionError(),
+        _response(200),
+        _response(200),
+        _response(404),
+    ]
+
+    client.request("GET", "/data/available/a", endpoint="GET data/available")
+    client.request("GET", "/data/available/b", endpoint="GET data/available")
+    client.request("GET", "/vms?created_before=2024-01-01")
+
+    stats = client.get_stats()
+    assert set(stats) == {"GET data/available", "GET vms"}
+    assert stats["GET data/available"].requests == 3
+    assert stats["GET data/available"].errors == 1
+    assert stats["GET data/available"].retries == 1
+    assert stats["GET vms"].requests == 1
+    assert stats["GET vms"].errors == 1
+    assert stats["GET vms"].retries == 0
+    assert stats["GET vms"].mean_seconds is not None
@@ -12,8 +12,8 @@ from ..download_urls import fetch_token_for_run_data, generate_download_url
 
 class TestDownloaldUrls(TestCase):
     def setUp(self):
-        patcher = mock.patch("euphro_tools.download_urls.requests.get")
-        self.requests_get_mock = patcher.start()
+        patcher = mock.patch("euphro_tools.client.get_session")
+        self.request_mock = patcher.start().return_value.request
         self.addCleanup(patcher.stop)
 
         patcher = mock.patch("euphro_tools.utils._get_euphrosyne_token")
@@ -41,36 +41,36 @@ class TestDownloaldUrls(TestCase):
 
     def test_fetch_token_for_run_data(self):
         now = datetime.now()
-        self.requests_get_mock.return_value.json.return_value = {"token": "token"}
+        self.request_mock.return_value.json.return_value = {"token": "token"}
 
         token = fetch_token_for_run_data(
             "project_slug", "run_label", "raw_data", expiration=now
         )
 
         assert token == "token"
-        url = self.requests_get_mock.call_args[0][0]
+        url = self.request_mock.call_args[0][1]
         assert url == "http://example.com/data/project_slug/token"
-        params = self.requests_get_mock.call_args[1]["params"]
+        params = self.request_mock.call_args[1]["params"]
         assert params == {
             "path": "projects/project_slug/runs/run_label/raw_data",
             "expiration": now.isoformat(),
         }
-        assert self.requests_get_mock.call_args[1]["headers"] == {
+        assert self.request_mock.call_args[1]["headers"] == {
             "Authorization": "Bearer access"
         }
 
     def test_fetch_token_for_run_data_with_data_request_id(self):
-        self.requests_get_mock.return_value.json.return_value = {"token": "token"}
+        self.request_mock.return_value.json.return_value = {"token": "token"}
         fetch_token_for_run_data(
             "project_slug", "run_label", "raw_data", data_request_id="1"
         )
-        params = self.requests_get_mock.call_args[1]["params"]
+        params = self.request_mock.call_args[1]["params"]
         assert params["data_request"] == "1"
 
     def test_fetch_token_for_run_data_raise_euphro_tools_exception(
         self,
     ):
-        self.requests_get_mock.side_effect = HTTPError()
+        self.request_mock.side_effect = HTTPError()
 
         with pytest.raises(EuphroToolsException):
             fetch_token_for_run_data("project_slug", "run_label", "raw_data")
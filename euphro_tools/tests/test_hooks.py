@@ -12,69 +12,76 @@ from ..hooks import (
 )
 
 
-@patch("euphro_tools.hooks.requests")
+@patch("euphro_tools.client.get_session")
 def test_initialize_project_directory(
-    requests_mock: MagicMock, monkeypatch: MonkeyPatch
+    session_mock: MagicMock, monkeypatch: MonkeyPatch
 ):
     monkeypatch.setenv("EUPHROSYNE_TOOLS_API_URL", "http://euphro.tools")
     initialize_project_directory("project")
 
-    requests_mock.post.assert_called_once()
-    assert requests_mock.post.call_args[0] == ("http://euphro.tools/data/project/init",)
+    request_mock = session_mock.return_value.request
+    request_mock.assert_called_once()
+    assert request_mock.call_args[0] == (
+        "POST",
+        "http://euphro.tools/data/project/init",
+    )
 
 
-@patch("euphro_tools.hooks.requests")
-def test_initialize_run_directory(requests_mock: MagicMock, monkeypatch: MonkeyPatch):
+@patch("euphro_tools.client.get_session")
+def test_initialize_run_directory(session_mock: MagicMock, monkeypatch: MonkeyPatch):
     monkeypatch.setenv("EUPHROSYNE_TOOLS_API_URL", "http://euphro.tools")
     initialize_run_directory("project", "run")
 
-    requests_mock.post.assert_called_once()
-    assert requests_mock.post.call_args[0] == (
+    request_mock = session_mock.return_value.request
+    request_mock.assert_called_once()
+    assert request_mock.call_args[0] == (
+        "POST",
         "http://euphro.tools/data/project/runs/run/init",
     )
 
 
-@patch("euphro_tools.hooks.requests")
-def test_rename_run_directory(requests_mock: MagicMock, monkeypatch: MonkeyPatch):
+@patch("euphro_tools.client.get_session")
+def test_rename_run_directory(session_mock: MagicMock, monkeypatch: MonkeyPatch):
     monkeypatch.setenv("EUPHROSYNE_TOOLS_API_URL", "http://euphro.tools")
     rename_run_directory("project", "run", "newname")
 
-    requests_mock.post.assert_called_once()
-    assert requests_mock.post.call_args[0] == (
+    request_mock = session_mock.return_value.request
+    request_mock.assert_called_once()
+    assert request_mock.call_args[0] == (
+        "POST",
         "http://euphro.tools/data/project/runs/run/rename/newname",
     )
 
 
-@patch("euphro_tools.hooks.requests")
-def test_rename_project_directory(requests_mock: MagicMock, monkeypatch: MonkeyPatch):
+@patch("euphro_tools.client.get_session")
+def test_rename_project_directory(session_mock: MagicMock, monkeypatch: MonkeyPatch):
     monkeypatch.setenv("EUPHROSYNE_TOOLS_API_URL", "http://euphro.tools")
     rename_project_directory("project", "newname")
 
-    requests_mock.post.assert_called_once()
-    assert requests_mock.post.call_args[0] == (
+    request_mock = session_mock.return_value.request
+    request_mock.assert_called_once()
+    assert request_mock.call_args[0] == (
+        "POST",
         "http://euphro.tools/data/project/rename/newname",
     )
 
 
-@patch("euphro_tools.hooks.requests")
-@patch("euphro_tools.hooks.EuphroToolsAPIToken")
-def test_make_request_has_auth_header(
-    token_class_mock: MagicMock, request_mock: MagicMock
-):
-    _make_request("https://url")
-    token_class_mock.for_euphrosyne.assert_called()
-    assert "Authorization" in request_mock.post.call_args[1]["headers"]
-    assert request_mock.post.call_args[1]["headers"]["Authorization"].startswith(
-        "Bearer "
-    )
+@patch("euphro_tools.client.get_session")
+@patch("euphro_tools.utils._get_euphrosyne_token")
+def test_make_request_has_auth_header(token_mock: MagicMock, session_mock: MagicMock):
+    token_mock.return_value = "token"
+    _make_request("/url", endpoint="url")
+    token_mock.assert_called()
+    request_mock = session_mock.return_value.request
+    assert request_mock.call_args[1]["headers"]["Authorization"] == "Bearer token"
 
 
 @patch("euphro_tools.hooks.logger")
-@patch("euphro_tools.hooks.requests.post")
+@patch("euphro_tools.client.get_session")
 def test_make_request_log_error_on_timeout(
-    request_post_mock: MagicMock, logger_mock: MagicMock
+    session_mock: MagicMock, logger_mock: MagicMock
 ):
-    request_post_mock.side_effect = requests.Timeout()
-    _make_request("https://url")
+    session_mock.return_value.request.side_effect = requests.ReadTimeout()
+    _make_request("/url", endpoint="url")
 
     logger_mock.error.assert_called()
@@ -2,13 +2,16 @@ from unittest import mock
 
 from django.test import TestCase
 
-from euphro_tools.project_data import post_delete_project_source_data
+from euphro_tools.project_data import (
+    post_delete_project_source_data,
+    post_lifecycle_operations_status,
+)
 
 
 class TestProjectData(TestCase):
     def setUp(self):
-        patcher = mock.patch("euphro_tools.project_data.requests.post")
-        self.requests_post_mock = patcher.start()
+        patcher = mock.patch("euphro_tools.client.get_session")
+        self.request_mock = patcher.start().return_value.request
         self.addCleanup(patcher.stop)
 
         patcher = mock.patch("euphro_tools.utils._get_euphrosyne_token")
@@ -36,12 +39,28 @@ class TestProjectData(TestCase):
             timeout=10,
         )
 
-        url = self.requests_post_mock.call_args[0][0]
+        url = self.request_mock.call_args[0][1]
         assert (
             url
             == "http://example.com/data/projects/project%20slug/delete/HOT?operation_id=operation-id&file_count=122&total_size=1234567890"  # pylint: disable=line-too-long
         )
-        assert self.requests_post_mock.call_args[1]["timeout"] == 10
-        assert self.requests_post_mock.call_args[1]["headers"] == {
+        assert self.request_mock.call_args[1]["timeout"] == 10
+        assert self.request_mock.call_args[1]["headers"] == {
+            "Authorization": "Bearer access"
+        }
+
+    def test_post_lifecycle_operations_status(self):
+        post_lifecycle_operations_status(
+            operation_ids=["operation-1", "operation-2"], timeout=10
+        )
+
+        assert (
+            self.request_mock.call_args[0][1]
+            == "http://example.com/data/operations/status"
+        )
+        assert self.request_mock.call_args[1]["json"] == {
+            "operation_ids": ["operation-1", "operation-2"]
+        }
+        assert self.request_mock.call_args[1]["headers"] == {
             "Authorization": "Bearer access"
         }
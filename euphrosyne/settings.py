@@ -167,6 +167,9 @@ MIDDLEWARE = (["debug_toolbar.middleware.DebugToolbarMiddleware"] if DEBUG else
     "euphro_auth.middlewares.CGUAcceptanceMiddleware",
 ]
 
+if "data_management" in EUPHROSYNE_FEATURES:
+    MIDDLEWARE.append("data_management.middleware.LifecycleStateCacheMiddleware")
+
 if "radiation_protection" in EUPHROSYNE_FEATURES:
     MIDDLEWARE.append(
         "lab.participations.middleware.ParticipationEmployerCompletionMiddleware"
@@ -433,6 +436,9 @@ REST_FRAMEWORK = {
 ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST")
 ELASTICSEARCH_USERNAME = os.getenv("ELASTICSEARCH_USERNAME")
 ELASTICSEARCH_PASSWORD = os.getenv("ELASTICSEARCH_PASSWORD")
+# Serve catalog searches with the async OpenSearch client. Only enable when
+# the application is run under ASGI (see euphrosyne/asgi.py).
+ELASTICSEARCH_ASYNC = _get_bool_env("ELASTICSEARCH_ASYNC", default=False)
 
 
 def _get_nav_items(request: HttpRequest) -> list:
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class LabConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "lab"
+
+    def ready(self) -> None:
+        # Import signals to ensure they are connected
+        # pylint: disable=unused-import, import-outside-toplevel
+        from .elasticsearch import signals  # noqa: F401
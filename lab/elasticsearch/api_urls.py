@@ -1,22 +1,47 @@
+from django.conf import settings
 from django.urls import path
 
 from . import api_views
 
+if settings.ELASTICSEARCH_ASYNC:
+    search_view = api_views.async_search
+    aggregate_field_view = api_views.async_aggregate_field
+    aggregate_created_view = api_views.async_aggregate_created
+else:
+    search_view = api_views.search
+    aggregate_field_view = api_views.aggregate_field
+    aggregate_created_view = api_views.aggregate_created
+
 urlpatterns = (
     path("list-all", api_views.list_all_items, name="list-all"),
     path(
         "search",
-        api_views.search,
+        search_view,
         name="search",
     ),
     path(
         "aggregate",
-        api_views.aggregate_field,
+        aggregate_field_view,
         name="aggregate",
     ),
     path(
         "aggregate-created",
-        api_views.aggregate_created,
+        aggregate_created_view,
         name="aggregate-created",
     ),
+    path(
+        "aggregate-facets",
+        api_views.aggregate_facets,
+        name="aggregate-facets",
+    ),
+    path(
+        "aggregate-geo-clusters",
+        api_views.aggregate_geo_clusters,
+        name="aggregate-geo-clusters",
+    ),
+    path(
+        "suggest",
+        api_views.suggest,
+        name="suggest",
+    ),
 )
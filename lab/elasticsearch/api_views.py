@@ -1,19 +1,62 @@
+import json
+import logging
+from typing import Any, Iterable
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from .client import CatalogClient
+from . import queries
+from .async_client import AsyncCatalogClient
+from .client import SUGGESTION_FIELDS, CatalogClient
+
+logger = logging.getLogger(__name__)
+
+# Filters accepted by the map clusters endpoint: the facet filters, the
+# viewport and the full text query
+GEO_CLUSTER_FILTER_PARAMS = (
+    "q",
+    "location",
+    *(key for keys in queries.FACET_PARAMS.values() for key in keys),
+)
+# Expected JSON types of filter values, `location` being checked on its own
+_FILTER_TYPES: dict[str, type | tuple[type, ...]] = {
+    "q": str,
+    "status": str,
+    "category": str,
+    "collection": str,
+    "c2rmf_id": str,
+    "inventory": str,
+    "created_from": str,
+    "created_to": str,
+    "materials": list,
+    "dating_period_ids": list,
+    "dating_era_ids": list,
+    "is_data_embargoed": bool,
+}
 
 
 @api_view(["GET"])
 def list_all_items(request):
-    """Catalog items listing endpoint"""
-    results = CatalogClient().list_all_items()
-    return Response(results)
+    """Catalog items listing endpoint. Documents are streamed in the shape of
+    a search response. As the status is sent first, a listing interrupted by
+    an error is closed with an `error` key."""
+    # pylint: disable=http-response-with-content-type-json
+    return StreamingHttpResponse(
+        _stream_hits(CatalogClient().list_all_pages()),
+        content_type="application/json",
+    )
 
 
 @api_view(["POST"])
 def search(request):
     """Catalog search endpoint"""
+    error = _validate_search_params(request.data)
+    if error:
+        return Response({"error": error}, status=400)
     results = CatalogClient().search(**request.data)
     return Response(results)
 
@@ -42,3 +85,162 @@ def aggregate_created(request):
         "year",
     )
     return Response(results)
+
+
+@api_view(["POST"])
+def aggregate_facets(request):
+    """Catalog multi-facet aggregation endpoint"""
+    error = _validate_facets_params(request.data)
+    if error:
+        return Response({"error": error}, status=400)
+    results = CatalogClient().aggregate_facets(
+        request.data["fields"], **request.data.get("filters", {})
+    )
+    return Response(results)
+
+
+@api_view(["POST"])
+def aggregate_geo_clusters(request):
+    """Catalog map clusters endpoint"""
+    zoom = request.data.get("zoom")
+    if not isinstance(zoom, int) or isinstance(zoom, bool) or not 0 <= zoom <= 29:
+        return Response(
+            {"error": "'zoom' must be an integer between 0 and 29"}, status=400
+        )
+    filters = request.data.get("filters", {})
+    error = _validate_filters(filters, GEO_CLUSTER_FILTER_PARAMS)
+    if error:
+        return Response({"error": error}, status=400)
+    results = CatalogClient().aggregate_geo_clusters(zoom, **filters)
+    return Response(results)
+
+
+@api_view(["GET"])
+def suggest(request):
+    """Catalog typeahead endpoint"""
+    field = request.query_params.get("field")
+    if field not in SUGGESTION_FIELDS:
+        return Response(
+            {"error": "'field' must be one of " + ", ".join(SUGGESTION_FIELDS)},
+            status=400,
+        )
+    q = request.query_params.get("q", "").strip()
+    if not q:
+        return Response([])
+    results = CatalogClient().suggest(field, q)
+    return Response(results)
+
+
+@csrf_exempt
+@require_POST
+async def async_search(request):
+    """Catalog search endpoint, served under ASGI"""
+    try:
+        params = json.loads(request.body or "{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+    error = _validate_search_params(params)
+    if error:
+        return JsonResponse({"error": error}, status=400)
+    results = await AsyncCatalogClient().search(**params)
+    return JsonResponse(results)
+
+
+@require_GET
+async def async_aggregate_field(request):
+    """Catalog aggregation endpoint, served under ASGI"""
+    exclude = None
+    if "field" not in request.GET:
+        return JsonResponse({"error": "'field' query param is required"}, status=400)
+    if "exclude" in request.GET:
+        exclude = request.GET["exclude"].split(",")
+    results = await AsyncCatalogClient().aggregate_terms(
+        request.GET["field"],
+        query=request.GET.get("query"),
+        exclude=exclude,
+    )
+    return JsonResponse(results)
+
+
+@require_GET
+async def async_aggregate_created(request):
+    """Catalog aggregation endpoint, served under ASGI"""
+    results = await AsyncCatalogClient().aggregate_date(
+        "created",
+        "year",
+    )
+    return JsonResponse(results)
+
+
+def _validate_search_params(params: dict[str, Any]) -> str | None:
+    if params.get("projection", "full") not in queries.SOURCE_PROJECTIONS:
+        return "'projection' must be one of " + ", ".join(queries.SOURCE_PROJECTIONS)
+    return None
+
+
+def _validate_facets_params(params: dict[str, Any]) -> str | None:
+    fields = params.get("fields")
+    if not fields or not isinstance(fields, list):
+        return "'fields' must be a non-empty list"
+    if any(field not in queries.FACET_PARAMS for field in fields):
+        return "'fields' must be among " + ", ".join(queries.FACET_PARAMS)
+    return _validate_filters(
+        params.get("filters", {}), queries.QueryParams.__annotations__
+    )
+
+
+def _validate_filters(filters: Any, allowed_keys: Iterable[str]) -> str | None:
+    if not isinstance(filters, dict):
+        return "'filters' must be an object"
+    unknown_filters = set(filters) - set(allowed_keys)
+    if unknown_filters:
+        return "Unknown filters: " + ", ".join(sorted(unknown_filters))
+    for key, value in filters.items():
+        if key == "location":
+            if not _is_valid_location(value):
+                return "'location' must be a bounding box of lat/lon points"
+        elif key in _FILTER_TYPES and not isinstance(value, _FILTER_TYPES[key]):
+            return f"Invalid value for filter '{key}'"
+    return None
+
+
+def _is_valid_location(location: Any) -> bool:
+    if not isinstance(location, dict) or not (
+        set(location) == {"top_left", "bottom_right"}
+        or set(location) == {"top_right", "bottom_left"}
+    ):
+        return False
+    return all(_is_valid_geo_point(point) for point in location.values())
+
+
+def _is_valid_geo_point(point: Any) -> bool:
+    if not isinstance(point, dict) or set(point) != {"lat", "lon"}:
+        return False
+    lat, lon = point["lat"], point["lon"]
+    if any(
+        isinstance(value, bool) or not isinstance(value, (int, float))
+        for value in (lat, lon)
+    ):
+        return False
+    return -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def _stream_hits(pages: Iterable[dict[str, Any]]):
+    yield '{"hits": {"hits": ['
+    total = None
+    count = 0
+    error = None
+    try:
+        for page in pages:
+            if total is None:
+                total = page["hits"].get("total")
+            for hit in page["hits"]["hits"]:
+                yield ("," if count else "") + json.dumps(hit, cls=DjangoJSONEncoder)
+                count += 1
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception("Catalog listing interrupted after %s documents", count)
+        error = "Listing interrupted"
+    yield '], "total": %s}' % json.dumps(total)
+    if error:
+        yield ', "error": %s' % json.dumps(error)
+    yield "}"
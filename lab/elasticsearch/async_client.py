@@ -0,0 +1,93 @@
+"""Asynchronous catalog client, used by the catalog API views when the
+application is served under ASGI (see ELASTICSEARCH_ASYNC).
+
+Searches wait on OpenSearch without holding a worker: a single process serves
+many concurrent catalog queries over a shared pool of connections."""
+
+import time
+from typing import Any, Awaitable, Callable, Unpack
+
+from opensearchpy import AsyncOpenSearch, NotFoundError
+
+from lab.elasticsearch import queries
+
+from .cache import ResponseCache, make_cache_key
+from .client import (
+    GENERATION_CHECK_INTERVAL,
+    INDEX_NAME,
+    Singleton,
+    get_connection_params,
+    get_generation_from_mappings,
+)
+
+# Maximum number of connections kept open to OpenSearch by a process
+ASYNC_POOL_MAXSIZE = 50
+
+
+class AsyncCatalogClient(metaclass=Singleton):
+    """Read-only counterpart of CatalogClient. It must be used from a single
+    event loop, which is the case under ASGI."""
+
+    def __init__(self, index_name: str = INDEX_NAME):
+        self.index_name = index_name
+        self.client = AsyncOpenSearch(
+            **get_connection_params(), pool_maxsize=ASYNC_POOL_MAXSIZE
+        )
+        self.response_cache = ResponseCache()
+        # (monotonic time of the lookup, generation)
+        self._generation: tuple[float, str | None] | None = None
+
+    async def search(self, **kwargs: Unpack[queries.QueryParams]):
+        if kwargs.get("pit_id"):
+            # Searches on a point in time must not target an index
+            return await self.client.search(body=queries.filter_query(kwargs))
+        return await self._cached_search(
+            "search", dict(kwargs), lambda: queries.filter_query(kwargs)
+        )
+
+    async def aggregate_terms(
+        self, field: str, query: str | None = None, exclude: list[str] | None = None
+    ):
+        return await self._cached_search(
+            "terms",
+            {"field": field, "query": query, "exclude": exclude},
+            lambda: queries.terms_agg(field, query=query, exclude=exclude),
+        )
+
+    async def aggregate_date(self, field: str, interval: str):
+        return await self._cached_search(
+            "date_histogram",
+            {"field": field, "interval": interval},
+            lambda: queries.date_historiogram_agg(field, interval),
+        )
+
+    async def get_index_generation(self) -> str | None:
+        """See CatalogClient.get_index_generation."""
+        now = time.monotonic()
+        if self._generation and now - self._generation[0] < GENERATION_CHECK_INTERVAL:
+            return self._generation[1]
+        try:
+            mappings = await self.client.indices.get_mapping(index=self.index_name)
+        except NotFoundError:
+            mappings = None
+        generation = get_generation_from_mappings(mappings)
+        if self._generation and generation != self._generation[1]:
+            self.response_cache.clear()
+        self._generation = (now, generation)
+        return generation
+
+    async def close(self):
+        await self.client.close()
+
+    async def _cached_search(
+        self, name: str, params: dict[str, Any], build_query: Callable[[], dict]
+    ):
+        def _search() -> Awaitable[dict]:
+            return self.client.search(index=self.index_name, body=build_query())
+
+        generation = await self.get_index_generation()
+        if generation is None:
+            return await _search()
+        return await self.response_cache.aget_or_set(
+            make_cache_key(name, generation, params), _search
+        )
@@ -0,0 +1,81 @@
+"""In-memory cache of catalog search responses.
+
+Catalog data only changes when the indexer runs, so responses are cached per
+index generation: keys contain the generation, so that a rebuild or an
+incremental update invalidates every entry."""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Mapping
+
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+
+def make_cache_key(name: str, generation: str, params: Mapping[str, Any]) -> str:
+    """Build a cache key from a query name, the index generation and the query
+    parameters. Parameters set to None are ignored."""
+    normalized_params = {
+        key: value for key, value in params.items() if value is not None
+    }
+    return json.dumps(
+        [name, generation, normalized_params], sort_keys=True, default=str
+    )
+
+
+class ResponseCache:
+    """Least recently used cache, bounded by a number of entries."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: str, compute: Callable[[], Any]) -> Any:
+        found, value = self._get(key)
+        if found:
+            return value
+        # Computed outside the lock: concurrent misses may both query OpenSearch
+        value = compute()
+        self._set(key, value)
+        return value
+
+    async def aget_or_set(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Same as get_or_set, with a coroutine computing the value."""
+        found, value = self._get(key)
+        if found:
+            return value
+        value = await compute()
+        self._set(key, value)
+        return value
+
+    def _get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def _set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries. Hit & miss counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
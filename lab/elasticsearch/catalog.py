@@ -4,13 +4,14 @@ from typing import TypedDict
 from slugify import slugify
 
 from lab.methods.dto import method_model_to_dto
-from lab.models import ObjectGroup, ObjectGroupThumbnail, Project
+from lab.models import Object, ObjectGroup, ObjectGroupThumbnail, Project
 from lab.objects import ObjectProviderError, fetch_full_objectgroup
 from lab.participations.models import Participation
 from lab.runs.models import Run
 from lab.thesauri.opentheso import (
-    fetch_era_parent_ids_from_id,
-    fetch_period_parent_ids_from_id,
+    Concept,
+    get_era_parent_ids,
+    get_period_parent_ids,
 )
 
 from .documents import (
@@ -54,6 +55,15 @@ def _get_thumbnail_from_object_groups(
     return None
 
 
+def _get_objects(
+    object_group: ObjectGroup, objects: dict[int, list[Object]] | None = None
+) -> list[Object]:
+    """Objects of the group, from the batch-loaded `objects` map if given."""
+    if objects is not None:
+        return objects.get(object_group.id, [])
+    return list(object_group.object_set.all())
+
+
 def _create_leader_doc(leader: Participation):
     doc = LeaderDoc(
         user_first_name=leader.user.first_name,
@@ -65,11 +75,14 @@ def _create_leader_doc(leader: Participation):
     return doc
 
 
+# pylint: disable=too-many-arguments
 def _create_project_page_data(
     runs: list[Run],
     object_groups: list[ObjectGroup],
     leader: Participation | None,
     skip_eros: bool = False,
+    objects: dict[int, list[Object]] | None = None,
+    provider_object_groups: dict[int, ObjectGroup] | None = None,
 ):
     page_data = ProjectPageData(leader=_create_leader_doc(leader) if leader else None)
     for run in runs:
@@ -94,7 +107,9 @@ def _create_project_page_data(
         # Fetch from external provider
         if object_group.is_from_provider("eros") and not skip_eros:
             # Fetch object group from external source
-            object_group = _fetch_object_group_from_provider(object_group=object_group)
+            object_group = _get_object_group_from_provider(
+                object_group, provider_object_groups
+            )
 
         # Fetch from local database
         else:
@@ -120,14 +135,23 @@ def _create_project_page_data(
 
         page_data.add_object_group(
             object_group=ObjectGroupDoc(**object_group_data),
-            objects=list(
-                object_group.object_set.values("label", "inventory", "collection")
-            ),
+            objects=[
+                {
+                    "label": obj.label,
+                    "inventory": obj.inventory,
+                    "collection": obj.collection,
+                }
+                for obj in _get_objects(object_group, objects)
+            ],
         )
     return page_data
 
 
-def _create_object_group_page_data(projects: list[Project], runs: list[Run]):
+def _create_object_group_page_data(
+    projects: list[Project],
+    runs: list[Run],
+    leaders: dict[int, Participation] | None = None,
+):
     page_data = ObjectPageData()
     for run in runs:
         page_data.add_run(
@@ -144,10 +168,11 @@ def _create_object_group_page_data(projects: list[Project], runs: list[Run]):
             methods=method_model_to_dto(run),
         )
     for project in projects:
+        leader = leaders.get(project.id) if leaders is not None else project.leader
         page_data.add_project(
             name=project.name,
             slug=project.slug,
-            leader=_create_leader_doc(project.leader) if project.leader else None,
+            leader=_create_leader_doc(leader) if leader else None,
         )
     return page_data
 
@@ -161,9 +186,20 @@ def build_project_catalog_document(
     object_group_locations: list[LocationDict],
     runs: list[Run],
     skip_eros: bool = False,
+    objects: dict[int, list[Object]] | None = None,
+    provider_object_groups: dict[int, ObjectGroup] | None = None,
 ):
+    """Build the project document. `objects` (object group id -> objects) can
+    be given to avoid querying objects for each object group, and
+    `provider_object_groups` (object group id -> object group with provider
+    data) to avoid fetching providers for each document."""
     page_data = _create_project_page_data(
-        leader=leader, runs=runs, object_groups=object_groups, skip_eros=skip_eros
+        leader=leader,
+        runs=runs,
+        object_groups=object_groups,
+        skip_eros=skip_eros,
+        objects=objects,
+        provider_object_groups=provider_object_groups,
     )
 
     _id = f"project-{project.id}"
@@ -178,7 +214,7 @@ def build_project_catalog_document(
         slug=project.slug,
         materials=materials,
         comments=project.comments,
-        status=str(project.status),
+        status=str(project.status_from_runs(runs)),
         created=project.created,
         project_page_data=page_data,
         discovery_place_points=object_group_locations,
@@ -195,9 +231,19 @@ def build_object_group_catalog_document(  # noqa: C901
     runs: list[Run],
     is_data_embargoed: bool,
     skip_eros: bool = False,
+    leaders: dict[int, Participation] | None = None,
+    objects: dict[int, list[Object]] | None = None,
+    provider_object_groups: dict[int, ObjectGroup] | None = None,
+    dating_parent_ids: dict[Concept, list[str]] | None = None,
 ):
+    """Build the object group document. `leaders` (project id -> leader),
+    `objects` (object group id -> objects) and `dating_parent_ids` can be given
+    to avoid querying them for each document, and `provider_object_groups` to
+    avoid fetching the provider (see build_project_catalog_document)."""
     # Page data
-    page_data = _create_object_group_page_data(projects=projects, runs=runs)
+    page_data = _create_object_group_page_data(
+        projects=projects, runs=runs, leaders=leaders
+    )
 
     # Location
     location_geopoint: LocationDict | None = None
@@ -206,7 +252,9 @@ def build_object_group_catalog_document(  # noqa: C901
 
     if object_group.is_from_provider("eros") and not skip_eros:
         # Fetch object group from EROS
-        object_group = _fetch_object_group_from_provider(object_group=object_group)
+        object_group = _get_object_group_from_provider(
+            object_group, provider_object_groups
+        )
 
     if (
         object_group.discovery_place_location
@@ -220,31 +268,7 @@ def build_object_group_catalog_document(  # noqa: C901
         location_label = object_group.discovery_place_location.label
         locations = [location_geopoint]
 
-    # Dating
-    dating_dict: DatingDict = {}
-    for field_name in ["dating_period", "dating_era"]:
-        fetch_parent_ids_fn = (
-            fetch_era_parent_ids_from_id
-            if field_name == "dating_era"
-            else fetch_period_parent_ids_from_id
-        )
-        if getattr(object_group, field_name):
-            theso_huma_num_parent_ids = None
-            if getattr(getattr(object_group, field_name), "concept_id"):
-                theso_huma_num_parent_ids = fetch_parent_ids_fn(
-                    getattr(object_group, field_name).concept_id
-                )
-            dating_dict = {
-                **dating_dict,
-                f"{field_name}_label": getattr(  # type: ignore
-                    object_group, field_name
-                ).label,
-                f"{field_name}_theso_huma_num_id": getattr(  # type: ignore
-                    object_group, field_name
-                ).concept_id,
-                # type: ignore
-                f"{field_name}_theso_huma_num_parent_ids": theso_huma_num_parent_ids,
-            }
+    dating_dict = _get_dating_dict(object_group, dating_parent_ids)
 
     # Thumbnail
     thumbnail: ImageDoc | None = None
@@ -275,7 +299,6 @@ def build_object_group_catalog_document(  # noqa: C901
         ),
         collection=object_group.collection,
         inventory_number=object_group.inventory,
-        inventory_numbers=[object_group.object_set.values_list("inventory", flat=True)],
         discovery_place_label=location_label,
         discovery_place_point=location_geopoint,
         discovery_place_points=locations,
@@ -288,7 +311,7 @@ def build_object_group_catalog_document(  # noqa: C901
         collections.append(object_group.collection)
     if object_group.inventory:
         inventory_numbers.append(object_group.inventory)
-    for obj in object_group.object_set.all():
+    for obj in _get_objects(object_group, objects):
         catalog_item.add_object(
             label=obj.label,
             collection=obj.collection,
@@ -307,7 +330,49 @@ def build_object_group_catalog_document(  # noqa: C901
     return catalog_item
 
 
-def _fetch_object_group_from_provider(object_group: ObjectGroup) -> ObjectGroup:
+def _get_dating_dict(
+    object_group: ObjectGroup,
+    dating_parent_ids: dict[Concept, list[str]] | None = None,
+) -> DatingDict:
+    dating_dict: DatingDict = {}
+    for field_name in ["dating_period", "dating_era"]:
+        get_parent_ids_fn = (
+            get_era_parent_ids if field_name == "dating_era" else get_period_parent_ids
+        )
+        concept = getattr(object_group, field_name)
+        if concept:
+            theso_huma_num_parent_ids = None
+            if concept.concept_id:
+                theso_huma_num_parent_ids = (
+                    dating_parent_ids.get(
+                        (concept.OPENTHESO_THESO_ID, concept.concept_id), []
+                    )
+                    if dating_parent_ids is not None
+                    else get_parent_ids_fn(concept.concept_id)
+                )
+            dating_dict = {
+                **dating_dict,
+                f"{field_name}_label": concept.label,  # type: ignore
+                f"{field_name}_theso_huma_num_id": concept.concept_id,  # type: ignore
+                # type: ignore
+                f"{field_name}_theso_huma_num_parent_ids": theso_huma_num_parent_ids,
+            }
+    return dating_dict
+
+
+def _get_object_group_from_provider(
+    object_group: ObjectGroup,
+    provider_object_groups: dict[int, ObjectGroup] | None = None,
+) -> ObjectGroup:
+    """Use the prefetched provider data if available, else fetch it."""
+    if provider_object_groups is not None:
+        return provider_object_groups.get(object_group.id, object_group)
+    return fetch_object_group_from_provider(object_group=object_group)
+
+
+def fetch_object_group_from_provider(object_group: ObjectGroup) -> ObjectGroup:
+    """Return the object group enriched with its provider data, or unchanged
+    if it is not external or the provider fails."""
     if not object_group.is_external:
         return object_group
     try:
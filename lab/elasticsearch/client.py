@@ -1,26 +1,80 @@
+import dataclasses
+import hashlib
 import logging
-from typing import Generic, TypedDict, TypeVar, Unpack
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    TypedDict,
+    TypeVar,
+    Unpack,
+)
 
 from django.conf import settings
-from opensearchpy import OpenSearch
+from django.db.models import Min, Q, QuerySet
+from django.utils import timezone
+from opensearchpy import Document, NotFoundError, OpenSearch
+from opensearchpy.helpers import streaming_bulk
 
 from lab.elasticsearch import queries
-from lab.objects.models import ObjectGroup
+from lab.objects.models import ObjectGroup, RunObjectGroup
 from lab.projects.models import Project
 from lab.runs.models import Run
 
+from . import instrumentation
+from .cache import ResponseCache, make_cache_key
 from .catalog import (
     LocationDict,
     build_object_group_catalog_document,
     build_project_catalog_document,
 )
-from .documents import CatalogItem
+from .documents import CatalogItem, SuggestionItem
+from .enrichment import fetch_provider_object_groups
+from .loader import CatalogData, iter_catalog_batches
 
 logger = logging.getLogger(__name__)
 
 _T = TypeVar("_T")
 
+# Name of the alias pointing to the live catalog index generation
 INDEX_NAME = "catalog"
+# Number of previous index generations kept after a rebuild (for rollback)
+KEEP_INDEX_GENERATIONS = 2
+# A new generation is not published if it holds less than this ratio of the
+# documents of the live generation.
+MIN_GENERATION_DOCUMENT_RATIO = 0.5
+
+# Bulk indexing chunks are bounded both by document count and by payload size
+BULK_CHUNK_SIZE = 500
+BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+# Number of retries (with exponential backoff) on 429 Too Many Requests
+BULK_MAX_RETRIES = 3
+
+# Seconds between two lookups of the live index generation: cached search
+# responses may be this much older than the catalog.
+GENERATION_CHECK_INTERVAL = 30
+
+# Number of documents fetched per page when listing the whole catalog
+LIST_ALL_PAGE_SIZE = 500
+
+# Alias of the typeahead suggestions index, rebuilt after each indexing run
+SUGGESTIONS_INDEX_NAME = "catalog_suggestions"
+# Suggestion field -> catalog keyword field holding its values
+SUGGESTION_FIELDS = {
+    "materials": "materials",
+    "collections": "collections",
+    "inventory_numbers": "inventory_numbers",
+    "name": "name.raw",
+}
+SUGGESTIONS_SIZE = 10
+
+
+class CatalogIndexError(Exception):
+    """Raised when a catalog index generation can not be published."""
 
 
 class Singleton(type, Generic[_T]):
@@ -38,113 +92,700 @@ class ObjectGroupExtraDict(TypedDict):
     is_data_embargoed: bool
 
 
-class CatalogClient(metaclass=Singleton):
+class SuggestionDict(TypedDict):
+    value: str
+    count: int
+
+
+class GeoClusterDict(TypedDict):
+    key: str  # "zoom/x/y" tile
+    count: int
+    centroid: LocationDict
+
+
+@dataclasses.dataclass
+class BulkIndexReport:
+    indexed: int = 0
+    deleted: int = 0
+    failed: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.failed)
+
+
+class CatalogClient(metaclass=Singleton):  # pylint: disable=too-many-public-methods
     def __init__(self, index_name: str = INDEX_NAME):
         self.index_name = index_name
-        for setting in [
-            "ELASTICSEARCH_USERNAME",
-            "ELASTICSEARCH_PASSWORD",
-            "ELASTICSEARCH_HOST",
-        ]:
-            if getattr(settings, setting, None) is None:
-                raise ValueError(
-                    "Incorrect elasticsearch configuration. %s is missing" % setting
+        self.client = OpenSearch(**get_connection_params())
+        self.response_cache = ResponseCache()
+        # (monotonic time of the lookup, generation)
+        self._generation: tuple[float, str | None] | None = None
+
+    def create_index_generation(self) -> str:
+        """Create a new timestamped catalog index, not yet visible to search.
+        Refresh is disabled while it is being filled."""
+        index_name = f"{self.index_name}-{timezone.now():%Y%m%d%H%M%S}"
+        CatalogItem.init(index=index_name, using=self.client)
+        self.client.indices.put_settings(
+            index=index_name, body={"index": {"refresh_interval": "-1"}}
+        )
+        logger.info("Created index generation %s", index_name)
+        return index_name
+
+    def get_live_index_generations(self) -> list[str]:
+        """Return the concrete index(es) currently behind the catalog alias."""
+        if not self.client.indices.exists_alias(name=self.index_name):
+            return []
+        return sorted(self.client.indices.get_alias(name=self.index_name).keys())
+
+    def is_rebuild_in_progress(self) -> bool:
+        """A generation newer than the live one is being built (or a rebuild
+        crashed, in which case the next rebuild makes it obsolete)."""
+        live_indices = self.get_live_index_generations()
+        generations = self.client.indices.get(index=f"{self.index_name}-*").keys()
+        return bool(live_indices) and any(
+            index > max(live_indices) for index in generations
+        )
+
+    def publish_index_generation(self, index_name: str, expected_count: int):
+        """Atomically point the catalog alias to `index_name` once its document
+        count is consistent with what was indexed and with the live generation.
+
+        Raises CatalogIndexError if the sanity check fails."""
+        self.client.indices.put_settings(
+            index=index_name, body={"index": {"refresh_interval": None}}
+        )
+        self.client.indices.refresh(index=index_name)
+        count = self.client.count(index=index_name)["count"]
+        if count == 0 or count < expected_count:
+            raise CatalogIndexError(
+                f"Index {index_name} holds {count} documents, "
+                f"expected {expected_count}."
+            )
+        live_indices = self.get_live_index_generations()
+        if live_indices:
+            live_count = self.client.count(index=self.index_name)["count"]
+            if count < live_count * MIN_GENERATION_DOCUMENT_RATIO:
+                raise CatalogIndexError(
+                    f"Index {index_name} holds {count} documents, "
+                    f"live catalog holds {live_count}."
                 )
-        user, password, (protocol, host) = (
-            settings.ELASTICSEARCH_USERNAME,
-            settings.ELASTICSEARCH_PASSWORD,
-            settings.ELASTICSEARCH_HOST.split("://"),  # type: ignore
+
+        actions: list[dict] = [
+            {"remove": {"index": live_index, "alias": self.index_name}}
+            for live_index in live_indices
+        ]
+        if not live_indices and self.client.indices.exists(index=self.index_name):
+            # Legacy setup where "catalog" is a concrete index and not an alias
+            actions.append({"remove_index": {"index": self.index_name}})
+        actions.append({"add": {"index": index_name, "alias": self.index_name}})
+        self.client.indices.update_aliases(body={"actions": actions})
+        logger.info(
+            "Alias %s now points to %s (%s documents)",
+            self.index_name,
+            index_name,
+            count,
         )
-        self.client = OpenSearch(
-            hosts=[f"{protocol}://{user}:{password}@{host}"],
-            http_compress=True,  # enables gzip compression for request bodies
-            use_ssl=False,
-            ssl_assert_hostname=False,
-            ssl_show_warn=False,
+
+    def delete_old_index_generations(
+        self, keep: int = KEEP_INDEX_GENERATIONS
+    ) -> list[str]:
+        """Delete index generations which are neither live nor among the `keep`
+        most recent previous ones."""
+        live_indices = self.get_live_index_generations()
+        generations = sorted(
+            self.client.indices.get(index=f"{self.index_name}-*").keys()
         )
+        previous_generations = [
+            index for index in generations if index not in live_indices
+        ]
+        to_delete = previous_generations[: max(len(previous_generations) - keep, 0)]
+        for index in to_delete:
+            self.client.indices.delete(index=index)
+            logger.info("Deleted index generation %s", index)
+        return to_delete
 
-    def list_all_items(self):
-        query = {"query": {"match_all": {}}, "size": 10000}
-        return self.client.search(index=self.index_name, body=query)
+    def list_all_items(
+        self, page_size: int = LIST_ALL_PAGE_SIZE
+    ) -> Iterator[dict[str, Any]]:
+        """Stream all catalog documents (search hits), see `list_all_pages`."""
+        for page in self.list_all_pages(page_size=page_size):
+            yield from page["hits"]["hits"]
+
+    def list_all_pages(
+        self, page_size: int = LIST_ALL_PAGE_SIZE
+    ) -> Iterator[dict[str, Any]]:
+        """Stream the search responses listing all catalog documents. The
+        catalog is paged through with search_after on a point in time: memory
+        use is bounded by the page size and the listing stays consistent during
+        indexing."""
+        pit_id = self.open_point_in_time()
+        try:
+            search_after: list[Any] = []
+            while True:
+                response = self.client.search(
+                    body=queries.filter_query(
+                        {
+                            "size": page_size,
+                            "search_after": search_after,
+                            "pit_id": pit_id,
+                        }
+                    )
+                )
+                pit_id = response.get("pit_id", pit_id)
+                yield response
+                hits = response["hits"]["hits"]
+                if len(hits) < page_size:
+                    return
+                search_after = hits[-1]["sort"]
+        finally:
+            self.close_point_in_time(pit_id)
+
+    def open_point_in_time(
+        self, keep_alive: str = queries.POINT_IN_TIME_KEEP_ALIVE
+    ) -> str:
+        return self.client.create_pit(
+            index=self.index_name, params={"keep_alive": keep_alive}
+        )["pit_id"]
+
+    def close_point_in_time(self, pit_id: str):
+        self.client.delete_pit(body={"pit_id": [pit_id]})
 
     def search(self, **kwargs: Unpack[queries.QueryParams]):
-        query = queries.filter_query(kwargs)
-        return self.client.search(index=self.index_name, body=query)
+        if kwargs.get("pit_id"):
+            # Searches on a point in time must not target an index
+            return self.client.search(body=queries.filter_query(kwargs))
+        return self._cached_search(
+            "search", dict(kwargs), lambda: queries.filter_query(kwargs)
+        )
 
     def aggregate_terms(
         self, field: str, query: str | None = None, exclude: list[str] | None = None
     ):
-        return self.client.search(
-            body=queries.terms_agg(field, query=query, exclude=exclude)
+        return self._cached_search(
+            "terms",
+            {"field": field, "query": query, "exclude": exclude},
+            lambda: queries.terms_agg(field, query=query, exclude=exclude),
         )
 
     def aggregate_date(self, field: str, interval: str):
-        return self.client.search(body=queries.date_historiogram_agg(field, interval))
+        return self._cached_search(
+            "date_histogram",
+            {"field": field, "interval": interval},
+            lambda: queries.date_historiogram_agg(field, interval),
+        )
+
+    def aggregate_facets(
+        self, fields: list[str], **kwargs: Unpack[queries.QueryParams]
+    ):
+        """Aggregate several facets, with search filters, in a single search
+        (see queries.facets_query). Aggregations have the same shape as the
+        ones of aggregate_terms and aggregate_date."""
+        response = self._cached_search(
+            "facets",
+            {"fields": fields, "filters": dict(kwargs)},
+            lambda: queries.facets_query(fields, kwargs),
+        )
+        return {
+            **response,
+            "aggregations": {
+                field: aggregation[field]
+                for field, aggregation in response["aggregations"].items()
+            },
+        }
 
-    def index_from_projects(self, projects: list[Project], skip_eros: bool = False):
-        """Index projects and related object groups"""
-        CatalogItem.init(using=self.client)
+    def aggregate_geo_clusters(
+        self, zoom: int, **kwargs: Unpack[queries.QueryParams]
+    ) -> list[GeoClusterDict]:
+        """Cluster discovery places of the documents matching the search
+        filters, for a map at `zoom` (see queries.geo_clusters_query)."""
+        response = self._cached_search(
+            "geo_clusters",
+            {"zoom": zoom, "filters": dict(kwargs)},
+            lambda: queries.geo_clusters_query(zoom, kwargs),
+        )
+        return [
+            {
+                "key": bucket["key"],
+                "count": bucket["doc_count"],
+                "centroid": bucket["centroid"]["location"],
+            }
+            for bucket in response["aggregations"]["clusters"]["buckets"]
+        ]
 
-        objectgroups_dict: dict[ObjectGroup, ObjectGroupExtraDict] = {}
-        for project in projects:
-            leader = project.leader
-            runs: list[Run] = list(project.runs.all())
-            objectgroups = list(
-                set(obj for run in runs for obj in run.run_object_groups.all())
+    def suggest(
+        self, field: str, q: str, size: int = SUGGESTIONS_SIZE
+    ) -> list[SuggestionDict]:
+        """Suggest values of a SUGGESTION_FIELDS field matching a typed text."""
+        try:
+            response = self.client.search(
+                index=SUGGESTIONS_INDEX_NAME,
+                body=queries.suggestion_query(field, q, size),
             )
-            materials = []
-            locations: list[LocationDict] = []
-            for objectgroup in objectgroups:
-                materials.extend(objectgroup.materials)
-                if (
-                    objectgroup.discovery_place_location
-                    and objectgroup.discovery_place_location.latitude
-                    and objectgroup.discovery_place_location.longitude
-                ):
-                    locations.append(
-                        {
-                            "lat": objectgroup.discovery_place_location.latitude,
-                            "lon": objectgroup.discovery_place_location.longitude,
-                        }
-                    )
-                if objectgroup not in objectgroups_dict:
-                    objectgroups_dict[objectgroup] = {
-                        "projects": [project],
-                        "runs": runs,
-                        "is_data_embargoed": all(run.is_data_embargoed for run in runs),
-                    }
-                else:
-                    objectgroups_dict[objectgroup]["runs"].extend(runs)
-                    objectgroups_dict[objectgroup]["projects"].append(project)
-                    objectgroups_dict[objectgroup]["is_data_embargoed"] |= all(
-                        run.is_data_embargoed for run in runs
+        except NotFoundError:
+            # Suggestions are built by the first indexing run
+            return []
+        return [
+            {"value": hit["_source"]["value"], "count": hit["_source"]["count"]}
+            for hit in response["hits"]["hits"]
+        ]
+
+    def rebuild_suggestions(self) -> int:
+        """Build a new suggestions index from the values of the live catalog,
+        point the suggestions alias to it and delete the previous one.
+        Returns the number of suggestions."""
+        index_name = f"{SUGGESTIONS_INDEX_NAME}-{timezone.now():%Y%m%d%H%M%S}"
+        SuggestionItem.init(index=index_name, using=self.client)
+        report = self.bulk_index(self._iter_suggestions(), index_name=index_name)
+        self.client.indices.refresh(index=index_name)
+
+        previous_indices: list[str] = []
+        if self.client.indices.exists_alias(name=SUGGESTIONS_INDEX_NAME):
+            previous_indices = list(
+                self.client.indices.get_alias(name=SUGGESTIONS_INDEX_NAME).keys()
+            )
+        self.client.indices.update_aliases(
+            body={
+                "actions": [
+                    *(
+                        {"remove": {"index": index, "alias": SUGGESTIONS_INDEX_NAME}}
+                        for index in previous_indices
+                    ),
+                    {"add": {"index": index_name, "alias": SUGGESTIONS_INDEX_NAME}},
+                ]
+            }
+        )
+        for index in previous_indices:
+            self.client.indices.delete(index=index)
+        logger.info("Built %s suggestions in %s", report.indexed, index_name)
+        return report.indexed
+
+    def _iter_suggestions(self) -> Iterator[SuggestionItem]:
+        """Page through distinct values of the suggestion fields with a
+        composite aggregation."""
+        for name, field in SUGGESTION_FIELDS.items():
+            after_key = None
+            while True:
+                composite: dict[str, Any] = {
+                    "size": BULK_CHUNK_SIZE,
+                    "sources": [{"value": {"terms": {"field": field}}}],
+                }
+                if after_key:
+                    composite["after"] = after_key
+                response = self.client.search(
+                    index=self.index_name,
+                    body={"size": 0, "aggs": {"values": {"composite": composite}}},
+                )
+                aggregation = response["aggregations"]["values"]
+                for bucket in aggregation["buckets"]:
+                    value = bucket["key"]["value"]
+                    yield SuggestionItem(
+                        meta={
+                            "id": f"{name}-" + hashlib.sha1(value.encode()).hexdigest()
+                        },
+                        field=name,
+                        value=value,
+                        count=bucket["doc_count"],
                     )
-            logger.debug("Saving project %s", str(project))
-            item = build_project_catalog_document(
-                project=project,
-                materials=list(set(materials)),
-                leader=leader,
-                object_groups=objectgroups,
-                object_group_locations=locations,
-                runs=runs,
-                skip_eros=skip_eros,
+                after_key = aggregation.get("after_key")
+                if not after_key or len(aggregation["buckets"]) < BULK_CHUNK_SIZE:
+                    break
+
+    def get_index_generation(self) -> str | None:
+        """Identify the content of the live catalog: indices behind the alias
+        and date of their last incremental update (None if there is no
+        catalog). Looked up at most every GENERATION_CHECK_INTERVAL seconds."""
+        now = time.monotonic()
+        if self._generation and now - self._generation[0] < GENERATION_CHECK_INTERVAL:
+            return self._generation[1]
+        try:
+            mappings = self.client.indices.get_mapping(index=self.index_name)
+        except NotFoundError:
+            mappings = None
+        return self._set_generation(now, mappings)
+
+    def _set_generation(self, now: float, mappings: dict | None) -> str | None:
+        generation = get_generation_from_mappings(mappings)
+        if self._generation and generation != self._generation[1]:
+            # Entries of the previous generation can not be hit anymore
+            self.response_cache.clear()
+        self._generation = (now, generation)
+        return generation
+
+    def _cached_search(
+        self, name: str, params: dict[str, Any], build_query: Callable[[], dict]
+    ):
+        def _search():
+            return self.client.search(index=self.index_name, body=build_query())
+
+        generation = self.get_index_generation()
+        if generation is None:
+            return _search()
+        return self.response_cache.get_or_set(
+            make_cache_key(name, generation, params), _search
+        )
+
+    def index_from_projects(
+        self,
+        projects: Iterable[Project],
+        skip_eros: bool = False,
+        index_name: str | None = None,
+    ) -> BulkIndexReport:
+        """Index projects and related object groups. Documents are written
+        to `index_name` (a generation) if given, else to the catalog alias."""
+        return self.bulk_index(
+            self._build_catalog_items(projects, skip_eros=skip_eros),
+            index_name=index_name or self.index_name,
+        )
+
+    def index_project_range(
+        self,
+        first_project_id: int,
+        last_project_id: int,
+        skip_eros: bool = False,
+        index_name: str | None = None,
+    ) -> BulkIndexReport:
+        """Index catalog projects with ids between the given ones (inclusive),
+        and the object groups whose lowest catalog project id is in that range:
+        when ranges are indexed in parallel, each object group is indexed once,
+        from all of its projects."""
+        catalog_projects = get_catalog_projects()
+        project_ids = set(
+            catalog_projects.filter(
+                id__gte=first_project_id, id__lte=last_project_id
+            ).values_list("id", flat=True)
+        )
+        object_group_ids = set(
+            RunObjectGroup.objects.filter(run__project__in=catalog_projects)
+            .order_by()
+            .values("objectgroup_id")
+            .annotate(first_project_id=Min("run__project_id"))
+            .filter(
+                first_project_id__gte=first_project_id,
+                first_project_id__lte=last_project_id,
             )
-            item.save(using=self.client)
-        for obj, extra in objectgroups_dict.items():
-            logger.debug("Saving object group %s", str(obj))
-            item = build_object_group_catalog_document(
-                object_group=obj,
-                projects=extra["projects"],
-                runs=extra["runs"],
-                is_data_embargoed=extra["is_data_embargoed"],
+            .values_list("objectgroup_id", flat=True)
+        )
+        projects = catalog_projects.filter(
+            Q(id__in=project_ids) | Q(runs__run_object_groups__in=object_group_ids)
+        ).distinct()
+        return self.bulk_index(
+            self._build_catalog_items(
+                projects,
+                skip_eros=skip_eros,
+                project_ids=project_ids,
+                object_group_ids=object_group_ids,
+            ),
+            index_name=index_name or self.index_name,
+        )
+
+    def index_changes(
+        self,
+        project_ids: set[int],
+        object_group_ids: set[int],
+        skip_eros: bool = False,
+    ) -> BulkIndexReport:
+        """Upsert the given project and object group documents in the live
+        catalog, and delete the ones which are not public anymore."""
+        catalog_projects = get_catalog_projects()
+        indexable_project_ids = set(
+            catalog_projects.filter(id__in=project_ids).values_list("id", flat=True)
+        )
+        indexable_object_group_ids = set(
+            RunObjectGroup.objects.filter(
+                objectgroup_id__in=object_group_ids,
+                run__project__in=catalog_projects,
+            ).values_list("objectgroup_id", flat=True)
+        )
+        # Object group documents are built from all the projects they belong to
+        projects = catalog_projects.filter(
+            Q(id__in=indexable_project_ids)
+            | Q(runs__run_object_groups__in=indexable_object_group_ids)
+        ).distinct()
+
+        report = self.bulk_index(
+            self._build_catalog_items(
+                projects,
                 skip_eros=skip_eros,
+                project_ids=indexable_project_ids,
+                object_group_ids=indexable_object_group_ids,
+            ),
+            index_name=self.index_name,
+        )
+        deleted_report = self.delete_documents(
+            [
+                f"project-{project_id}"
+                for project_id in project_ids - indexable_project_ids
+            ]
+            + [
+                f"object-{object_group_id}"
+                for object_group_id in object_group_ids - indexable_object_group_ids
+            ]
+        )
+        report.deleted = deleted_report.deleted
+        report.failed.extend(deleted_report.failed)
+        if report.indexed or report.deleted:
+            # Changes the index generation, invalidating cached responses
+            self.client.indices.put_mapping(
+                index=self.index_name,
+                body={"_meta": {"updated_at": timezone.now().isoformat()}},
             )
-            item.save(using=self.client)
+        return report
+
+    def delete_documents(self, document_ids: list[str]) -> BulkIndexReport:
+        """Delete documents from the live catalog. Missing documents are
+        ignored."""
+        report = BulkIndexReport()
+        actions = (
+            {"_op_type": "delete", "_index": self.index_name, "_id": document_id}
+            for document_id in document_ids
+        )
+        for ok, result in self._streaming_bulk(actions):
+            item = next(iter(result.values()))
+            if ok or item.get("status") == 404:
+                report.deleted += 1
+            else:
+                report.failed.append(item)
+        return report
+
+    def bulk_index(
+        self, items: Iterable[Document], index_name: str | None = None
+    ) -> BulkIndexReport:
+        """Stream catalog items to OpenSearch using the bulk API.
+
+        Items failing with a transient error (429 / 5xx) are sent again once
+        the whole stream has been consumed. Remaining failures are logged and
+        returned in the report, they do not stop the indexing run."""
+        report = BulkIndexReport()
+        pending_actions: OrderedDict[str, dict] = OrderedDict()
+        retryable_actions: list[dict] = []
+        # Building documents happens while streaming, in nested phases
+        with instrumentation.phase("transport"):
+            for ok, result in self._streaming_bulk(
+                self._track_actions(items, pending_actions, index_name=index_name)
+            ):
+                item = next(iter(result.values()))
+                action = pending_actions.pop(item.get("_id"), None)
+                if ok:
+                    report.indexed += 1
+                elif action and _is_retryable_bulk_error(item):
+                    retryable_actions.append(action)
+                else:
+                    report.failed.append(item)
+
+            if retryable_actions:
+                logger.warning(
+                    "Retrying %s catalog document(s) after bulk failure",
+                    len(retryable_actions),
+                )
+                for ok, result in self._streaming_bulk(retryable_actions):
+                    if ok:
+                        report.indexed += 1
+                    else:
+                        report.failed.append(next(iter(result.values())))
+        instrumentation.count("documents_indexed", report.indexed)
+        instrumentation.count("documents_failed", report.failed_count)
 
-    def delete_index(self):
-        """Delete an index by name"""
-        if self.client.indices.exists(index=self.index_name):
-            self.client.indices.delete(index=self.index_name)
-            logger.info("Deleted index: %s", self.index_name)
+        for item in report.failed:
+            logger.error(
+                "Failed to index catalog document %s (status %s): %s",
+                item.get("_id"),
+                item.get("status"),
+                item.get("error"),
+            )
+        logger.info(
+            "Indexed %s catalog document(s), %s failure(s)",
+            report.indexed,
+            report.failed_count,
+        )
+        return report
+
+    def _streaming_bulk(self, actions: Iterable[dict]):
+        return streaming_bulk(
+            self.client,
+            actions,
+            chunk_size=BULK_CHUNK_SIZE,
+            max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+            max_retries=BULK_MAX_RETRIES,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+
+    @staticmethod
+    def _track_actions(
+        items: Iterable[Document],
+        pending_actions: OrderedDict[str, dict],
+        index_name: str | None = None,
+    ) -> Iterator[dict]:
+        """Convert items to bulk actions and keep the in-flight ones so failed
+        actions can be sent again. Results of a chunk are yielded before the
+        next chunk is consumed, so the window is bounded by two chunks."""
+        for item in items:
+            action = item.to_dict(include_meta=True)
+            if index_name:
+                action["_index"] = index_name
+            instrumentation.count_json_bytes("bulk_bytes", action)
+            pending_actions[action["_id"]] = action
+            while len(pending_actions) > 2 * BULK_CHUNK_SIZE:
+                pending_actions.popitem(last=False)
+            yield action
+
+    # pylint: disable=too-many-locals
+    def _build_catalog_items(
+        self,
+        projects: Iterable[Project],
+        skip_eros: bool = False,
+        project_ids: set[int] | None = None,
+        object_group_ids: set[int] | None = None,
+    ) -> Iterator[CatalogItem]:
+        """Build project and object group documents. If `project_ids` or
+        `object_group_ids` is given, only the matching documents are built."""
+        objectgroups_dict: dict[ObjectGroup, ObjectGroupExtraDict] = {}
+        # Object group documents are built last: keep the data they need
+        catalog_data = CatalogData()
+        provider_object_groups: dict[int, ObjectGroup] | None = (
+            None if skip_eros else {}
+        )
+        for batch, batch_data in iter_catalog_batches(projects):
+            catalog_data.update(batch_data)
+            if provider_object_groups is not None:
+                with instrumentation.phase("providers"):
+                    provider_object_groups.update(
+                        fetch_provider_object_groups(
+                            og
+                            for object_groups in batch_data.object_groups.values()
+                            for og in object_groups
+                            if og.id not in provider_object_groups
+                        )
+                    )
+            for project in batch:
+                leader = batch_data.leaders.get(project.id)
+                runs = batch_data.runs.get(project.id, [])
+                objectgroups = list(
+                    set(
+                        obj
+                        for run in runs
+                        for obj in batch_data.object_groups.get(run.id, [])
+                    )
+                )
+                materials = []
+                locations: list[LocationDict] = []
+                for objectgroup in objectgroups:
+                    materials.extend(objectgroup.materials)
+                    if (
+                        objectgroup.discovery_place_location
+                        and objectgroup.discovery_place_location.latitude
+                        and objectgroup.discovery_place_location.longitude
+                    ):
+                        locations.append(
+                            {
+                                "lat": objectgroup.discovery_place_location.latitude,
+                                "lon": objectgroup.discovery_place_location.longitude,
+                            }
+                        )
+                    if objectgroup not in objectgroups_dict:
+                        objectgroups_dict[objectgroup] = {
+                            "projects": [project],
+                            "runs": list(runs),
+                            "is_data_embargoed": all(
+                                run.is_data_embargoed for run in runs
+                            ),
+                        }
+                    else:
+                        objectgroups_dict[objectgroup]["runs"].extend(runs)
+                        objectgroups_dict[objectgroup]["projects"].append(project)
+                        objectgroups_dict[objectgroup]["is_data_embargoed"] |= all(
+                            run.is_data_embargoed for run in runs
+                        )
+                if project_ids is not None and project.id not in project_ids:
+                    continue
+                logger.debug("Building project document %s", str(project))
+                with instrumentation.phase("build"):
+                    project_item = build_project_catalog_document(
+                        project=project,
+                        materials=list(set(materials)),
+                        leader=leader,
+                        object_groups=objectgroups,
+                        object_group_locations=locations,
+                        runs=runs,
+                        skip_eros=skip_eros,
+                        objects=batch_data.objects,
+                        provider_object_groups=provider_object_groups,
+                    )
+                yield project_item
+        for obj, extra in objectgroups_dict.items():
+            if object_group_ids is not None and obj.id not in object_group_ids:
+                continue
+            logger.debug("Building object group document %s", str(obj))
+            with instrumentation.phase("build"):
+                object_group_item = build_object_group_catalog_document(
+                    object_group=obj,
+                    projects=extra["projects"],
+                    runs=extra["runs"],
+                    is_data_embargoed=extra["is_data_embargoed"],
+                    skip_eros=skip_eros,
+                    leaders=catalog_data.leaders,
+                    objects=catalog_data.objects,
+                    provider_object_groups=provider_object_groups,
+                    dating_parent_ids=catalog_data.dating_parent_ids,
+                )
+            yield object_group_item
+
+    def delete_index(self, index_name: str | None = None):
+        """Delete an index by name (defaults to the catalog index)"""
+        index_name = index_name or self.index_name
+        if self.client.indices.exists(index=index_name):
+            self.client.indices.delete(index=index_name)
+            logger.info("Deleted index: %s", index_name)
         else:
-            logger.warning("Index %s does not exist. Skipping delete.", self.index_name)
+            logger.warning("Index %s does not exist. Skipping delete.", index_name)
+
+
+def get_connection_params() -> dict[str, Any]:
+    """Keyword arguments of the (sync or async) OpenSearch client."""
+    for setting in [
+        "ELASTICSEARCH_USERNAME",
+        "ELASTICSEARCH_PASSWORD",
+        "ELASTICSEARCH_HOST",
+    ]:
+        if getattr(settings, setting, None) is None:
+            raise ValueError(
+                "Incorrect elasticsearch configuration. %s is missing" % setting
+            )
+    user, password, (protocol, host) = (
+        settings.ELASTICSEARCH_USERNAME,
+        settings.ELASTICSEARCH_PASSWORD,
+        settings.ELASTICSEARCH_HOST.split("://"),  # type: ignore
+    )
+    return {
+        "hosts": [f"{protocol}://{user}:{password}@{host}"],
+        "http_compress": True,  # enables gzip compression for request bodies
+        "use_ssl": False,
+        "ssl_assert_hostname": False,
+        "ssl_show_warn": False,
+    }
+
+
+def get_generation_from_mappings(mappings: dict | None) -> str | None:
+    """Identify the content of the catalog from the mappings of the indices
+    behind its alias (see CatalogClient.get_index_generation)."""
+    if mappings is None:
+        return None
+    return ",".join(
+        f"{index}@{mapping['mappings'].get('_meta', {}).get('updated_at')}"
+        for index, mapping in sorted(mappings.items())
+    )
+
+
+def get_catalog_projects() -> QuerySet[Project]:
+    """Projects published in the catalog."""
+    return Project.objects.only_finished().only_public().order_by("-created").distinct()
+
+
+def _is_retryable_bulk_error(item: dict) -> bool:
+    status = item.get("status")
+    if not isinstance(status, int):
+        # Connection errors are reported with a "N/A" status
+        return True
+    return status == 429 or status >= 500
@@ -4,6 +4,21 @@ import opensearchpy as os
 
 from lab.methods.dto import DetectorDTO, MethodDTO
 
+# Words are indexed with all their prefixes, so that suggestions are matched
+# by the beginning of any of their words.
+suggestion_analyzer = os.analyzer(
+    "suggestion",
+    tokenizer="standard",
+    filter=[
+        "lowercase",
+        "asciifolding",
+        os.token_filter("suggestion_edge_ngram", "edge_ngram", min_gram=1, max_gram=20),
+    ],
+)
+suggestion_search_analyzer = os.analyzer(
+    "suggestion_search", tokenizer="standard", filter=["lowercase", "asciifolding"]
+)
+
 
 class _ObjectDict(TypedDict):
     label: str
@@ -148,7 +163,7 @@ class CatalogItem(os.Document):
 
     id = os.Keyword()
     category = os.Keyword()
-    name = os.Text()
+    name = os.Text(fields={"raw": os.Keyword(ignore_above=256)})
     slug = os.Keyword()
     created = os.Date()
     materials = os.Keyword(multi=True)
@@ -189,3 +204,17 @@ class CatalogItem(os.Document):
         self.objects.append(
             ObjectDoc(label=label, collection=collection, inventory=inventory)
         )
+
+
+class SuggestionItem(os.Document):
+    """A distinct value of a catalog field, with the number of documents
+    holding it. Stored in an index of its own, used for typeahead."""
+
+    class Index:
+        name = "catalog_suggestions"
+
+    field = os.Keyword()
+    value = os.Text(
+        analyzer=suggestion_analyzer, search_analyzer=suggestion_search_analyzer
+    )
+    count = os.Integer()
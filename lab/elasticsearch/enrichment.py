@@ -0,0 +1,78 @@
+"""Concurrent enrichment of object groups with external provider data.
+
+Provider objects of a batch are fetched up front, in parallel, instead of one
+blocking request per object group while building each document."""
+
+import copy
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from lab.objects.models import ObjectGroup
+
+from . import instrumentation
+from .catalog import fetch_object_group_from_provider
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of concurrent requests sent to a provider
+PROVIDER_CONCURRENCY = {"eros": 8}
+DEFAULT_PROVIDER_CONCURRENCY = 4
+
+
+def fetch_provider_object_groups(
+    object_groups: Iterable[ObjectGroup],
+    provider_names: Iterable[str] = ("eros",),
+) -> dict[int, ObjectGroup]:
+    """Fetch full data of external object groups from their provider.
+
+    Returns a map of object group id to a copy of the object group updated
+    with provider data. The given instances are left untouched. If a provider
+    fails, the local object group is used."""
+    by_provider: defaultdict[str, dict[int, ObjectGroup]] = defaultdict(dict)
+    for object_group in object_groups:
+        for provider_name in provider_names:
+            if object_group.is_from_provider(provider_name):
+                by_provider[provider_name][object_group.id] = object_group
+
+    for provider_name, provider_object_groups in by_provider.items():
+        instrumentation.count(f"{provider_name}_calls", len(provider_object_groups))
+
+    results: dict[int, ObjectGroup] = {}
+    executors = [
+        (
+            ThreadPoolExecutor(
+                max_workers=PROVIDER_CONCURRENCY.get(
+                    provider_name, DEFAULT_PROVIDER_CONCURRENCY
+                ),
+                thread_name_prefix=f"catalog-{provider_name}",
+            ),
+            provider_object_groups,
+        )
+        for provider_name, provider_object_groups in by_provider.items()
+    ]
+    try:
+        futures = {
+            object_group: executor.submit(
+                fetch_object_group_from_provider, copy.copy(object_group)
+            )
+            for executor, provider_object_groups in executors
+            for object_group in provider_object_groups.values()
+        }
+        for object_group, future in futures.items():
+            try:
+                results[object_group.id] = future.result()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                # e.g. read timeouts, which providers do not wrap
+                logger.error(
+                    "Failed to fetch object group %s from provider: %s",
+                    object_group.id,
+                    error,
+                )
+                results[object_group.id] = object_group
+    finally:
+        for executor, _ in executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+    logger.debug("Fetched %s object groups from providers", len(results))
+    return results
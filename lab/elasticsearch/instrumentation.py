@@ -0,0 +1,145 @@
+"""Instrumentation of catalog indexing runs.
+
+While `collect_stats` is active, the time of the calling thread is split into
+exclusive phases (a nested phase pauses its parent), and counters are
+incremented by the indexing code. Phases and counters are no-ops otherwise."""
+
+import contextlib
+import dataclasses
+import json
+import threading
+import time
+from typing import Any, Iterator
+
+from django.db import connection
+
+# Time of the run spent outside of any phase
+OTHER_PHASE = "other"
+
+
+@dataclasses.dataclass
+class IndexingStats:
+    wall_time: float = 0
+    # Seconds spent in each phase. Worker processes times are summed.
+    phases: dict[str, float] = dataclasses.field(default_factory=dict)
+    counters: dict[str, int] = dataclasses.field(default_factory=dict)
+    # Seconds spent in each phase, for each batch of projects. The first entry
+    # is the time spent before the first batch.
+    batches: list[dict[str, float]] = dataclasses.field(default_factory=list)
+
+    def merge(self, other: "IndexingStats"):
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0) + seconds
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        self.batches.extend(other.batches)
+
+    def to_dict(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+@dataclasses.dataclass
+class _State:
+    # Stats being collected, if any
+    stats: IndexingStats | None = None
+    # Phase times when the current batch started
+    batch_start: dict[str, float] = dataclasses.field(default_factory=dict)
+
+
+_lock = threading.Lock()
+_local = threading.local()
+_state = _State()
+
+
+@contextlib.contextmanager
+def collect_stats() -> Iterator[IndexingStats]:
+    """Collect stats of the code run in the block."""
+    stats = IndexingStats()
+    previous, _state.stats = _state.stats, stats
+    _state.batch_start = {}
+    started_at = time.perf_counter()
+    try:
+        with connection.execute_wrapper(_instrument_query), phase(OTHER_PHASE):
+            yield stats
+    finally:
+        next_batch()
+        _state.stats = previous
+        stats.wall_time = time.perf_counter() - started_at
+
+
+def is_collecting() -> bool:
+    return _state.stats is not None
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """Account the time spent in the block to a phase."""
+    if _state.stats is None:
+        yield
+        return
+    stack: list[list[Any]] = _local.__dict__.setdefault("stack", [])
+    _pause(stack)
+    stack.append([name, time.perf_counter()])
+    try:
+        yield
+    finally:
+        _pause(stack)
+        stack.pop()
+        if stack:
+            # Resume the parent phase
+            stack[-1][1] = time.perf_counter()
+
+
+def count(name: str, value: int = 1):
+    if _state.stats is None:
+        return
+    with _lock:
+        _state.stats.counters[name] = _state.stats.counters.get(name, 0) + value
+
+
+def count_json_bytes(name: str, data: Any):
+    """Count the size of data once serialized to JSON."""
+    if _state.stats is not None:
+        count(name, len(json.dumps(data, default=str).encode()))
+
+
+def merge(stats: IndexingStats):
+    """Add stats collected elsewhere (e.g. in a worker process)."""
+    if _state.stats is None:
+        return
+    with _lock:
+        _state.stats.merge(stats)
+
+
+def next_batch():
+    """Close the phase times of the current batch of projects."""
+    if _state.stats is None:
+        return
+    _pause(_local.__dict__.get("stack", []))
+    with _lock:
+        phases = dict(_state.stats.phases)
+        batch = {
+            name: seconds - _state.batch_start.get(name, 0)
+            for name, seconds in phases.items()
+            if seconds - _state.batch_start.get(name, 0) > 0
+        }
+        if batch:
+            _state.stats.batches.append(batch)
+        _state.batch_start = phases
+
+
+def _pause(stack: list[list[Any]]):
+    """Add the time elapsed since the current phase was (re)started to it."""
+    if not stack or _state.stats is None:
+        return
+    now = time.perf_counter()
+    name, started_at = stack[-1]
+    with _lock:
+        _state.stats.phases[name] = _state.stats.phases.get(name, 0) + now - started_at
+    stack[-1][1] = now
+
+
+def _instrument_query(execute, sql, params, many, context):
+    count("sql_queries")
+    with phase("sql"):
+        return execute(sql, params, many, context)
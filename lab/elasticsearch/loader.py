@@ -0,0 +1,105 @@
+"""Batch loading of the data needed to build catalog documents.
+
+Document builders used to follow relations row by row (leader, runs, object
+groups, thumbnails, objects, ...). The loader fetches everything for a batch of
+projects in a fixed number of queries and exposes it as maps keyed by id."""
+
+import dataclasses
+import itertools
+from collections import defaultdict
+from typing import Iterable, Iterator
+
+from lab.objects.models import Object, ObjectGroup, RunObjectGroup
+from lab.participations.models import Participation
+from lab.projects.models import Project
+from lab.runs.models import Run
+from lab.thesauri.opentheso import Concept, get_parent_ids
+
+from . import instrumentation
+
+CATALOG_BATCH_SIZE = 200
+
+
+@dataclasses.dataclass
+class CatalogData:
+    # Keyed by project id
+    leaders: dict[int, Participation] = dataclasses.field(default_factory=dict)
+    runs: dict[int, list[Run]] = dataclasses.field(default_factory=dict)
+    # Keyed by run id
+    object_groups: dict[int, list[ObjectGroup]] = dataclasses.field(
+        default_factory=dict
+    )
+    # Keyed by object group id
+    objects: dict[int, list[Object]] = dataclasses.field(default_factory=dict)
+    # Keyed by (theso_id, concept_id) of dating periods & eras
+    dating_parent_ids: dict[Concept, list[str]] = dataclasses.field(
+        default_factory=dict
+    )
+
+    def update(self, other: "CatalogData"):
+        self.leaders.update(other.leaders)
+        self.runs.update(other.runs)
+        self.object_groups.update(other.object_groups)
+        self.objects.update(other.objects)
+        self.dating_parent_ids.update(other.dating_parent_ids)
+
+
+def iter_catalog_batches(
+    projects: Iterable[Project], batch_size: int = CATALOG_BATCH_SIZE
+) -> Iterator[tuple[list[Project], CatalogData]]:
+    """Yield projects by batches, along with their catalog data."""
+    iterator = iter(projects)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        instrumentation.next_batch()
+        with instrumentation.phase("load"):
+            data = load_catalog_data(batch)
+        yield batch, data
+
+
+def load_catalog_data(projects: list[Project]) -> CatalogData:
+    """Load catalog data of projects with 5 queries."""
+    projects_by_id = {project.id: project for project in projects}
+    data = CatalogData()
+
+    for leader in Participation.objects.filter(
+        project_id__in=projects_by_id, is_leader=True
+    ).select_related("user", "institution"):
+        data.leaders[leader.project_id] = leader
+
+    runs_by_id: dict[int, Run] = {}
+    for run in Run.objects.filter(project_id__in=projects_by_id).order_by("id"):
+        # Avoid a query when accessing run.project in document builders
+        run.project = projects_by_id[run.project_id]
+        runs_by_id[run.id] = run
+        data.runs.setdefault(run.project_id, []).append(run)
+
+    object_groups_by_id: dict[int, ObjectGroup] = {}
+    object_groups_by_run: defaultdict[int, list[ObjectGroup]] = defaultdict(list)
+    for run_object_group in RunObjectGroup.objects.filter(
+        run_id__in=runs_by_id
+    ).select_related(
+        "objectgroup__discovery_place_location",
+        "objectgroup__dating_period",
+        "objectgroup__dating_era",
+        "objectgroup__external_reference",
+        "objectgroup__thumbnail",
+    ):
+        # Share a single instance per object group across runs & projects
+        object_group = object_groups_by_id.setdefault(
+            run_object_group.objectgroup_id, run_object_group.objectgroup
+        )
+        object_groups_by_run[run_object_group.run_id].append(object_group)
+    data.object_groups = dict(object_groups_by_run)
+
+    data.objects = {object_group_id: [] for object_group_id in object_groups_by_id}
+    for obj in Object.objects.filter(group_id__in=object_groups_by_id).order_by("id"):
+        data.objects[obj.group_id].append(obj)
+
+    data.dating_parent_ids = get_parent_ids(
+        (concept.OPENTHESO_THESO_ID, concept.concept_id)
+        for object_group in object_groups_by_id.values()
+        for concept in (object_group.dating_period, object_group.dating_era)
+        if concept and concept.concept_id
+    )
+
+    return data
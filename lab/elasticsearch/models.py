@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class CatalogDirtyDocument(models.Model):
+    """A catalog document which must be re-indexed (or deleted) by the next
+    incremental catalog indexing run."""
+
+    class Category(models.TextChoices):
+        PROJECT = "project"
+        OBJECT = "object"
+
+    category = models.CharField(max_length=16, choices=Category.choices)
+    object_id = models.PositiveBigIntegerField()
+    marked_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "object_id"],
+                name="catalog_dirty_document_unique_category_object_id",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.category}-{self.object_id}"
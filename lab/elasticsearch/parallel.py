@@ -0,0 +1,77 @@
+"""Parallel full rebuild of the catalog.
+
+Catalog projects are split into id ranges holding the same number of projects.
+Each range is indexed by a worker process into the same index generation (see
+CatalogClient.index_project_range)."""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+
+from . import instrumentation
+from .client import BulkIndexReport, CatalogClient, get_catalog_projects
+from .instrumentation import IndexingStats
+
+logger = logging.getLogger(__name__)
+
+
+def get_project_id_ranges(count: int) -> list[tuple[int, int]]:
+    """Split catalog projects into at most `count` id ranges (inclusive)."""
+    project_ids = sorted(set(get_catalog_projects().values_list("id", flat=True)))
+    if not project_ids:
+        return []
+    size = -(-len(project_ids) // count)  # ceil
+    return [
+        (project_ids[start], project_ids[min(start + size, len(project_ids)) - 1])
+        for start in range(0, len(project_ids), size)
+    ]
+
+
+def index_in_parallel(
+    workers: int, index_name: str, skip_eros: bool = False
+) -> BulkIndexReport:
+    """Index the whole catalog into `index_name` with `workers` processes."""
+    report = BulkIndexReport()
+    ranges = get_project_id_ranges(workers)
+    # Workers are spawned rather than forked: they must not share the database
+    # and OpenSearch connections of this process.
+    with ProcessPoolExecutor(
+        max_workers=max(len(ranges), 1),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        futures = [
+            executor.submit(
+                index_project_range, first_id, last_id, skip_eros, index_name
+            )
+            for first_id, last_id in ranges
+        ]
+        for (first_id, last_id), future in zip(ranges, futures):
+            range_report, stats = future.result()
+            instrumentation.merge(stats)
+            logger.info(
+                "Indexed projects %s to %s: %s documents (%s failed)",
+                first_id,
+                last_id,
+                range_report.indexed,
+                range_report.failed_count,
+            )
+            report.indexed += range_report.indexed
+            report.failed.extend(range_report.failed)
+    return report
+
+
+def index_project_range(
+    first_project_id: int, last_project_id: int, skip_eros: bool, index_name: str
+) -> tuple[BulkIndexReport, IndexingStats]:
+    """Worker entry point."""
+    with instrumentation.collect_stats() as stats:
+        report = CatalogClient().index_project_range(
+            first_project_id,
+            last_project_id,
+            skip_eros=skip_eros,
+            index_name=index_name,
+        )
+    return report, stats
@@ -1,9 +1,82 @@
 import dataclasses
 import datetime
-from typing import Literal, NotRequired, TypedDict, cast
+from typing import Any, Literal, NotRequired, TypedDict, cast
 
 from lab.projects.models import Project
 
+# How long a point in time is kept open after each page
+POINT_IN_TIME_KEEP_ALIVE = "1m"
+
+# Search params filtering on the field of a facet
+FACET_PARAMS: dict[str, tuple[str, ...]] = {
+    "category": ("category",),
+    "status": ("status",),
+    "materials": ("materials",),
+    "collection": ("collection",),
+    "created": ("created_from", "created_to"),
+    "dating_period_theso_huma_num_parent_ids": ("dating_period_ids",),
+    "dating_era_theso_huma_num_parent_ids": ("dating_era_ids",),
+    "is_data_embargoed": ("is_data_embargoed",),
+}
+# Facets aggregated as date histograms (field -> calendar interval). Other
+# facets are terms aggregations.
+DATE_HISTOGRAM_FACETS = {"created": "year"}
+# Facets aggregated on another field than their name, e.g. because theirs is a
+# text field, which can not be aggregated
+FACET_AGG_FIELDS = {"collection": "collections"}
+PAGINATION_PARAMS = (
+    "size",
+    "from",
+    "_from",
+    "sort",
+    "search_after",
+    "pit_id",
+    "projection",
+)
+
+# Geo clusters are map tiles this many zoom levels below the map zoom, i.e. up
+# to 2^N x 2^N clusters per map tile.
+GEO_CLUSTER_PRECISION_OFFSET = 3
+MAX_GEO_CLUSTER_PRECISION = 29
+MAX_GEO_CLUSTERS = 1000
+
+# Named `_source` filters of search hits. Result lists only need a few fields,
+# not the whole page data of each document.
+SOURCE_PROJECTIONS: dict[str, dict[str, list[str]] | None] = {
+    "card": {
+        "includes": [
+            "id",
+            "category",
+            "name",
+            "slug",
+            "created",
+            "status",
+            "materials",
+            "is_data_embargoed",
+            "thumbnail",
+            "collection",
+            "inventory_number",
+            "c2rmf_id",
+            "dating_period_label",
+            "dating_era_label",
+            "discovery_place_label",
+            "project_page_data.leader",
+        ]
+    },
+    "map": {
+        "includes": [
+            "id",
+            "category",
+            "name",
+            "slug",
+            "discovery_place_label",
+            "discovery_place_point",
+            "discovery_place_points",
+        ]
+    },
+    "full": None,
+}
+
 
 class GeoPoint(TypedDict):
     lat: float
@@ -34,6 +107,12 @@ class QueryParams(TypedDict, total=False):
     _from: int
     size: int
     sort: Literal["asc", "desc"]
+    # Cursor pagination, instead of `from`: `sort` values of the last hit of the
+    # previous page (empty for the first page), optionally on a point in time.
+    search_after: list[Any]
+    pit_id: str
+    # Name of a SOURCE_PROJECTIONS entry (defaults to full documents)
+    projection: Literal["card", "map", "full"]
 
 
 @dataclasses.dataclass
@@ -52,18 +131,8 @@ class Query:
         _from: int | None = None,
         sort: Literal["asc", "desc"] | None = None,
     ):
-        self._process_params(params)
-        if self.must or self.filter:
-            query = {
-                "query": {
-                    "bool": {
-                        "filter": self.filter,
-                        "must": self.must,
-                    },
-                },
-            }
-        else:
-            query = match_all_query()
+        query = {"query": self.build_filter(params)}
+        if not self.must and not self.filter:
             query["sort"] = _sort_expression("created", "desc")
         query = _paginate_query(query, size, _from)
         if sort:
@@ -71,6 +140,18 @@ class Query:
         print(query)
         return query
 
+    def build_filter(self, params: QueryParams) -> dict:
+        """Build the query matching params (match all if there is none)."""
+        self._process_params(params)
+        if self.must or self.filter:
+            return {
+                "bool": {
+                    "filter": self.filter,
+                    "must": self.must,
+                },
+            }
+        return match_all_query()["query"]
+
     def _process_params(self, params: QueryParams):
         """Process query params into ES query.
         Populates self.must and self.filter with query expressions."""
@@ -139,12 +220,22 @@ def filter_query(
     size = params.pop("size", None)
     _from = params.pop("from", None)  # type: ignore
     sort = params.pop("sort", None)
-    return Query().build_query(
+    search_after = params.pop("search_after", None)
+    pit_id = params.pop("pit_id", None)
+    projection = params.pop("projection", "full")
+    if projection not in SOURCE_PROJECTIONS:
+        raise ValueError(f"Unknown projection: {projection}")
+    query = Query().build_query(
         params,
         size=size,
         _from=_from,
         sort=sort,
     )
+    if search_after is not None or pit_id:
+        query = _cursor_paginate_query(query, search_after, pit_id, sort)
+    if SOURCE_PROJECTIONS[projection] is not None:
+        query["_source"] = SOURCE_PROJECTIONS[projection]
+    return query
 
 
 def terms_agg(field: str, query: str | None = None, exclude: list[str] | None = None):
@@ -170,6 +261,106 @@ def date_historiogram_agg(field: str, interval: str):
     }
 
 
+def facets_query(fields: list[str], params: QueryParams):
+    """Aggregate several facets with a single search.
+
+    Filters on the field of a facet do not apply to that facet, so that its
+    counts reflect the other active filters only. They apply to the other
+    facets and, as a post filter, to hits."""
+    params = cast(
+        QueryParams,
+        {key: value for key, value in params.items() if key not in PAGINATION_PARAMS},
+    )
+    facet_params = {key for field in fields for key in FACET_PARAMS.get(field, ())}
+
+    def _filter(keys: set[str]):
+        return Query().build_filter(
+            cast(
+                QueryParams,
+                {key: value for key, value in params.items() if key in keys},
+            )
+        )
+
+    query: dict[str, Any] = {
+        "size": 0,
+        "query": _filter(set(params) - facet_params),
+        "aggs": {
+            field: {
+                "filter": _filter(facet_params - set(FACET_PARAMS.get(field, ()))),
+                "aggs": _facet_agg(field),
+            }
+            for field in fields
+        },
+    }
+    post_filter = _filter(facet_params)
+    if post_filter != match_all_query()["query"]:
+        query["post_filter"] = post_filter
+    return query
+
+
+def geo_clusters_query(zoom: int, params: QueryParams):
+    """Cluster discovery places of documents matching params (including the
+    `location` viewport) in a geotile grid, with the centroid of each tile."""
+    location = params.get("location")
+    grid: dict[str, Any] = {
+        "field": "discovery_place_points",
+        "precision": min(
+            zoom + GEO_CLUSTER_PRECISION_OFFSET, MAX_GEO_CLUSTER_PRECISION
+        ),
+        "size": MAX_GEO_CLUSTERS,
+    }
+    if location:
+        # Documents in the viewport may also have points outside of it
+        grid["bounds"] = _discovery_place_query(location)["geo_bounding_box"][
+            "discovery_place_points"
+        ]
+    return {
+        "size": 0,
+        "query": Query().build_filter(
+            cast(
+                QueryParams,
+                {
+                    key: value
+                    for key, value in params.items()
+                    if key not in PAGINATION_PARAMS
+                },
+            )
+        ),
+        "aggs": {
+            "clusters": {
+                "geotile_grid": grid,
+                "aggs": {
+                    "centroid": {"geo_centroid": {"field": "discovery_place_points"}}
+                },
+            }
+        },
+    }
+
+
+def suggestion_query(field: str, q: str, size: int):
+    """Values of `field` having words starting with the words of `q`, most
+    frequent first."""
+    return {
+        "size": size,
+        "query": {
+            "bool": {
+                "filter": [_term_query("field", field)],
+                "must": [{"match": {"value": {"query": q, "operator": "and"}}}],
+            }
+        },
+        "sort": ["_score", *_sort_expression("count", "desc")],
+        "_source": ["value", "count"],
+    }
+
+
+def _facet_agg(facet: str):
+    """Aggregation of a facet, named after it."""
+    if facet in DATE_HISTOGRAM_FACETS:
+        return date_historiogram_agg(facet, DATE_HISTOGRAM_FACETS[facet])["aggs"]
+    field = FACET_AGG_FIELDS.get(facet, facet)
+    return {facet: terms_agg(field)["aggs"][field]}
+
+
 def _paginate_query(query: dict, size: int | None = None, _from: int | None = None):
     return {
         **query,
@@ -178,6 +369,27 @@ def _paginate_query(query: dict, size: int | None = None, _from: int | None = No
     }
 
 
+def _cursor_paginate_query(
+    query: dict,
+    search_after: list[Any] | None = None,
+    pit_id: str | None = None,
+    sort: Literal["asc", "desc"] | None = None,
+):
+    """Paginate with search_after on a stable sort: documents created at the
+    same date are ordered by id, so that pages never overlap."""
+    order = sort or "desc"
+    query = {
+        **query,
+        "sort": [*_sort_expression("created", order), *_sort_expression("id", order)],
+    }
+    query.pop("from", None)
+    if search_after:
+        query["search_after"] = search_after
+    if pit_id:
+        query["pit"] = {"id": pit_id, "keep_alive": POINT_IN_TIME_KEEP_ALIVE}
+    return query
+
+
 def search_box_query(q: str):
     return _should_query(
         _full_text_match_query(q, "name"),
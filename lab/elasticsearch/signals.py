@@ -0,0 +1,109 @@
+"""Mark catalog documents dirty when the data they are built from changes."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from lab.objects.models import (
+    Object,
+    ObjectGroup,
+    ObjectGroupThumbnail,
+    RunObjectGroup,
+)
+from lab.participations.models import Participation
+from lab.projects.models import Project
+from lab.runs.models import Run
+
+from .tracking import mark_object_groups_dirty, mark_projects_dirty
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def mark_project_document_dirty(
+    sender: type[Project],  # pylint: disable=unused-argument
+    instance: Project,
+    **kwargs,
+) -> None:
+    mark_projects_dirty([instance.pk])
+
+
+@receiver(post_save, sender=Run)
+@receiver(post_delete, sender=Run)
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+def mark_related_project_document_dirty(
+    sender: type[Run] | type[Participation],  # pylint: disable=unused-argument
+    instance: Run | Participation,
+    **kwargs,
+) -> None:
+    mark_projects_dirty([instance.project_id])
+
+
+@receiver(post_save, sender=ObjectGroup)
+@receiver(post_delete, sender=ObjectGroup)
+def mark_object_group_document_dirty(
+    sender: type[ObjectGroup],  # pylint: disable=unused-argument
+    instance: ObjectGroup,
+    **kwargs,
+) -> None:
+    mark_object_groups_dirty([instance.pk])
+
+
+@receiver(post_save, sender=Object)
+@receiver(post_delete, sender=Object)
+def mark_object_parent_document_dirty(
+    sender: type[Object],  # pylint: disable=unused-argument
+    instance: Object,
+    **kwargs,
+) -> None:
+    mark_object_groups_dirty([instance.group_id])
+
+
+@receiver(post_save, sender=ObjectGroupThumbnail)
+@receiver(post_delete, sender=ObjectGroupThumbnail)
+def mark_thumbnail_document_dirty(
+    sender: type[ObjectGroupThumbnail],  # pylint: disable=unused-argument
+    instance: ObjectGroupThumbnail,
+    **kwargs,
+) -> None:
+    mark_object_groups_dirty([instance.object_group_id])
+
+
+@receiver(post_save, sender=RunObjectGroup)
+@receiver(post_delete, sender=RunObjectGroup)
+def mark_run_object_group_documents_dirty(
+    sender: type[RunObjectGroup],  # pylint: disable=unused-argument
+    instance: RunObjectGroup,
+    **kwargs,
+) -> None:
+    # The project is marked explicitly: once the link is removed, it can not be
+    # found from the object group anymore.
+    mark_object_groups_dirty([instance.objectgroup_id])
+    mark_projects_dirty(
+        Run.objects.filter(pk=instance.run_id).values_list("project_id", flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Run.run_object_groups.through)
+def mark_run_object_groups_documents_dirty(
+    sender,  # pylint: disable=unused-argument
+    instance: Run | ObjectGroup,
+    action: str,
+    pk_set: set[int] | None,
+    **kwargs,
+) -> None:
+    # Removed links are marked before removal (pre_*) and added links after.
+    if action not in ("pre_remove", "pre_clear", "post_add"):
+        return
+    if isinstance(instance, Run):
+        mark_projects_dirty([instance.project_id])
+        mark_object_groups_dirty(
+            pk_set
+            if pk_set is not None
+            else instance.run_object_groups.values_list("pk", flat=True)
+        )
+    else:
+        runs = (
+            Run.objects.filter(pk__in=pk_set) if pk_set is not None else instance.runs
+        )
+        mark_object_groups_dirty([instance.pk])
+        mark_projects_dirty(runs.values_list("project_id", flat=True))
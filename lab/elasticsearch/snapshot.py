@@ -0,0 +1,171 @@
+"""Static snapshot of the catalog, served without OpenSearch nor Django.
+
+A snapshot is a directory of gzipped JSON files, named after the hash of their
+content, and a `manifest.json` pointing to them:
+
+- items/<hash>.json.gz: one catalog document (search hit)
+- listings/<hash>.json.gz: documents in the "card" projection, by shards of
+  SNAPSHOT_LISTING_SHARD_SIZE, in the order of the catalog listing
+- facets/<hash>.json.gz: facet aggregations of the whole catalog
+
+Files of unchanged documents keep their name between exports, so that they can
+be cached forever. The manifest is written last and is the only file which
+must not be cached."""
+
+import dataclasses
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from . import queries
+from .client import CatalogClient
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = "manifest.json"
+SNAPSHOT_LISTING_SHARD_SIZE = 500
+# Number of leading hexadecimal digits of the SHA-256 of a file content used
+# in its name
+SNAPSHOT_HASH_LENGTH = 20
+
+
+@dataclasses.dataclass
+class SnapshotReport:
+    items: int = 0
+    # Number of files written, i.e. which did not exist with the same content
+    written: int = 0
+    deleted: int = 0
+
+
+def export_snapshot(
+    output_dir: str | os.PathLike, catalog_client: CatalogClient | None = None
+) -> SnapshotReport:
+    """Write a snapshot of the live catalog to `output_dir`. Files referenced
+    neither by the new manifest nor by the previous one are deleted (the
+    previous ones may still be served by caches)."""
+    catalog_client = catalog_client or CatalogClient()
+    writer = _SnapshotWriter(Path(output_dir))
+    previous_files = writer.read_manifest_files()
+
+    items: dict[str, str] = {}
+    listings: list[str] = []
+    listing_shard: list[dict[str, Any]] = []
+    card_includes = queries.SOURCE_PROJECTIONS["card"]["includes"]  # type: ignore
+    for hit in catalog_client.list_all_items():
+        items[hit["_id"]] = writer.write("items", hit)
+        listing_shard.append(
+            {"_id": hit["_id"], "_source": _project(hit["_source"], card_includes)}
+        )
+        if len(listing_shard) == SNAPSHOT_LISTING_SHARD_SIZE:
+            listings.append(writer.write("listings", listing_shard))
+            listing_shard = []
+    if listing_shard or not listings:
+        listings.append(writer.write("listings", listing_shard))
+
+    facets = catalog_client.aggregate_facets(list(queries.FACET_PARAMS))
+    manifest = {
+        "created": timezone.now().isoformat(),
+        "generation": catalog_client.get_index_generation(),
+        "items": items,
+        "listings": listings,
+        "facets": writer.write("facets", facets["aggregations"]),
+    }
+    writer.write_manifest(manifest)
+
+    report = SnapshotReport(items=len(items), written=writer.written)
+    report.deleted = writer.delete_unreferenced(
+        previous_files | _manifest_files(manifest)
+    )
+    logger.info(
+        "Exported catalog snapshot to %s (%s items, %s written, %s deleted)",
+        output_dir,
+        report.items,
+        report.written,
+        report.deleted,
+    )
+    return report
+
+
+class _SnapshotWriter:
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.written = 0
+
+    def write(self, kind: str, data: Any) -> str:
+        """Write data if no file holds it yet. Returns the file path, relative
+        to the snapshot directory."""
+        content = json.dumps(
+            data, cls=DjangoJSONEncoder, sort_keys=True, separators=(",", ":")
+        ).encode()
+        digest = hashlib.sha256(content).hexdigest()[:SNAPSHOT_HASH_LENGTH]
+        path = f"{kind}/{digest}.json.gz"
+        full_path = self.output_dir / path
+        if not full_path.exists():
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            # No timestamp in the gzip header: same content, same bytes
+            _write_atomic(full_path, gzip.compress(content, mtime=0))
+            self.written += 1
+        return path
+
+    def read_manifest_files(self) -> set[str]:
+        try:
+            manifest = json.loads(
+                (self.output_dir / MANIFEST_FILE_NAME).read_text(encoding="utf-8")
+            )
+        except (FileNotFoundError, json.JSONDecodeError):
+            return set()
+        return _manifest_files(manifest)
+
+    def write_manifest(self, manifest: dict[str, Any]):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(
+            self.output_dir / MANIFEST_FILE_NAME,
+            json.dumps(manifest, cls=DjangoJSONEncoder).encode(),
+        )
+
+    def delete_unreferenced(self, referenced_files: set[str]) -> int:
+        deleted = 0
+        for path in self.output_dir.glob("*/*.json.gz"):
+            if path.relative_to(self.output_dir).as_posix() not in referenced_files:
+                path.unlink()
+                deleted += 1
+        return deleted
+
+
+def _manifest_files(manifest: dict[str, Any]) -> set[str]:
+    files = {*manifest.get("items", {}).values(), *manifest.get("listings", [])}
+    if manifest.get("facets"):
+        files.add(manifest["facets"])
+    return files
+
+
+def _project(source: dict[str, Any], includes: list[str]) -> dict[str, Any]:
+    """Keep fields of a document listed in `includes` (dotted paths for
+    nested fields), like OpenSearch source filtering."""
+    projected: dict[str, Any] = {}
+    for field in includes:
+        name, _, subfield = field.partition(".")
+        if name not in source:
+            continue
+        if subfield and isinstance(source[name], dict):
+            nested = _project(source[name], [subfield])
+            if nested:
+                projected.setdefault(name, {}).update(nested)
+        elif not subfield:
+            projected[name] = source[name]
+    return projected
+
+
+def _write_atomic(path: Path, content: bytes):
+    """Write to a temporary file and rename it, so that a file is never served
+    half written."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(content)
+    tmp_path.replace(path)
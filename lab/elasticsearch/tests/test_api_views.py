@@ -1,8 +1,9 @@
 import json
 from unittest import mock
 
-from django.test import Client, SimpleTestCase
+from django.test import AsyncRequestFactory, Client, SimpleTestCase
 
+from .. import api_views
 from ._mock import BASE_SEARCH_PARAMS
 
 BASE_API_URL = "/api/lab/catalog"
@@ -14,15 +15,55 @@ class TestProjectListView(SimpleTestCase):
 
     @mock.patch("lab.elasticsearch.api_views.CatalogClient")
     def test_list_all_items_view(self, mock_cls: mock.MagicMock):
-        mock_cls.return_value.list_all_items.return_value = {"items": []}
+        total = {"value": 2, "relation": "eq"}
+        mock_cls.return_value.list_all_pages.return_value = iter(
+            [
+                {"hits": {"total": total, "hits": [{"_id": "project-1"}]}},
+                {"hits": {"total": total, "hits": [{"_id": "object-1"}]}},
+            ]
+        )
 
         url = f"{BASE_API_URL}/list-all"
         response = self.client.get(url)
 
-        mock_cls.return_value.list_all_items.assert_called_once()
+        mock_cls.return_value.list_all_pages.assert_called_once()
 
         assert response.status_code == 200
-        assert response.json() == {"items": []}
+        assert response.streaming
+        assert json.loads(response.getvalue()) == {
+            "hits": {
+                "total": total,
+                "hits": [{"_id": "project-1"}, {"_id": "object-1"}],
+            }
+        }
+
+    @mock.patch("lab.elasticsearch.api_views.CatalogClient")
+    def test_list_all_items_view_when_catalog_is_empty(self, mock_cls):
+        total = {"value": 0, "relation": "eq"}
+        mock_cls.return_value.list_all_pages.return_value = iter(
+            [{"hits": {"total": total, "hits": []}}]
+        )
+
+        response = self.client.get(f"{BASE_API_URL}/list-all")
+
+        assert json.loads(response.getvalue()) == {"hits": {"total": total, "hits": []}}
+
+    @mock.patch("lab.elasticsearch.api_views.CatalogClient")
+    def test_list_all_items_view_when_listing_fails(self, mock_cls):
+        def pages():
+            yield {"hits": {"total": {"value": 2}, "hits": [{"_id": "project-1"}]}}
+            raise ConnectionError
+
+        mock_cls.return_value.list_all_pages.return_value = pages()
+
+        with self.assertLogs("lab.elasticsearch.api_views", level="ERROR"):
+            response = self.client.get(f"{BASE_API_URL}/list-all")
+            content = json.loads(response.getvalue())
+
+        assert content == {
+            "hits": {"total": {"value": 2}, "hits": [{"_id": "project-1"}]},
+            "error": "Listing interrupted",
+        }
 
     @mock.patch("lab.elasticsearch.api_views.CatalogClient")
     def test_search_view(self, mock_cls: mock.MagicMock):
@@ -39,6 +80,34 @@ class TestProjectListView(SimpleTestCase):
         assert response.status_code == 200
         assert response.json() == {"results": []}
 
+    @mock.patch("lab.elasticsearch.api_views.CatalogClient")
+    def test_search_view_with_projection(self, mock_cls: mock.MagicMock):
+        mock_cls.return_value.search.return_value = {"results": []}
+        response = self.client.post(
+            f"{BASE_API_URL}/search",
+            json.dumps({"q": "vase", "projection": "card"}),
+            content_type="application/json",
+        )
+
+        mock_cls.return_value.search.assert_called_once_with(
+            q="vase", projection="card"
+        )
+        assert response.status_code == 200
+
+    @mock.patch("lab.elasticsearch.api_views.CatalogClient")
+    def test_search_view_with_unknown_projection(self, mock_cls: mock.MagicMock):
+        response = self.client.post(
+            f"{BASE_API_URL}/search",
+            json.dumps({"projection": "everything"}),
+            content_type="application/json",
+        )
+
+        mock_cls.return_value.search.assert_not_called()
+        assert response.status_code == 400
+        assert response.json() == {
+            "error": "'projection' must be one of card, map, full"
+        }
+
     def test_aggregate_field_view(self):
         with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
             mock_cls.return_value.aggregate_terms.return_value = {"results": []}
@@ -74,3 +143,218 @@ class TestProjectListView(SimpleTestCase):
 
         assert response.status_code == 200
         assert response.json() == {"results": []}
+
+    def test_aggregate_facets_view(self):
+        with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
+            mock_cls.return_value.aggregate_facets.return_value = {"results": []}
+            response = self.client.post(
+                f"{BASE_API_URL}/aggregate-facets",
+                json.dumps(
+                    {"fields": ["materials", "created"], "filters": {"q": "vase"}}
+                ),
+                content_type="application/json",
+            )
+
+        mock_cls.return_value.aggregate_facets.assert_called_once_with(
+            ["materials", "created"], q="vase"
+        )
+        assert response.status_code == 200
+        assert response.json() == {"results": []}
+
+    def test_aggregate_facets_view_when_fields_are_missing(self):
+        response = self.client.post(
+            f"{BASE_API_URL}/aggregate-facets",
+            json.dumps({"fields": "materials"}),
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert response.json() == {"error": "'fields' must be a non-empty list"}
+
+    def test_aggregate_facets_view_with_invalid_params(self):
+        for data in [
+            {"fields": ["unknown"]},
+            {"fields": ["materials"], "filters": ["q"]},
+            {"fields": ["materials"], "filters": {"unknown": "vase"}},
+        ]:
+            with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
+                response = self.client.post(
+                    f"{BASE_API_URL}/aggregate-facets",
+                    json.dumps(data),
+                    content_type="application/json",
+                )
+            assert response.status_code == 400
+            mock_cls.return_value.aggregate_facets.assert_not_called()
+
+    def test_aggregate_geo_clusters_view(self):
+        with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
+            mock_cls.return_value.aggregate_geo_clusters.return_value = []
+            response = self.client.post(
+                f"{BASE_API_URL}/aggregate-geo-clusters",
+                json.dumps({"zoom": 6, "filters": {"category": "object"}}),
+                content_type="application/json",
+            )
+
+        mock_cls.return_value.aggregate_geo_clusters.assert_called_once_with(
+            6, category="object"
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_aggregate_geo_clusters_view_with_invalid_zoom(self):
+        for zoom in [None, "6", 30, True]:
+            response = self.client.post(
+                f"{BASE_API_URL}/aggregate-geo-clusters",
+                json.dumps({"zoom": zoom}),
+                content_type="application/json",
+            )
+            assert response.status_code == 400
+
+    def test_aggregate_geo_clusters_view_with_location(self):
+        location = {
+            "top_left": {"lat": 50.5, "lon": -4},
+            "bottom_right": {"lat": 42, "lon": 8.25},
+        }
+        with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
+            mock_cls.return_value.aggregate_geo_clusters.return_value = []
+            response = self.client.post(
+                f"{BASE_API_URL}/aggregate-geo-clusters",
+                json.dumps({"zoom": 6, "filters": {"location": location}}),
+                content_type="application/json",
+            )
+
+        assert response.status_code == 200
+        mock_cls.return_value.aggregate_geo_clusters.assert_called_once_with(
+            6, location=location
+        )
+
+    def test_aggregate_geo_clusters_view_with_invalid_filters(self):
+        for filters in [
+            [],
+            "category",
+            {"unknown": "value"},
+            {"size": 10},
+            {"materials": "gold"},
+            {"is_data_embargoed": "yes"},
+            {"location": "France"},
+            {"location": {"top_left": {"lat": 50, "lon": -4}}},
+            {
+                "location": {
+                    "top_left": {"lat": 50, "lon": -4},
+                    "bottom_right": {"lat": "42", "lon": 8},
+                }
+            },
+            {
+                "location": {
+                    "top_left": {"lat": 91, "lon": -4},
+                    "bottom_right": {"lat": 42, "lon": 8},
+                }
+            },
+        ]:
+            with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
+                response = self.client.post(
+                    f"{BASE_API_URL}/aggregate-geo-clusters",
+                    json.dumps({"zoom": 6, "filters": filters}),
+                    content_type="application/json",
+                )
+
+            assert response.status_code == 400, filters
+            assert "error" in response.json()
+            mock_cls.return_value.aggregate_geo_clusters.assert_not_called()
+
+    def test_suggest_view(self):
+        with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
+            mock_cls.return_value.suggest.return_value = [{"value": "or", "count": 3}]
+            response = self.client.get(f"{BASE_API_URL}/suggest?field=materials&q=o")
+
+        mock_cls.return_value.suggest.assert_called_once_with("materials", "o")
+        assert response.status_code == 200
+        assert response.json() == [{"value": "or", "count": 3}]
+
+    def test_suggest_view_with_empty_query(self):
+        with mock.patch("lab.elasticsearch.api_views.CatalogClient") as mock_cls:
+            response = self.client.get(f"{BASE_API_URL}/suggest?field=name&q=%20")
+
+        mock_cls.return_value.suggest.assert_not_called()
+        assert response.json() == []
+
+    def test_suggest_view_with_unknown_field(self):
+        response = self.client.get(f"{BASE_API_URL}/suggest?field=comments&q=a")
+
+        assert response.status_code == 400
+
+
+@mock.patch("lab.elasticsearch.api_views.AsyncCatalogClient")
+class TestAsyncViews(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    async def test_search_view(self, mock_cls: mock.MagicMock):
+        mock_cls.return_value.search = mock.AsyncMock(return_value={"results": []})
+        request = self.factory.post(
+            f"{BASE_API_URL}/search",
+            json.dumps({"q": "vase", "projection": "card"}),
+            content_type="application/json",
+        )
+
+        response = await api_views.async_search(request)
+
+        mock_cls.return_value.search.assert_awaited_once_with(
+            q="vase", projection="card"
+        )
+        assert response.status_code == 200
+        assert json.loads(response.content) == {"results": []}
+
+    async def test_search_view_with_unknown_projection(self, mock_cls):
+        request = self.factory.post(
+            f"{BASE_API_URL}/search",
+            json.dumps({"projection": "everything"}),
+            content_type="application/json",
+        )
+
+        response = await api_views.async_search(request)
+
+        mock_cls.return_value.search.assert_not_called()
+        assert response.status_code == 400
+
+    async def test_search_view_with_invalid_body(self, mock_cls):
+        request = self.factory.post(
+            f"{BASE_API_URL}/search", "{", content_type="application/json"
+        )
+
+        response = await api_views.async_search(request)
+
+        mock_cls.return_value.search.assert_not_called()
+        assert response.status_code == 400
+
+    async def test_aggregate_field_view(self, mock_cls: mock.MagicMock):
+        mock_cls.return_value.aggregate_terms = mock.AsyncMock(
+            return_value={"results": []}
+        )
+        request = self.factory.get(
+            f"{BASE_API_URL}/aggregate?field=field&query=query&exclude=a,b"
+        )
+
+        response = await api_views.async_aggregate_field(request)
+
+        mock_cls.return_value.aggregate_terms.assert_awaited_once_with(
+            "field", query="query", exclude=["a", "b"]
+        )
+        assert response.status_code == 200
+
+    async def test_aggregate_field_view_when_field_is_missing(self, _mock_cls):
+        request = self.factory.get(f"{BASE_API_URL}/aggregate")
+
+        response = await api_views.async_aggregate_field(request)
+
+        assert response.status_code == 400
+
+    async def test_aggregate_created_view(self, mock_cls: mock.MagicMock):
+        mock_cls.return_value.aggregate_date = mock.AsyncMock(
+            return_value={"results": []}
+        )
+        request = self.factory.get(f"{BASE_API_URL}/aggregate-created")
+
+        response = await api_views.async_aggregate_created(request)
+
+        mock_cls.return_value.aggregate_date.assert_awaited_once_with("created", "year")
+        assert json.loads(response.content) == {"results": []}
@@ -0,0 +1,57 @@
+import asyncio
+import datetime
+from unittest import mock
+
+from ..cache import ResponseCache, make_cache_key
+
+
+def test_make_cache_key_normalizes_params():
+    assert make_cache_key("search", "catalog-1", {"q": "vase", "size": None}) == (
+        make_cache_key("search", "catalog-1", {"q": "vase"})
+    )
+    assert make_cache_key("search", "catalog-1", {"a": 1, "b": 2}) == (
+        make_cache_key("search", "catalog-1", {"b": 2, "a": 1})
+    )
+    assert make_cache_key(
+        "search", "catalog-1", {"created_from": datetime.date(2020, 1, 1)}
+    ) != make_cache_key(
+        "search", "catalog-2", {"created_from": datetime.date(2020, 1, 1)}
+    )
+    assert make_cache_key("search", "catalog-1", {}) != make_cache_key(
+        "terms", "catalog-1", {}
+    )
+
+
+def test_response_cache_evicts_least_recently_used_entries():
+    cache = ResponseCache(max_entries=2)
+
+    cache.get_or_set("a", lambda: 1)
+    cache.get_or_set("b", lambda: 2)
+    assert cache.get_or_set("a", lambda: 0) == 1
+    cache.get_or_set("c", lambda: 3)
+
+    assert cache.get_or_set("b", lambda: 4) == 4
+    assert cache.stats() == {"entries": 2, "max_entries": 2, "hits": 1, "misses": 4}
+
+
+def test_response_cache_clear_keeps_counters():
+    cache = ResponseCache()
+    cache.get_or_set("a", lambda: 1)
+    cache.get_or_set("a", lambda: 1)
+
+    cache.clear()
+
+    assert cache.get_or_set("a", lambda: 2) == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_response_cache_aget_or_set():
+    cache = ResponseCache()
+    compute = mock.AsyncMock(return_value={"hits": []})
+
+    assert asyncio.run(cache.aget_or_set("a", compute)) == {"hits": []}
+    assert asyncio.run(cache.aget_or_set("a", compute)) == {"hits": []}
+
+    compute.assert_awaited_once()
+    assert cache.stats()["hits"] == 1
@@ -10,10 +10,10 @@ from lab.tests import factories
 
 from ..catalog import (
     _create_project_page_data,
-    _fetch_object_group_from_provider,
     _get_thumbnail_from_object_groups,
     build_object_group_catalog_document,
     build_project_catalog_document,
+    fetch_object_group_from_provider,
 )
 
 
@@ -113,11 +113,11 @@ class TestObjectGroupCatalogDocument(TestCase):
 
     def test_build_object_group_catalog_document(self):
         with mock.patch(
-            "lab.elasticsearch.catalog.fetch_period_parent_ids_from_id",
+            "lab.elasticsearch.catalog.get_period_parent_ids",
             return_value=[345, 567],
         ) as fetch_period_mock:
             with mock.patch(
-                "lab.elasticsearch.catalog.fetch_era_parent_ids_from_id",
+                "lab.elasticsearch.catalog.get_era_parent_ids",
                 return_value=[890, 445],
             ) as fetch_era_mock:
                 document = build_object_group_catalog_document(
@@ -203,10 +203,10 @@ class TestObjectGroupCatalogDocument(TestCase):
         self.object_group.save()
 
         with mock.patch(
-            "lab.elasticsearch.catalog.fetch_period_parent_ids_from_id",
+            "lab.elasticsearch.catalog.get_period_parent_ids",
         ):
             with mock.patch(
-                "lab.elasticsearch.catalog.fetch_era_parent_ids_from_id",
+                "lab.elasticsearch.catalog.get_era_parent_ids",
             ) as fetch_era_mock:
                 build_object_group_catalog_document(
                     object_group=self.object_group,
@@ -222,10 +222,10 @@ class TestObjectGroupCatalogDocument(TestCase):
         self.object_group.save()
 
         with mock.patch(
-            "lab.elasticsearch.catalog.fetch_period_parent_ids_from_id",
+            "lab.elasticsearch.catalog.get_period_parent_ids",
         ) as fetch_period_mock:
             with mock.patch(
-                "lab.elasticsearch.catalog.fetch_era_parent_ids_from_id",
+                "lab.elasticsearch.catalog.get_era_parent_ids",
             ):
                 build_object_group_catalog_document(
                     object_group=self.object_group,
@@ -282,7 +282,7 @@ def test_fetch_object_group_from_eros_if_eros_fails_returns_og(
 
     eros_mock.side_effect = ObjectProviderError
     assert (
-        _fetch_object_group_from_provider(
+        fetch_object_group_from_provider(
             object_group=object_group,
         )
         == object_group
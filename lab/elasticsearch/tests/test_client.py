@@ -1,18 +1,52 @@
 from unittest import mock
 
 import pytest
+from opensearchpy import NotFoundError
 from pytest import fixture
 
 from lab.tests import factories as lab_factories
 
-from ..client import CatalogClient
+from .. import queries
+from ..cache import ResponseCache
+from ..client import BULK_MAX_CHUNK_BYTES, CatalogClient, CatalogIndexError
 from ._mock import BASE_SEARCH_PARAMS, BASE_SEARCH_PARAMS_RELATED_QUERY
 
 
 @fixture(name="catalog_client", scope="function")
 def catalog_client_fixture():
     with mock.patch("lab.elasticsearch.client.OpenSearch"):
-        yield CatalogClient()
+        client = CatalogClient()
+        # CatalogClient is a singleton: reset the OpenSearch mock between tests
+        client.client.reset_mock(return_value=True, side_effect=True)
+        client.response_cache = ResponseCache()
+        client._generation = None  # pylint: disable=protected-access
+        yield client
+
+
+def _fake_streaming_bulk(statuses: dict[str, list[int]] | None = None):
+    """Fake opensearchpy streaming_bulk. `statuses` maps a document id to the
+    statuses returned on successive attempts (default 201)."""
+    statuses = statuses or {}
+
+    def _streaming_bulk(_client, actions, **_kwargs):
+        for action in actions:
+            status = (statuses.get(action["_id"]) or [201]).pop(0)
+            op_type = action.get("_op_type", "index")
+            yield 200 <= status < 300, {
+                op_type: {"_id": action["_id"], "status": status, "error": "error"}
+            }
+
+    return _streaming_bulk
+
+
+def _catalog_item(_id: str):
+    item = mock.MagicMock()
+    item.to_dict.return_value = {
+        "_index": "catalog",
+        "_id": _id,
+        "_source": {"id": _id},
+    }
+    return item
 
 
 @fixture(autouse=True)
@@ -23,10 +57,71 @@ def set_es_settings(settings):
 
 
 def test_list_all_items(catalog_client: CatalogClient):
-    catalog_client.list_all_items()
-    catalog_client.client.search.assert_called_with(
-        index="catalog", body={"query": {"match_all": {}}, "size": 10000}
+    catalog_client.client.create_pit.return_value = {"pit_id": "pit-1"}
+    catalog_client.client.search.side_effect = [
+        {
+            "pit_id": "pit-2",
+            "hits": {
+                "hits": [
+                    {"_id": "project-2", "sort": [2, "project-2"]},
+                    {"_id": "project-1", "sort": [1, "project-1"]},
+                ]
+            },
+        },
+        {"pit_id": "pit-2", "hits": {"hits": [{"_id": "object-1", "sort": [0]}]}},
+    ]
+
+    items = list(catalog_client.list_all_items(page_size=2))
+
+    assert [item["_id"] for item in items] == ["project-2", "project-1", "object-1"]
+    catalog_client.client.create_pit.assert_called_once_with(
+        index="catalog", params={"keep_alive": "1m"}
     )
+    first_call, second_call = catalog_client.client.search.call_args_list
+    assert first_call.kwargs == {
+        "body": {
+            "query": {"match_all": {}},
+            "size": 2,
+            "sort": [{"created": {"order": "desc"}}, {"id": {"order": "desc"}}],
+            "pit": {"id": "pit-1", "keep_alive": "1m"},
+        }
+    }
+    assert second_call.kwargs["body"]["search_after"] == [1, "project-1"]
+    assert second_call.kwargs["body"]["pit"]["id"] == "pit-2"
+    catalog_client.client.delete_pit.assert_called_once_with(body={"pit_id": ["pit-2"]})
+
+
+def test_list_all_pages(catalog_client: CatalogClient):
+    catalog_client.client.create_pit.return_value = {"pit_id": "pit-1"}
+    catalog_client.client.search.return_value = {
+        "hits": {"total": {"value": 1, "relation": "eq"}, "hits": [{"_id": "a"}]}
+    }
+
+    pages = list(catalog_client.list_all_pages(page_size=2))
+
+    assert pages == [catalog_client.client.search.return_value]
+    catalog_client.client.delete_pit.assert_called_once_with(body={"pit_id": ["pit-1"]})
+
+
+def test_list_all_items_closes_point_in_time_on_error(
+    catalog_client: CatalogClient,
+):
+    catalog_client.client.create_pit.return_value = {"pit_id": "pit-1"}
+    catalog_client.client.search.side_effect = ConnectionError
+
+    with pytest.raises(ConnectionError):
+        list(catalog_client.list_all_items())
+
+    catalog_client.client.delete_pit.assert_called_once_with(body={"pit_id": ["pit-1"]})
+
+
+def test_search_on_point_in_time(catalog_client: CatalogClient):
+    catalog_client.search(pit_id="pit-1", search_after=[1, "project-1"])
+    catalog_client.search(pit_id="pit-1", search_after=[1, "project-1"])
+
+    # Not cached, and no index is targeted
+    assert catalog_client.client.search.call_count == 2
+    assert "index" not in catalog_client.client.search.call_args.kwargs
 
 
 def test_search(catalog_client: CatalogClient):
@@ -43,6 +138,7 @@ def test_search(catalog_client: CatalogClient):
 def test_aggregate_terms(catalog_client: CatalogClient):
     catalog_client.aggregate_terms("field", query="query", exclude=["exclude"])
     catalog_client.client.search.assert_called_with(
+        index="catalog",
         body={
             "size": 0,
             "aggs": {
@@ -54,13 +150,14 @@ def test_aggregate_terms(catalog_client: CatalogClient):
                     }
                 }
             },
-        }
+        },
     )
 
 
 def test_aggregate_date(catalog_client: CatalogClient):
     catalog_client.aggregate_date("field", "interval")
     catalog_client.client.search.assert_called_with(
+        index="catalog",
         body={
             "size": 0,
             "aggs": {
@@ -71,7 +168,7 @@ def test_aggregate_date(catalog_client: CatalogClient):
                     }
                 }
             },
-        }
+        },
     )
 
 
@@ -90,14 +187,26 @@ def test_index_from_projects(catalog_client: CatalogClient):
     run = lab_factories.RunFactory(project=project)
     run.run_object_groups.add(object_group)
 
-    with mock.patch(
-        "lab.elasticsearch.client.build_object_group_catalog_document"
-    ) as build_object_group_mock:
-        with mock.patch(
-            "lab.elasticsearch.client.build_project_catalog_document"
-        ) as build_project_group_mock:
-            catalog_client.index_from_projects(projects=[project])
+    with (
+        mock.patch(
+            "lab.elasticsearch.client.build_object_group_catalog_document",
+            return_value=_catalog_item("object"),
+        ) as build_object_group_mock,
+        mock.patch(
+            "lab.elasticsearch.client.build_project_catalog_document",
+            return_value=_catalog_item("project"),
+        ) as build_project_group_mock,
+        mock.patch(
+            "lab.elasticsearch.client.streaming_bulk",
+            side_effect=_fake_streaming_bulk(),
+        ),
+    ):
+        report = catalog_client.index_from_projects(projects=[project])
+
+    assert report.indexed == 2
+    assert report.failed_count == 0
 
+    objects = {object_group.id: list(object_group.object_set.order_by("id"))}
     build_project_group_mock.assert_called_once_with(
         project=project,
         materials=list(set(object_group.materials)),
@@ -111,6 +220,8 @@ def test_index_from_projects(catalog_client: CatalogClient):
         ],
         runs=[run],
         skip_eros=False,
+        objects=objects,
+        provider_object_groups={},
     )
 
     build_object_group_mock.assert_called_once_with(
@@ -119,4 +230,493 @@ def test_index_from_projects(catalog_client: CatalogClient):
         runs=[run],
         is_data_embargoed=run.is_data_embargoed,
         skip_eros=False,
+        leaders={project.id: project.leader},
+        objects=objects,
+        provider_object_groups={},
+        dating_parent_ids={},
+    )
+
+
+def test_bulk_index_streams_items(catalog_client: CatalogClient):
+    with mock.patch(
+        "lab.elasticsearch.client.streaming_bulk",
+        side_effect=_fake_streaming_bulk(),
+    ) as bulk_mock:
+        report = catalog_client.bulk_index(
+            _catalog_item(f"project-{i}") for i in range(3)
+        )
+
+    assert report.indexed == 3
+    assert not report.failed
+    bulk_mock.assert_called_once()
+    assert bulk_mock.call_args.kwargs["max_chunk_bytes"] == BULK_MAX_CHUNK_BYTES
+    assert bulk_mock.call_args.kwargs["raise_on_error"] is False
+
+
+def test_bulk_index_retries_transient_failures(catalog_client: CatalogClient):
+    with mock.patch(
+        "lab.elasticsearch.client.streaming_bulk",
+        side_effect=_fake_streaming_bulk(
+            {"project-1": [503, 201], "project-2": [429, 503]}
+        ),
+    ) as bulk_mock:
+        report = catalog_client.bulk_index(
+            _catalog_item(f"project-{i}") for i in range(3)
+        )
+
+    assert bulk_mock.call_count == 2
+    assert report.indexed == 2
+    assert [item["_id"] for item in report.failed] == ["project-2"]
+
+
+def test_bulk_index_does_not_retry_invalid_documents(catalog_client: CatalogClient):
+    with mock.patch(
+        "lab.elasticsearch.client.streaming_bulk",
+        side_effect=_fake_streaming_bulk({"project-0": [400]}),
+    ) as bulk_mock:
+        report = catalog_client.bulk_index([_catalog_item("project-0")])
+
+    bulk_mock.assert_called_once()
+    assert report.indexed == 0
+    assert report.failed[0]["status"] == 400
+
+
+def test_bulk_index_writes_to_given_index(catalog_client: CatalogClient):
+    sent_actions = []
+
+    def _streaming_bulk(client, actions, **kwargs):
+        actions = list(actions)
+        sent_actions.extend(actions)
+        return _fake_streaming_bulk()(client, actions, **kwargs)
+
+    with mock.patch(
+        "lab.elasticsearch.client.streaming_bulk", side_effect=_streaming_bulk
+    ):
+        catalog_client.bulk_index(
+            [_catalog_item("project-1")], index_name="catalog-20250101000000"
+        )
+
+    assert sent_actions[0]["_index"] == "catalog-20250101000000"
+
+
+def test_create_index_generation(catalog_client: CatalogClient):
+    with mock.patch("lab.elasticsearch.client.CatalogItem.init") as init_mock:
+        index_name = catalog_client.create_index_generation()
+
+    assert index_name.startswith("catalog-")
+    init_mock.assert_called_once_with(index=index_name, using=catalog_client.client)
+    catalog_client.client.indices.put_settings.assert_called_once_with(
+        index=index_name, body={"index": {"refresh_interval": "-1"}}
+    )
+
+
+def test_publish_index_generation_swaps_alias(catalog_client: CatalogClient):
+    indices = catalog_client.client.indices
+    indices.exists_alias.return_value = True
+    indices.get_alias.return_value = {"catalog-20250101000000": {}}
+    catalog_client.client.count.return_value = {"count": 10}
+
+    catalog_client.publish_index_generation("catalog-20250201000000", 10)
+
+    indices.refresh.assert_called_once_with(index="catalog-20250201000000")
+    indices.update_aliases.assert_called_once_with(
+        body={
+            "actions": [
+                {"remove": {"index": "catalog-20250101000000", "alias": "catalog"}},
+                {"add": {"index": "catalog-20250201000000", "alias": "catalog"}},
+            ]
+        }
+    )
+
+
+def test_publish_index_generation_replaces_legacy_index(
+    catalog_client: CatalogClient,
+):
+    indices = catalog_client.client.indices
+    indices.exists_alias.return_value = False
+    indices.exists.return_value = True
+    catalog_client.client.count.return_value = {"count": 10}
+
+    catalog_client.publish_index_generation("catalog-20250201000000", 10)
+
+    indices.update_aliases.assert_called_once_with(
+        body={
+            "actions": [
+                {"remove_index": {"index": "catalog"}},
+                {"add": {"index": "catalog-20250201000000", "alias": "catalog"}},
+            ]
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    ("new_count", "live_count", "expected_count"),
+    [(0, 0, 0), (8, 10, 10), (4, 10, 4)],
+)
+def test_publish_index_generation_sanity_check(
+    catalog_client: CatalogClient, new_count: int, live_count: int, expected_count: int
+):
+    indices = catalog_client.client.indices
+    indices.exists_alias.return_value = True
+    indices.get_alias.return_value = {"catalog-20250101000000": {}}
+    catalog_client.client.count.side_effect = [
+        {"count": new_count},
+        {"count": live_count},
+    ]
+
+    with pytest.raises(CatalogIndexError):
+        catalog_client.publish_index_generation(
+            "catalog-20250201000000", expected_count
+        )
+    indices.update_aliases.assert_not_called()
+
+
+def test_delete_old_index_generations(catalog_client: CatalogClient):
+    indices = catalog_client.client.indices
+    indices.exists_alias.return_value = True
+    indices.get_alias.return_value = {"catalog-4": {}}
+    indices.get.return_value = {
+        "catalog-1": {},
+        "catalog-2": {},
+        "catalog-3": {},
+        "catalog-4": {},
+    }
+
+    deleted = catalog_client.delete_old_index_generations(keep=2)
+
+    assert deleted == ["catalog-1"]
+    indices.delete.assert_called_once_with(index="catalog-1")
+
+
+@pytest.mark.django_db
+def test_index_changes_upserts_public_and_deletes_hidden_documents(
+    catalog_client: CatalogClient,
+):
+    public_project = lab_factories.FinishedProject()
+    lab_factories.ParticipationFactory(project=public_project, is_leader=True)
+    public_object_group = lab_factories.ObjectGroupFactory()
+    public_project.runs.first().run_object_groups.add(public_object_group)
+    confidential_project = lab_factories.FinishedProject(confidential=True)
+    lab_factories.ParticipationFactory(project=confidential_project, is_leader=True)
+    hidden_object_group = lab_factories.ObjectGroupFactory()
+    confidential_project.runs.first().run_object_groups.add(hidden_object_group)
+
+    with (
+        mock.patch(
+            "lab.elasticsearch.client.build_object_group_catalog_document",
+            side_effect=lambda object_group, **_: _catalog_item(
+                f"object-{object_group.id}"
+            ),
+        ) as build_object_group_mock,
+        mock.patch(
+            "lab.elasticsearch.client.build_project_catalog_document",
+            side_effect=lambda project, **_: _catalog_item(f"project-{project.id}"),
+        ) as build_project_mock,
+        mock.patch(
+            "lab.elasticsearch.client.streaming_bulk",
+            side_effect=_fake_streaming_bulk(),
+        ),
+    ):
+        report = catalog_client.index_changes(
+            project_ids={confidential_project.id},
+            object_group_ids={public_object_group.id, hidden_object_group.id},
+        )
+
+    build_project_mock.assert_not_called()
+    build_object_group_mock.assert_called_once()
+    assert build_object_group_mock.call_args.kwargs["object_group"] == (
+        public_object_group
+    )
+    assert build_object_group_mock.call_args.kwargs["projects"] == [public_project]
+    assert report.indexed == 1
+    assert report.deleted == 2
+    # Cached search responses are invalidated
+    catalog_client.client.indices.put_mapping.assert_called_once()
+    assert catalog_client.client.indices.put_mapping.call_args.kwargs["body"]["_meta"][
+        "updated_at"
+    ]
+
+
+def test_delete_documents_ignores_missing_documents(catalog_client: CatalogClient):
+    with mock.patch(
+        "lab.elasticsearch.client.streaming_bulk",
+        side_effect=_fake_streaming_bulk({"project-1": [404], "project-2": [500]}),
+    ):
+        report = catalog_client.delete_documents(["project-1", "project-2"])
+
+    assert report.deleted == 1
+    assert [item["_id"] for item in report.failed] == ["project-2"]
+
+
+def test_is_rebuild_in_progress(catalog_client: CatalogClient):
+    indices = catalog_client.client.indices
+    indices.exists_alias.return_value = True
+    indices.get_alias.return_value = {"catalog-2": {}}
+
+    indices.get.return_value = {"catalog-1": {}, "catalog-2": {}}
+    assert catalog_client.is_rebuild_in_progress() is False
+
+    indices.get.return_value = {"catalog-2": {}, "catalog-3": {}}
+    assert catalog_client.is_rebuild_in_progress() is True
+
+
+def _set_live_generation(catalog_client: CatalogClient, index: str, meta=None):
+    catalog_client.client.indices.get_mapping.return_value = {
+        index: {"mappings": {"_meta": meta or {}, "properties": {}}}
+    }
+
+
+def test_search_responses_are_cached(catalog_client: CatalogClient):
+    _set_live_generation(catalog_client, "catalog-1")
+    catalog_client.client.search.return_value = {"hits": {}}
+
+    assert catalog_client.search(q="vase", category="object") == {"hits": {}}
+    assert catalog_client.search(category="object", q="vase") == {"hits": {}}
+    catalog_client.aggregate_terms("materials")
+    catalog_client.aggregate_terms("materials", query=None)
+    catalog_client.aggregate_date("created", "year")
+    catalog_client.aggregate_date("created", "year")
+
+    assert catalog_client.client.search.call_count == 3
+    assert catalog_client.response_cache.hits == 3
+    assert catalog_client.response_cache.misses == 3
+    # The generation is not looked up on every call
+    catalog_client.client.indices.get_mapping.assert_called_once()
+
+
+@mock.patch("lab.elasticsearch.client.time.monotonic")
+def test_search_cache_is_invalidated_by_new_generation(
+    monotonic_mock: mock.MagicMock, catalog_client: CatalogClient
+):
+    monotonic_mock.return_value = 1000
+    _set_live_generation(catalog_client, "catalog-1")
+    catalog_client.aggregate_terms("materials")
+
+    # A rebuild published a new generation
+    _set_live_generation(catalog_client, "catalog-2")
+    catalog_client.aggregate_terms("materials")
+    monotonic_mock.return_value = 1031
+    catalog_client.aggregate_terms("materials")
+
+    # An incremental indexing run updated the live generation
+    _set_live_generation(catalog_client, "catalog-2", {"updated_at": "2026-10-18"})
+    monotonic_mock.return_value = 1062
+    catalog_client.aggregate_terms("materials")
+
+    assert catalog_client.client.search.call_count == 3
+    assert catalog_client.response_cache.stats()["entries"] == 1
+
+
+def test_search_is_not_cached_without_catalog(catalog_client: CatalogClient):
+    catalog_client.client.indices.get_mapping.side_effect = NotFoundError(
+        404, "index_not_found_exception", {}
+    )
+
+    catalog_client.aggregate_date("created", "year")
+    catalog_client.aggregate_date("created", "year")
+
+    assert catalog_client.client.search.call_count == 2
+    assert catalog_client.response_cache.stats()["entries"] == 0
+
+
+def test_aggregate_facets(catalog_client: CatalogClient):
+    _set_live_generation(catalog_client, "catalog-1")
+    catalog_client.client.search.return_value = {
+        "hits": {"total": {"value": 3}},
+        "aggregations": {
+            "materials": {"doc_count": 3, "materials": {"buckets": ["or"]}},
+            "created": {"doc_count": 2, "created": {"buckets": ["2024"]}},
+        },
+    }
+
+    response = catalog_client.aggregate_facets(
+        ["materials", "created"], category="object"
+    )
+    catalog_client.aggregate_facets(["materials", "created"], category="object")
+
+    assert response == {
+        "hits": {"total": {"value": 3}},
+        "aggregations": {
+            "materials": {"buckets": ["or"]},
+            "created": {"buckets": ["2024"]},
+        },
+    }
+    catalog_client.client.search.assert_called_once_with(
+        index="catalog",
+        body=queries.facets_query(["materials", "created"], {"category": "object"}),
+    )
+
+
+def test_aggregate_geo_clusters(catalog_client: CatalogClient):
+    _set_live_generation(catalog_client, "catalog-1")
+    catalog_client.client.search.return_value = {
+        "aggregations": {
+            "clusters": {
+                "buckets": [
+                    {
+                        "key": "8/129/88",
+                        "doc_count": 12,
+                        "centroid": {
+                            "location": {"lat": 48.85, "lon": 2.35},
+                            "count": 15,
+                        },
+                    }
+                ]
+            }
+        }
+    }
+
+    clusters = catalog_client.aggregate_geo_clusters(5, category="object")
+
+    assert clusters == [
+        {"key": "8/129/88", "count": 12, "centroid": {"lat": 48.85, "lon": 2.35}}
+    ]
+    catalog_client.client.search.assert_called_once_with(
+        index="catalog",
+        body=queries.geo_clusters_query(5, {"category": "object"}),
+    )
+
+
+def test_suggest(catalog_client: CatalogClient):
+    catalog_client.client.search.return_value = {
+        "hits": {"hits": [{"_source": {"value": "terre cuite", "count": 4}}]}
+    }
+
+    assert catalog_client.suggest("materials", "ter") == [
+        {"value": "terre cuite", "count": 4}
+    ]
+    catalog_client.client.search.assert_called_once_with(
+        index="catalog_suggestions",
+        body=queries.suggestion_query("materials", "ter", 10),
+    )
+
+
+def test_suggest_before_first_indexing(catalog_client: CatalogClient):
+    catalog_client.client.search.side_effect = NotFoundError(
+        404, "index_not_found_exception", {}
+    )
+
+    assert not catalog_client.suggest("materials", "ter")
+
+
+@mock.patch("lab.elasticsearch.client.SuggestionItem.init")
+@mock.patch("lab.elasticsearch.client.BULK_CHUNK_SIZE", 2)
+def test_rebuild_suggestions(_, catalog_client: CatalogClient):
+    def _search(index, body):
+        assert index == "catalog"
+        composite = body["aggs"]["values"]["composite"]
+        field = composite["sources"][0]["value"]["terms"]["field"]
+        pages = {
+            "materials": [["or", "argent"], ["terre"]],
+            "name.raw": [["Vase"]],
+        }.get(field, [[]])
+        page = pages[1 if composite.get("after") else 0]
+        return {
+            "aggregations": {
+                "values": {
+                    "buckets": [
+                        {"key": {"value": value}, "doc_count": 1} for value in page
+                    ],
+                    "after_key": {"value": page[-1]} if page else None,
+                }
+            }
+        }
+
+    catalog_client.client.search.side_effect = _search
+    catalog_client.client.indices.exists_alias.return_value = True
+    catalog_client.client.indices.get_alias.return_value = {"catalog_suggestions-1": {}}
+    actions: list[dict] = []
+
+    def _streaming_bulk(client, bulk_actions, **kwargs):
+        bulk_actions = list(bulk_actions)
+        actions.extend(bulk_actions)
+        return _fake_streaming_bulk()(client, bulk_actions, **kwargs)
+
+    with mock.patch(
+        "lab.elasticsearch.client.streaming_bulk", side_effect=_streaming_bulk
+    ):
+        assert catalog_client.rebuild_suggestions() == 4
+
+    assert [
+        (action["_source"]["field"], action["_source"]["value"]) for action in actions
+    ] == [
+        ("materials", "or"),
+        ("materials", "argent"),
+        ("materials", "terre"),
+        ("name", "Vase"),
+    ]
+    new_index = actions[0]["_index"]
+    assert new_index.startswith("catalog_suggestions-")
+    catalog_client.client.indices.update_aliases.assert_called_once_with(
+        body={
+            "actions": [
+                {
+                    "remove": {
+                        "index": "catalog_suggestions-1",
+                        "alias": "catalog_suggestions",
+                    }
+                },
+                {"add": {"index": new_index, "alias": "catalog_suggestions"}},
+            ]
+        }
+    )
+    catalog_client.client.indices.delete.assert_called_once_with(
+        index="catalog_suggestions-1"
+    )
+
+
+@pytest.mark.django_db
+def test_index_project_range_indexes_shared_object_groups_once(
+    catalog_client: CatalogClient,
+):
+    projects = sorted(
+        (lab_factories.FinishedProject() for _ in range(3)),
+        key=lambda project: project.id,
+    )
+    for project in projects:
+        lab_factories.ParticipationFactory(project=project, is_leader=True)
+    shared_object_group = lab_factories.ObjectGroupFactory()
+    projects[0].runs.first().run_object_groups.add(shared_object_group)
+    projects[2].runs.first().run_object_groups.add(shared_object_group)
+
+    with (
+        mock.patch(
+            "lab.elasticsearch.client.build_object_group_catalog_document",
+            side_effect=lambda object_group, **_: _catalog_item(
+                f"object-{object_group.id}"
+            ),
+        ) as build_object_group_mock,
+        mock.patch(
+            "lab.elasticsearch.client.build_project_catalog_document",
+            side_effect=lambda project, **_: _catalog_item(f"project-{project.id}"),
+        ) as build_project_mock,
+        mock.patch(
+            "lab.elasticsearch.client.streaming_bulk",
+            side_effect=_fake_streaming_bulk(),
+        ),
+    ):
+        first_report = catalog_client.index_project_range(
+            projects[0].id, projects[1].id, index_name="catalog-1"
+        )
+        first_built_projects = [
+            call.kwargs["project"] for call in build_project_mock.call_args_list
+        ]
+        build_project_mock.reset_mock()
+        second_report = catalog_client.index_project_range(
+            projects[2].id, projects[2].id, index_name="catalog-1"
+        )
+
+    assert set(first_built_projects) == {projects[0], projects[1]}
+    build_project_mock.assert_called_once()
+    assert build_project_mock.call_args.kwargs["project"] == projects[2]
+    # Built once, by the range of its lowest project id, from all its projects
+    build_object_group_mock.assert_called_once()
+    assert build_object_group_mock.call_args.kwargs["object_group"] == (
+        shared_object_group
     )
+    assert set(build_object_group_mock.call_args.kwargs["projects"]) == {
+        projects[0],
+        projects[2],
+    }
+    assert first_report.indexed == 3
+    assert second_report.indexed == 1
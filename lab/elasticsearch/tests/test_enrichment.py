@@ -0,0 +1,109 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from lab.objects import ObjectProviderError
+from lab.tests import factories
+
+from ..catalog import build_object_group_catalog_document
+from ..enrichment import fetch_provider_object_groups
+
+
+def _eros_object_group(provider_object_id: str):
+    return factories.ExternalObjectReferenceFactory(
+        provider_name="eros", provider_object_id=provider_object_id
+    ).object_group
+
+
+def _fetch_full_objectgroup(_provider_name, object_id, object_group):
+    object_group.label = f"EROS {object_id}"
+    return object_group
+
+
+@pytest.mark.django_db
+@mock.patch(
+    "lab.elasticsearch.catalog.fetch_full_objectgroup",
+    side_effect=_fetch_full_objectgroup,
+)
+def test_fetch_provider_object_groups(fetch_mock: mock.MagicMock):
+    eros_object_group = _eros_object_group("C2RMF1")
+    pop_object_group = factories.ExternalObjectReferenceFactory(
+        provider_name="pop", provider_object_id="123"
+    ).object_group
+    local_object_group = factories.ObjectGroupFactory()
+
+    result = fetch_provider_object_groups(
+        [eros_object_group, pop_object_group, local_object_group]
+    )
+
+    fetch_mock.assert_called_once()
+    assert list(result) == [eros_object_group.id]
+    assert result[eros_object_group.id].label == "EROS C2RMF1"
+    # Instances shared with the rest of the indexing are not modified
+    assert eros_object_group.label != "EROS C2RMF1"
+
+
+@pytest.mark.django_db
+def test_fetch_provider_object_groups_limits_concurrency():
+    object_groups = [_eros_object_group(f"C2RMF{i}") for i in range(6)]
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def _slow_fetch(*args):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return _fetch_full_objectgroup(*args)
+
+    with (
+        mock.patch(
+            "lab.elasticsearch.catalog.fetch_full_objectgroup",
+            side_effect=_slow_fetch,
+        ),
+        mock.patch.dict(
+            "lab.elasticsearch.enrichment.PROVIDER_CONCURRENCY", {"eros": 2}
+        ),
+    ):
+        result = fetch_provider_object_groups(object_groups)
+
+    assert len(result) == 6
+    assert max_running == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("error", [ObjectProviderError, TimeoutError])
+def test_fetch_provider_object_groups_falls_back_to_local_data(error):
+    object_group = _eros_object_group("C2RMF1")
+
+    with mock.patch(
+        "lab.elasticsearch.catalog.fetch_full_objectgroup", side_effect=error
+    ):
+        result = fetch_provider_object_groups([object_group])
+
+    assert result[object_group.id].label == object_group.label
+
+
+@pytest.mark.django_db
+@mock.patch("lab.elasticsearch.catalog.fetch_full_objectgroup")
+def test_build_document_uses_prefetched_provider_data(fetch_mock: mock.MagicMock):
+    object_group = _eros_object_group("C2RMF1")
+    enriched = _fetch_full_objectgroup("eros", "C2RMF1", factories.ObjectGroupFactory())
+    enriched.id = object_group.id
+
+    document = build_object_group_catalog_document(
+        object_group=object_group,
+        runs=[],
+        projects=[],
+        is_data_embargoed=True,
+        provider_object_groups={object_group.id: enriched},
+    )
+
+    fetch_mock.assert_not_called()
+    assert document.name == "EROS C2RMF1"
@@ -0,0 +1,88 @@
+from unittest import mock
+
+import pytest
+
+from lab.models import Project
+
+from .. import instrumentation
+from ..instrumentation import IndexingStats, collect_stats
+
+
+def _clock(*values: float):
+    return mock.patch(
+        "lab.elasticsearch.instrumentation.time.perf_counter",
+        side_effect=list(values),
+    )
+
+
+def test_phase_and_count_are_noops_when_not_collecting():
+    with instrumentation.phase("build"):
+        instrumentation.count("documents_indexed")
+    instrumentation.count_json_bytes("bulk_bytes", {"a": 1})
+    instrumentation.merge(IndexingStats(counters={"sql_queries": 1}))
+
+    assert not instrumentation.is_collecting()
+
+
+def test_nested_phases_are_exclusive():
+    # start, other starts, other paused, build starts, build paused,
+    # transport starts, transport ends, build resumes, build ends, other
+    # resumes, other ends, wall time
+    with _clock(0, 0, 1, 1, 3, 3, 6, 6, 7, 7, 10, 10):
+        with collect_stats() as stats:
+            with instrumentation.phase("build"):
+                with instrumentation.phase("transport"):
+                    pass
+
+    assert stats.phases == {"other": 4, "build": 3, "transport": 3}
+    assert stats.wall_time == 10
+
+
+def test_counters():
+    with collect_stats() as stats:
+        instrumentation.count("eros_calls", 3)
+        instrumentation.count("eros_calls")
+        instrumentation.count_json_bytes("bulk_bytes", {"a": 1})
+
+    assert stats.counters == {"eros_calls": 4, "bulk_bytes": 8}
+
+
+@pytest.mark.django_db
+def test_sql_queries_are_counted():
+    with collect_stats() as stats:
+        with instrumentation.phase("load"):
+            list(Project.objects.all())
+            list(Project.objects.all())
+
+    assert stats.counters["sql_queries"] == 2
+    assert stats.phases["sql"] > 0
+
+
+def test_next_batch_splits_phase_times():
+    with collect_stats() as stats:
+        with instrumentation.phase("load"):
+            pass
+        instrumentation.next_batch()
+        with instrumentation.phase("build"):
+            pass
+
+    assert len(stats.batches) == 2
+    assert set(stats.batches[0]) == {"other", "load"}
+    assert "load" not in stats.batches[1]
+    assert "build" in stats.batches[1]
+
+
+def test_merge_adds_stats_of_workers():
+    with collect_stats() as stats:
+        instrumentation.count("sql_queries", 2)
+        instrumentation.merge(
+            IndexingStats(
+                phases={"build": 2.5},
+                counters={"sql_queries": 3},
+                batches=[{"build": 2.5}],
+            )
+        )
+
+    assert stats.phases["build"] == 2.5
+    assert stats.counters["sql_queries"] == 5
+    assert {"build": 2.5} in stats.batches
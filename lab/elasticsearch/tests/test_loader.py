@@ -0,0 +1,108 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from lab.objects.models import ObjectGroupThumbnail
+from lab.tests import factories
+from lab.thesauri.models import ConceptHierarchy, Period
+
+from ..catalog import (
+    build_object_group_catalog_document,
+    build_project_catalog_document,
+)
+from ..loader import iter_catalog_batches, load_catalog_data
+
+
+def _create_project(with_thumbnails: bool = True):
+    project = factories.ProjectWithLeaderFactory()
+    run = factories.RunFactory(project=project)
+    for _ in range(2):
+        period = factories.PeriodFactory(concept_id=f"period-{uuid.uuid4()}")
+        ConceptHierarchy.objects.create(
+            theso_id=Period.OPENTHESO_THESO_ID,
+            concept_id=period.concept_id,
+            parent_ids=["parent"],
+            fetched_at=timezone.now(),
+        )
+        object_group = factories.ObjectGroupFactory(
+            dating_period=period,
+            discovery_place_location=factories.LocationFactory(),
+        )
+        factories.ObjectFactory.create_batch(2, group=object_group)
+        if with_thumbnails:
+            ObjectGroupThumbnail.objects.create(
+                object_group=object_group, image="image.png"
+            )
+        run.run_object_groups.add(object_group)
+    return project
+
+
+@pytest.mark.django_db
+def test_load_catalog_data_uses_constant_number_of_queries():
+    projects = [_create_project() for _ in range(3)]
+
+    with CaptureQueriesContext(connection) as context:
+        data = load_catalog_data(projects)
+
+    assert len(context.captured_queries) == 5
+    for project in projects:
+        assert data.leaders[project.id] == project.leader
+        assert data.runs[project.id] == list(project.runs.all())
+        for run in data.runs[project.id]:
+            object_groups = data.object_groups[run.id]
+            assert set(object_groups) == set(run.run_object_groups.all())
+            for object_group in object_groups:
+                assert data.objects[object_group.id] == list(
+                    object_group.object_set.order_by("id")
+                )
+                assert data.dating_parent_ids[
+                    (Period.OPENTHESO_THESO_ID, object_group.dating_period.concept_id)
+                ] == ["parent"]
+
+
+@pytest.mark.django_db
+def test_build_documents_from_loaded_data_does_not_query():
+    # Thumbnail URLs need the object storage: only missing thumbnails are tested
+    project = _create_project(with_thumbnails=False)
+    data = load_catalog_data([project])
+    runs = data.runs[project.id]
+    object_groups = data.object_groups[runs[0].id]
+
+    with CaptureQueriesContext(connection) as context:
+        build_project_catalog_document(
+            project=project,
+            materials=[],
+            leader=data.leaders[project.id],
+            object_groups=object_groups,
+            object_group_locations=[],
+            runs=runs,
+            objects=data.objects,
+        ).to_dict()
+        for object_group in object_groups:
+            build_object_group_catalog_document(
+                object_group=object_group,
+                projects=[project],
+                runs=runs,
+                is_data_embargoed=True,
+                leaders=data.leaders,
+                objects=data.objects,
+                dating_parent_ids=data.dating_parent_ids,
+            ).to_dict()
+
+    assert not context.captured_queries
+
+
+@pytest.mark.django_db
+def test_iter_catalog_batches():
+    projects = [factories.ProjectFactory() for _ in range(5)]
+
+    batches = list(iter_catalog_batches(projects, batch_size=2))
+
+    assert [batch for batch, _ in batches] == [
+        projects[0:2],
+        projects[2:4],
+        projects[4:5],
+    ]
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+from lab.tests import factories
+
+from ..client import BulkIndexReport
+from ..instrumentation import IndexingStats, collect_stats
+from ..parallel import get_project_id_ranges, index_in_parallel
+
+
+class _ThreadExecutor(ThreadPoolExecutor):
+    """Runs workers in threads, worker processes would not see the test
+    database."""
+
+    def __init__(self, max_workers, **_):
+        super().__init__(max_workers=max_workers)
+
+
+def _create_catalog_project():
+    project = factories.FinishedProject()
+    factories.ParticipationFactory(project=project, is_leader=True)
+    return project
+
+
+@pytest.mark.django_db
+def test_get_project_id_ranges():
+    project_ids = sorted(_create_catalog_project().id for _ in range(5))
+    factories.ProjectFactory()  # not in the catalog
+
+    assert get_project_id_ranges(2) == [
+        (project_ids[0], project_ids[2]),
+        (project_ids[3], project_ids[4]),
+    ]
+    assert get_project_id_ranges(10) == [
+        (project_id, project_id) for project_id in project_ids
+    ]
+
+
+@pytest.mark.django_db
+def test_get_project_id_ranges_without_projects():
+    assert not get_project_id_ranges(4)
+
+
+@mock.patch("lab.elasticsearch.parallel.ProcessPoolExecutor", _ThreadExecutor)
+@mock.patch(
+    "lab.elasticsearch.parallel.get_project_id_ranges",
+    return_value=[(1, 10), (11, 20)],
+)
+@mock.patch("lab.elasticsearch.parallel.index_project_range")
+def test_index_in_parallel(
+    index_project_range_mock: mock.MagicMock, get_ranges_mock: mock.MagicMock
+):
+    index_project_range_mock.side_effect = [
+        (
+            BulkIndexReport(indexed=10, failed=[{"_id": "project-3"}]),
+            IndexingStats(phases={"build": 2}, counters={"sql_queries": 4}),
+        ),
+        (
+            BulkIndexReport(indexed=5),
+            IndexingStats(phases={"build": 1}, counters={"sql_queries": 4}),
+        ),
+    ]
+
+    with collect_stats() as stats:
+        report = index_in_parallel(2, "catalog-1", skip_eros=True)
+
+    get_ranges_mock.assert_called_once_with(2)
+    index_project_range_mock.assert_has_calls(
+        [
+            mock.call(1, 10, True, "catalog-1"),
+            mock.call(11, 20, True, "catalog-1"),
+        ],
+        any_order=True,
+    )
+    assert report.indexed == 15
+    assert report.failed == [{"_id": "project-3"}]
+    # Stats of the workers are collected
+    assert stats.phases["build"] == 3
+    assert stats.counters["sql_queries"] == 8
@@ -1,6 +1,9 @@
 from unittest import mock
 
+import pytest
+
 from .. import queries
+from ..documents import CatalogItem
 from ._mock import BASE_SEARCH_PARAMS, BASE_SEARCH_PARAMS_RELATED_QUERY
 
 
@@ -51,3 +54,178 @@ def test_filter_query():
     with mock.patch("lab.elasticsearch.queries.Query.build_query") as mock_build_query:
         queries.filter_query({"size": 50, "from": 40, "sort": "desc"})
         mock_build_query.assert_called_with({}, size=50, _from=40, sort="desc")
+
+
+def test_filter_query_with_search_after():
+    query = queries.filter_query(
+        {
+            "category": "object",
+            "size": 20,
+            "sort": "asc",
+            "search_after": ["2021-01-01T00:00:00", "object-1"],
+        }
+    )
+
+    assert query["sort"] == [
+        {"created": {"order": "asc"}},
+        {"id": {"order": "asc"}},
+    ]
+    assert query["search_after"] == ["2021-01-01T00:00:00", "object-1"]
+    assert query["size"] == 20
+    assert "from" not in query
+    assert "pit" not in query
+
+
+def test_filter_query_first_cursor_page_on_point_in_time():
+    query = queries.filter_query({"search_after": [], "pit_id": "pit"})
+
+    assert "search_after" not in query
+    assert query["pit"] == {"id": "pit", "keep_alive": "1m"}
+    assert query["sort"] == [
+        {"created": {"order": "desc"}},
+        {"id": {"order": "desc"}},
+    ]
+
+
+def test_facets_query():
+    query = queries.facets_query(
+        ["materials", "category", "created"],
+        {"q": "vase", "materials": ["or"], "category": "object", "size": 10},
+    )
+
+    materials_filter = {"terms": {"materials": ["or"]}}
+    category_filter = {"term": {"category": "object"}}
+    assert query["size"] == 0
+    # Filters not related to a facet apply to every facet
+    assert query["query"] == {
+        "bool": {"filter": [], "must": [queries.search_box_query("vase")]}
+    }
+    # A facet is not filtered on its own field
+    assert query["aggs"]["materials"] == {
+        "filter": {"bool": {"filter": [category_filter], "must": []}},
+        "aggs": {"materials": {"terms": {"field": "materials"}}},
+    }
+    assert query["aggs"]["category"] == {
+        "filter": {"bool": {"filter": [], "must": [materials_filter]}},
+        "aggs": {"category": {"terms": {"field": "category"}}},
+    }
+    assert query["aggs"]["created"] == {
+        "filter": {"bool": {"filter": [category_filter], "must": [materials_filter]}},
+        "aggs": {
+            "created": {
+                "date_histogram": {"field": "created", "calendar_interval": "year"}
+            }
+        },
+    }
+    # Hits are filtered by all the filters
+    assert query["post_filter"] == {
+        "bool": {"filter": [category_filter], "must": [materials_filter]}
+    }
+
+
+def test_facets_query_without_filters():
+    query = queries.facets_query(["materials"], {})
+
+    assert query == {
+        "size": 0,
+        "query": {"match_all": {}},
+        "aggs": {
+            "materials": {
+                "filter": {"match_all": {}},
+                "aggs": {"materials": {"terms": {"field": "materials"}}},
+            }
+        },
+    }
+
+
+def test_facets_query_aggregates_collection_keywords():
+    query = queries.facets_query(["collection"], {"collection": "louvre"})
+
+    assert query["aggs"]["collection"]["aggs"] == {
+        "collection": {"terms": {"field": "collections"}}
+    }
+    assert query["post_filter"] == queries.Query().build_filter(
+        {"collection": "louvre"}
+    )
+
+
+@pytest.mark.parametrize("facet", list(queries.FACET_PARAMS))
+def test_facets_query_aggregates_aggregatable_fields(facet: str):
+    aggregation = queries.facets_query([facet], {})["aggs"][facet]["aggs"][facet]
+    (field,) = {agg["field"] for agg in aggregation.values()}
+
+    # Text fields have no fielddata: OpenSearch rejects their aggregation
+    mapping = CatalogItem._doc_type.mapping  # pylint: disable=protected-access
+    assert mapping.resolve_field(field).to_dict()["type"] in (
+        "keyword",
+        "date",
+        "boolean",
+    )
+
+
+@pytest.mark.parametrize("projection", ["card", "map"])
+def test_filter_query_with_projection(projection):
+    query = queries.filter_query({"q": "vase", "projection": projection})
+
+    assert query["_source"] == queries.SOURCE_PROJECTIONS[projection]
+    assert "project_page_data" not in query["_source"]["includes"]
+    assert "object_page_data" not in query["_source"]["includes"]
+
+
+def test_filter_query_full_projection_returns_whole_documents():
+    assert "_source" not in queries.filter_query({"projection": "full"})
+    assert "_source" not in queries.filter_query({})
+
+
+def test_filter_query_with_unknown_projection():
+    with pytest.raises(ValueError):
+        queries.filter_query({"projection": "unknown"})  # type: ignore[typeddict-item]
+
+
+def test_geo_clusters_query():
+    location = {
+        "top_left": {"lat": 50.0, "lon": 1.0},
+        "bottom_right": {"lat": 45.0, "lon": 5.0},
+    }
+    query = queries.geo_clusters_query(
+        5, {"category": "object", "location": location, "size": 20}  # type: ignore
+    )
+
+    assert query["size"] == 0
+    assert query["query"] == {
+        "bool": {
+            "filter": [{"term": {"category": "object"}}],
+            "must": [{"geo_bounding_box": {"discovery_place_points": location}}],
+        }
+    }
+    assert query["aggs"]["clusters"] == {
+        "geotile_grid": {
+            "field": "discovery_place_points",
+            "precision": 8,
+            "size": queries.MAX_GEO_CLUSTERS,
+            "bounds": location,
+        },
+        "aggs": {"centroid": {"geo_centroid": {"field": "discovery_place_points"}}},
+    }
+
+
+def test_geo_clusters_query_precision_is_bounded():
+    query = queries.geo_clusters_query(28, {})
+
+    assert query["query"] == {"match_all": {}}
+    assert query["aggs"]["clusters"]["geotile_grid"]["precision"] == 29
+    assert "bounds" not in query["aggs"]["clusters"]["geotile_grid"]
+
+
+def test_suggestion_query():
+    assert queries.suggestion_query("materials", "ter cu", 5) == {
+        "size": 5,
+        "query": {
+            "bool": {
+                "filter": [{"term": {"field": "materials"}}],
+                "must": [{"match": {"value": {"query": "ter cu", "operator": "and"}}}],
+            }
+        },
+        "sort": ["_score", {"count": {"order": "desc"}}],
+        "_source": ["value", "count"],
+    }
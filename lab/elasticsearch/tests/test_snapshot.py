@@ -0,0 +1,120 @@
+import gzip
+import json
+from unittest import mock
+
+from .. import queries, snapshot
+from ..documents import CatalogItem
+from ..snapshot import MANIFEST_FILE_NAME, export_snapshot
+
+
+def _hit(_id: str, **source):
+    return {"_id": _id, "_source": {"id": _id, "category": "project", **source}}
+
+
+def _catalog_client(hits: list[dict]):
+    client = mock.MagicMock()
+    client.list_all_items.side_effect = lambda: iter(hits)
+    client.aggregate_facets.return_value = {
+        "aggregations": {"materials": {"buckets": [{"key": "gold"}]}}
+    }
+    client.get_index_generation.return_value = "catalog-1@None"
+    return client
+
+
+def _read(path):
+    return json.loads(gzip.decompress(path.read_bytes()))
+
+
+def test_export_snapshot(tmp_path):
+    hits = [
+        _hit("project-1", name="Vase", comments="long comments"),
+        _hit("project-2", name="Bowl", project_page_data={"leader": "A", "x": 1}),
+    ]
+
+    report = export_snapshot(tmp_path, _catalog_client(hits))
+
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text())
+    assert report.items == 2
+    assert report.written == 4
+    assert manifest["generation"] == "catalog-1@None"
+    assert _read(tmp_path / manifest["items"]["project-1"]) == hits[0]
+    assert _read(tmp_path / manifest["listings"][0]) == [
+        {
+            "_id": "project-1",
+            "_source": {"id": "project-1", "category": "project", "name": "Vase"},
+        },
+        {
+            "_id": "project-2",
+            "_source": {
+                "id": "project-2",
+                "category": "project",
+                "name": "Bowl",
+                "project_page_data": {"leader": "A"},
+            },
+        },
+    ]
+    assert _read(tmp_path / manifest["facets"]) == {
+        "materials": {"buckets": [{"key": "gold"}]}
+    }
+
+
+def test_export_snapshot_aggregates_mapped_fields(tmp_path):
+    catalog_client = _catalog_client([])
+
+    export_snapshot(tmp_path, catalog_client)
+
+    (fields,) = catalog_client.aggregate_facets.call_args.args
+    query = queries.facets_query(fields, {})
+    mapping = CatalogItem._doc_type.mapping  # pylint: disable=protected-access
+    for facet in fields:
+        for aggregation in query["aggs"][facet]["aggs"][facet].values():
+            # Text fields have no fielddata: OpenSearch rejects their aggregation
+            assert mapping.resolve_field(aggregation["field"]).to_dict()["type"] in (
+                "keyword",
+                "date",
+                "boolean",
+            )
+
+
+def test_export_snapshot_shards_listings(tmp_path):
+    hits = [_hit(f"project-{index}") for index in range(5)]
+
+    with mock.patch.object(snapshot, "SNAPSHOT_LISTING_SHARD_SIZE", 2):
+        export_snapshot(tmp_path, _catalog_client(hits))
+
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text())
+    assert [len(_read(tmp_path / path)) for path in manifest["listings"]] == [
+        2,
+        2,
+        1,
+    ]
+
+
+def test_export_snapshot_only_writes_changed_files(tmp_path):
+    export_snapshot(tmp_path, _catalog_client([_hit("project-1"), _hit("project-2")]))
+    first_manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text())
+
+    report = export_snapshot(
+        tmp_path, _catalog_client([_hit("project-1"), _hit("project-2", name="B")])
+    )
+
+    manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text())
+    # New project-2 document and listing shard
+    assert report.written == 2
+    assert manifest["items"]["project-1"] == first_manifest["items"]["project-1"]
+    assert manifest["items"]["project-2"] != first_manifest["items"]["project-2"]
+    # Files of the previous manifest are kept
+    assert (tmp_path / first_manifest["items"]["project-2"]).exists()
+    assert report.deleted == 0
+
+
+def test_export_snapshot_deletes_files_of_older_manifests(tmp_path):
+    export_snapshot(tmp_path, _catalog_client([_hit("project-1")]))
+    first_manifest = json.loads((tmp_path / MANIFEST_FILE_NAME).read_text())
+    export_snapshot(tmp_path, _catalog_client([_hit("project-1", name="A")]))
+
+    report = export_snapshot(tmp_path, _catalog_client([_hit("project-1", name="B")]))
+
+    # Document & listing shard of the first export
+    assert report.deleted == 2
+    assert not (tmp_path / first_manifest["items"]["project-1"]).exists()
@@ -0,0 +1,116 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from lab.objects.models import ObjectGroupThumbnail, RunObjectGroup
+from lab.tests import factories
+
+from ..models import CatalogDirtyDocument
+from ..tracking import (
+    clear_dirty_documents,
+    get_dirty_documents,
+    mark_documents_dirty,
+)
+
+
+def _dirty_documents() -> tuple[set[int], set[int]]:
+    documents = get_dirty_documents()
+    return documents.project_ids, documents.object_group_ids
+
+
+@pytest.fixture(name="run_with_object_group")
+def run_with_object_group_fixture():
+    run = factories.RunFactory()
+    object_group = factories.ObjectGroupFactory()
+    run.run_object_groups.add(object_group)
+    CatalogDirtyDocument.objects.all().delete()
+    return run, object_group
+
+
+@pytest.mark.django_db
+def test_project_change_marks_project_and_object_groups(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    run.project.save()
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_run_change_marks_project_and_object_groups(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    run.embargo_date = datetime.date(2020, 1, 1)
+    run.save()
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_leader_change_marks_project(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    factories.ParticipationFactory(project=run.project, is_leader=True)
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_object_change_marks_object_group_and_projects(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    factories.ObjectFactory(group=object_group)
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_thumbnail_change_marks_object_group_and_projects(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    ObjectGroupThumbnail.objects.create(object_group=object_group, image="image.png")
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_removing_object_group_from_run_marks_both(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    run.run_object_groups.remove(object_group)
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_clearing_object_group_runs_marks_both(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    object_group.runs.clear()
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_deleting_run_object_group_marks_both(run_with_object_group):
+    run, object_group = run_with_object_group
+
+    RunObjectGroup.objects.get(run=run, objectgroup=object_group).delete()
+
+    assert _dirty_documents() == ({run.project.id}, {object_group.id})
+
+
+@pytest.mark.django_db
+def test_clear_dirty_documents_keeps_marks_committed_after_read():
+    mark_documents_dirty(["project-1", "object-2"])
+    documents = get_dirty_documents()
+    # Marked again, or marked by a transaction committed after the read
+    mark_documents_dirty(["object-2", "project-3"])
+    CatalogDirtyDocument.objects.filter(category="project", object_id=3).update(
+        marked_at=timezone.now() - datetime.timedelta(hours=1)
+    )
+
+    clear_dirty_documents(documents)
+
+    assert _dirty_documents() == ({3}, {2})
@@ -0,0 +1,113 @@
+"""Change tracking of catalog documents, used by incremental indexing.
+
+Project documents embed their object groups and object group documents embed
+their projects, so a change on one side marks the other side dirty too."""
+
+import dataclasses
+import datetime
+import itertools
+from typing import Iterable
+
+from django.db.models import Q
+from django.utils import timezone
+
+from lab.objects.models import RunObjectGroup
+
+from .models import CatalogDirtyDocument
+
+# Number of marks deleted by a single query
+CLEAR_CHUNK_SIZE = 500
+
+
+@dataclasses.dataclass
+class DirtyDocuments:
+    project_ids: set[int] = dataclasses.field(default_factory=set)
+    object_group_ids: set[int] = dataclasses.field(default_factory=set)
+    # Ids of the marks read, by their marked_at, see clear_dirty_documents
+    mark_ids: dict[datetime.datetime, list[int]] = dataclasses.field(
+        default_factory=dict
+    )
+
+
+def mark_projects_dirty(project_ids: Iterable[int | None]):
+    """Mark project documents and the documents of their object groups."""
+    ids = {project_id for project_id in project_ids if project_id is not None}
+    if not ids:
+        return
+    object_group_ids = RunObjectGroup.objects.filter(
+        run__project_id__in=ids
+    ).values_list("objectgroup_id", flat=True)
+    _mark(CatalogDirtyDocument.Category.PROJECT, ids)
+    _mark(CatalogDirtyDocument.Category.OBJECT, object_group_ids)
+
+
+def mark_object_groups_dirty(object_group_ids: Iterable[int | None]):
+    """Mark object group documents and the documents of their projects."""
+    ids = {og_id for og_id in object_group_ids if og_id is not None}
+    if not ids:
+        return
+    project_ids = RunObjectGroup.objects.filter(objectgroup_id__in=ids).values_list(
+        "run__project_id", flat=True
+    )
+    _mark(CatalogDirtyDocument.Category.OBJECT, ids)
+    _mark(CatalogDirtyDocument.Category.PROJECT, project_ids)
+
+
+def mark_documents_dirty(document_ids: Iterable[str]):
+    """Mark documents from their catalog ids ("project-1", "object-2")."""
+    object_ids: dict[str, set[int]] = {}
+    for document_id in document_ids:
+        category, _, object_id = document_id.rpartition("-")
+        object_ids.setdefault(category, set()).add(int(object_id))
+    for category, ids in object_ids.items():
+        _mark(CatalogDirtyDocument.Category(category), ids)
+
+
+def get_dirty_documents() -> DirtyDocuments:
+    """Return the documents marked dirty. They must be read before the data
+    they are indexed from."""
+    documents = DirtyDocuments()
+    for (
+        mark_id,
+        category,
+        object_id,
+        marked_at,
+    ) in CatalogDirtyDocument.objects.values_list(
+        "id", "category", "object_id", "marked_at"
+    ):
+        if category == CatalogDirtyDocument.Category.PROJECT:
+            documents.project_ids.add(object_id)
+        else:
+            documents.object_group_ids.add(object_id)
+        documents.mark_ids.setdefault(marked_at, []).append(mark_id)
+    return documents
+
+
+def clear_dirty_documents(documents: DirtyDocuments):
+    """Forget the marks read by get_dirty_documents. A mark is set when its
+    statement runs, not when its transaction commits: marks committed or set
+    again after the read are kept for the next run, whatever their marked_at."""
+    conditions = [
+        Q(marked_at=marked_at, id__in=mark_ids)
+        for marked_at, mark_ids in documents.mark_ids.items()
+    ]
+    for index in range(0, len(conditions), CLEAR_CHUNK_SIZE):
+        condition = Q()
+        for mark_condition in itertools.islice(
+            conditions, index, index + CLEAR_CHUNK_SIZE
+        ):
+            condition |= mark_condition
+        CatalogDirtyDocument.objects.filter(condition).delete()
+
+
+def _mark(category: CatalogDirtyDocument.Category, object_ids: Iterable[int]):
+    now = timezone.now()
+    CatalogDirtyDocument.objects.bulk_create(
+        [
+            CatalogDirtyDocument(category=category, object_id=object_id, marked_at=now)
+            for object_id in set(object_ids)
+        ],
+        update_conflicts=True,
+        unique_fields=["category", "object_id"],
+        update_fields=["marked_at"],
+    )
@@ -1,12 +1,10 @@
-import os
 from datetime import datetime, timedelta, timezone
 
-import requests
 import sentry_sdk
 from django.contrib.auth.models import Group
 from django.core.management.base import BaseCommand
 
-from euphro_auth.jwt.tokens import EuphroToolsAPIToken
+from euphro_tools import client
 from lab.emails import send_long_lasting_email
 
 from ...models import Project
@@ -33,7 +31,6 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        token = EuphroToolsAPIToken.for_euphrosyne().access_token
         self.stdout.write(
             "[long running vms] Making request to Euphrosyne Tools",
         )
@@ -43,11 +40,8 @@ class Command(BaseCommand):
         )
         # Format without space before timezone to avoid parsing error
         formatted_time = started_from.strftime("%Y-%m-%dT%H:%M:%SZ")
-        response = requests.get(
-            os.environ["EUPHROSYNE_TOOLS_API_URL"]
-            + f"/vms?created_before={formatted_time}",
-            timeout=10,
-            headers={"Authorization": f"Bearer {token}"},
+        response = client.request(
+            "GET", f"/vms?created_before={formatted_time}", timeout=10
         )
         if not response.ok:
             self.stderr.write(
@@ -1,11 +1,9 @@
-import os
-
 import requests
 import sentry_sdk
 from django.apps import apps
 from django.core.management.base import BaseCommand
 
-from euphro_auth.jwt.tokens import EuphroToolsAPIToken
+from euphro_tools import client
 
 from ...models import Project
 
@@ -28,18 +26,17 @@ class Command(BaseCommand):
             projects = projects.filter(project_data__lifecycle_state=LifecycleState.HOT)
         if not projects:
             return
-        token = EuphroToolsAPIToken.for_euphrosyne().access_token
         for project in projects:
             self.stdout.write(
                 "[data availability] Checking project %s" % project.name,
             )
 
             try:
-                response = requests.get(
-                    os.environ["EUPHROSYNE_TOOLS_API_URL"]
-                    + f"/data/available/{project.slug}",
+                response = client.request(
+                    "GET",
+                    f"/data/available/{project.slug}",
+                    endpoint="GET data/available/{project}",
                     timeout=10,
-                    headers={"Authorization": f"Bearer {token}"},
                 )
                 if not response.ok:
                     self.stderr.write(
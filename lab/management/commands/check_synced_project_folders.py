@@ -1,11 +1,10 @@
-import os
 import typing
 
 import requests
 import sentry_sdk
 from django.core.management.base import BaseCommand
 
-from euphro_auth.jwt.tokens import EuphroToolsAPIToken
+from euphro_tools import client
 
 from ...models import Project
 
@@ -23,14 +22,14 @@ class Command(BaseCommand):
         project_slugs = Project.objects.values_list("slug", flat=True)
         if not project_slugs:
             return
-        token = EuphroToolsAPIToken.for_euphrosyne().access_token
         results: ResponseBody | None = None
         try:
-            response = requests.post(
-                os.environ["EUPHROSYNE_TOOLS_API_URL"] + "/data/check-folders-sync",
+            response = client.request(
+                "POST",
+                "/data/check-folders-sync",
                 json={"project_slugs": list(project_slugs)},
-                timeout=5,
-                headers={"Authorization": f"Bearer {token}"},
+                # Read only
+                idempotent=True,
             )
             if not response.ok:
                 self.stderr.write(
@@ -1,9 +1,25 @@
+import json
 import logging
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from ...elasticsearch.client import CatalogClient
-from ...models import Project
+from ...elasticsearch import instrumentation
+from ...elasticsearch.client import (
+    BulkIndexReport,
+    CatalogClient,
+    CatalogIndexError,
+    get_catalog_projects,
+)
+from ...elasticsearch.instrumentation import IndexingStats
+from ...elasticsearch.parallel import index_in_parallel
+from ...elasticsearch.snapshot import export_snapshot
+from ...elasticsearch.tracking import (
+    DirtyDocuments,
+    clear_dirty_documents,
+    get_dirty_documents,
+    mark_documents_dirty,
+)
+from ...thesauri.opentheso import refresh_dating_parent_ids
 
 logger = logging.getLogger(__name__)
 
@@ -15,22 +31,163 @@ class Command(BaseCommand):
             action="store_true",
             help="Skip indexing of EROS-related projects",
         )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Only re-index documents changed since the last run "
+                "(falls back to a full rebuild when no catalog is published yet)"
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes building documents in a full rebuild",
+        )
+        parser.add_argument(
+            "--snapshot",
+            help="Directory where to export a static snapshot of the catalog",
+        )
+        parser.add_argument(
+            "--report",
+            help="Path of a JSON file where to write the timings and counters",
+        )
 
     def handle(self, *args, **options):
-        projects = (
-            Project.objects.only_finished()
-            .only_public()
-            .order_by("-created")
-            .prefetch_related("runs__run_object_groups")
-            .distinct()
-        )
-        self.stdout.write(f"Found {len(projects)} projects to index")
+        with instrumentation.collect_stats() as stats:
+            self._run(options)
+        self._write_stats(stats, options["report"])
 
+    def _run(self, options):
         # Get client instance
         catalog_client = CatalogClient()
 
-        # Delete the index if it exists
-        catalog_client.delete_index()
+        if options["incremental"] and catalog_client.is_rebuild_in_progress():
+            # Updates written to the live generation would be lost on swap
+            self.stdout.write("A catalog rebuild is in progress, skipping")
+            return
+
+        # Fetch missing & expired dating hierarchies once, instead of calling
+        # OpenTheso while building documents
+        with instrumentation.phase("opentheso"):
+            refreshed, failed = refresh_dating_parent_ids()
+        instrumentation.count("opentheso_calls", refreshed + failed)
+        if refreshed or failed:
+            self.stdout.write(
+                f"Refreshed {refreshed} dating hierarchies ({failed} failed)"
+            )
+
+        # Read before the indexed data: changes committed from now on are kept
+        # for the next run
+        dirty_documents = get_dirty_documents()
+        incremental = bool(
+            options["incremental"] and catalog_client.get_live_index_generations()
+        )
+        if incremental:
+            report = self._index_changes(
+                catalog_client, dirty_documents, options["skip_eros"]
+            )
+        else:
+            report = self._rebuild(
+                catalog_client, options["skip_eros"], options["workers"]
+            )
+        clear_dirty_documents(dirty_documents)
+        # Failed documents are retried on the next incremental run
+        mark_documents_dirty(str(item["_id"]) for item in report.failed)
+
+        # Suggestions are aggregated from the whole catalog: only rebuild them
+        # when it changed
+        if not incremental or report.indexed or report.deleted:
+            with instrumentation.phase("suggestions"):
+                count = catalog_client.rebuild_suggestions()
+            self.stdout.write(f"Built {count} typeahead suggestions")
+
+        if options["snapshot"]:
+            with instrumentation.phase("snapshot"):
+                snapshot_report = export_snapshot(options["snapshot"], catalog_client)
+            self.stdout.write(
+                f"Exported a snapshot of {snapshot_report.items} documents "
+                f"({snapshot_report.written} files written, "
+                f"{snapshot_report.deleted} deleted)"
+            )
+
+    def _index_changes(
+        self,
+        catalog_client: CatalogClient,
+        dirty_documents: DirtyDocuments,
+        skip_eros,
+    ) -> BulkIndexReport:
+        self.stdout.write(
+            f"Found {len(dirty_documents.project_ids)} projects and "
+            f"{len(dirty_documents.object_group_ids)} object groups to update"
+        )
+        report = catalog_client.index_changes(
+            dirty_documents.project_ids,
+            dirty_documents.object_group_ids,
+            skip_eros=skip_eros,
+        )
+        self.stdout.write(
+            f"Indexed {report.indexed} documents, deleted {report.deleted} "
+            f"({report.failed_count} failed)"
+        )
+        self._write_failures(report)
+        return report
+
+    def _rebuild(
+        self, catalog_client: CatalogClient, skip_eros, workers: int
+    ) -> BulkIndexReport:
+        projects = get_catalog_projects()
+        self.stdout.write(f"Found {len(projects)} projects to index")
+
+        # Build a new index generation, invisible to search until published
+        index_name = catalog_client.create_index_generation()
+        if workers > 1:
+            report = index_in_parallel(workers, index_name, skip_eros=skip_eros)
+        else:
+            report = catalog_client.index_from_projects(
+                projects, skip_eros=skip_eros, index_name=index_name
+            )
+        self.stdout.write(
+            f"Indexed {report.indexed} documents ({report.failed_count} failed)"
+        )
+        self._write_failures(report)
+
+        # Swap the catalog alias to the new generation
+        try:
+            with instrumentation.phase("publish"):
+                catalog_client.publish_index_generation(
+                    index_name, expected_count=report.indexed
+                )
+        except CatalogIndexError as error:
+            catalog_client.delete_index(index_name)
+            raise CommandError(f"Catalog index was not published: {error}") from error
+        self.stdout.write(f"Catalog now served from {index_name}")
+
+        deleted = catalog_client.delete_old_index_generations()
+        if deleted:
+            self.stdout.write(f"Deleted old index generations: {', '.join(deleted)}")
+        return report
+
+    def _write_failures(self, report: BulkIndexReport):
+        if report.failed_count:
+            self.stderr.write(
+                "Failed documents: "
+                + ", ".join(str(item.get("_id")) for item in report.failed)
+            )
 
-        # First, index all public projects (updates existing entries)
-        catalog_client.index_from_projects(projects, skip_eros=options["skip_eros"])
+    def _write_stats(self, stats: IndexingStats, report_path: str | None):
+        self.stdout.write(f"{'Phase':<16}{'Seconds':>10}{'Share':>8}")
+        for name, seconds in sorted(
+            stats.phases.items(), key=lambda phase: phase[1], reverse=True
+        ):
+            share = seconds / stats.wall_time if stats.wall_time else 0
+            self.stdout.write(f"{name:<16}{seconds:>10.2f}{share:>8.0%}")
+        self.stdout.write(f"{'total (wall)':<16}{stats.wall_time:>10.2f}")
+        for name, value in sorted(stats.counters.items()):
+            self.stdout.write(f"{name:<24}{value:>10}")
+        logger.info("Catalog indexing stats: %s", json.dumps(stats.to_dict()))
+        if report_path:
+            with open(report_path, "w", encoding="utf-8") as report_file:
+                json.dump(stats.to_dict(), report_file, indent=2)
+            self.stdout.write(f"Report written to {report_path}")
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from ...thesauri.models import ConceptHierarchy
+from ...thesauri.opentheso import refresh_dating_parent_ids
+
+
+class Command(BaseCommand):
+    help = "Fetch parent IDs of periods and eras from OpenTheso and store them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Refresh all concepts, even the ones which have not expired",
+        )
+
+    def handle(self, *args, **options):
+        refreshed, failed = refresh_dating_parent_ids(force=options["force"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{refreshed} concept hierarchies refreshed.")
+        )
+        if failed:
+            self.stderr.write(f"{failed} concept hierarchies could not be fetched:")
+            for hierarchy in ConceptHierarchy.objects.filter(
+                failed_at__isnull=False
+            ).order_by("theso_id", "concept_id"):
+                self.stderr.write(
+                    f"- {hierarchy} ({hierarchy.failure_count} failures): "
+                    f"{hierarchy.last_error}"
+                )
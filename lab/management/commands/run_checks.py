@@ -12,6 +12,9 @@ class Command(BaseCommand):
         management.call_command("check_synced_project_folders")
         management.call_command("check_long_running_vms", "1440", "--send-alerts")
         if apps.is_installed("data_management"):
+            # Free projects blocked by stuck operations before scheduling
+            management.call_command("reconcile_lifecycle_operations")
             management.call_command("schedule_project_cooling")
+            management.call_command("refresh_lifecycle_operation_stats")
         if apps.is_installed("radiation_protection"):
             management.call_command("send_employer_information_reminders")
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.7 on 2026-10-18 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lab", "0054_normalize_employer_names"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogDirtyDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[("project", "Project"), ("object", "Object")],
+                        max_length=16,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("marked_at", models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("category", "object_id"),
+                        name="catalog_dirty_document_unique_category_object_id",
+                    )
+                ],
+            },
+        ),
+    ]
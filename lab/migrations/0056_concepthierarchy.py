@@ -0,0 +1,48 @@
+# Generated by Django 6.0.7 on 2026-10-18 03:00
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("lab", "0055_catalogdirtydocument"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConceptHierarchy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("theso_id", models.CharField(max_length=255)),
+                ("concept_id", models.CharField(max_length=255)),
+                (
+                    "parent_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255), default=list
+                    ),
+                ),
+                ("fetched_at", models.DateTimeField(blank=True, null=True)),
+                ("failed_at", models.DateTimeField(blank=True, null=True)),
+                ("failure_count", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("theso_id", "concept_id"),
+                        name="concept_hierarchy_unique_theso_id_concept_id",
+                    )
+                ],
+            },
+        ),
+    ]
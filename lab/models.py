@@ -1,5 +1,6 @@
 # pylint: disable=unused-import
 
+from .elasticsearch.models import CatalogDirtyDocument  # noqa: F401
 from .objects import (  # noqa: F401
     Location,
     Object,
@@ -11,3 +12,4 @@ from .objects import (  # noqa: F401
 from .participations.models import Institution, Participation  # noqa: F401
 from .projects.models import BeamTimeRequest, Project  # noqa: F401
 from .runs.models import Run  # noqa: F401
+from .thesauri.models import ConceptHierarchy  # noqa: F401
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
@@ -194,22 +194,26 @@ class Project(TimestampedModel):
     def status(self) -> Status:
         if self.is_data_available:
             return self.Status.DATA_AVAILABLE
-        runs_with_start_date = self.runs.filter(start_date__isnull=False).values(
-            "start_date", "end_date"
+        return self.status_from_runs(
+            self.runs.filter(start_date__isnull=False).only("start_date", "end_date")
         )
+
+    def status_from_runs(self, runs: Iterable[Run]) -> Status:
+        """Compute the project status from already loaded runs, to avoid
+        querying the runs of each project in batch processing."""
+        if self.is_data_available:
+            return self.Status.DATA_AVAILABLE
+        runs_with_start_date = [run for run in runs if run.start_date]
         if len(runs_with_start_date):
             if any(
-                run["start_date"] and timezone.now() < run["start_date"]
+                run.start_date and timezone.now() < run.start_date
                 for run in runs_with_start_date
             ):
                 return self.Status.SCHEDULED
             if any(
-                run["start_date"]
-                and run["end_date"]
-                and (
-                    timezone.now() > run["start_date"]
-                    and timezone.now() < run["end_date"]
-                )
+                run.start_date
+                and run.end_date
+                and (timezone.now() > run.start_date and timezone.now() < run.end_date)
                 for run in runs_with_start_date
             ):
                 return self.Status.ONGOING
@@ -2,6 +2,7 @@ from typing import Literal, Optional
 
 from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 
 from euphro_auth.models import User
@@ -70,8 +71,11 @@ def change_state(_modeladmin, request, queryset):
     except ValidationError as exception:
         send_message(request, exception.message, "error")
     else:
+        # Side effects of run saves (e.g. project eligibility) are applied once
+        with transaction.atomic():
+            for run in queryset:
+                change_status(run)
         for run in queryset:
-            change_status(run)
             send_message(
                 request,
                 _("Run {} successfully moved to status: {}.").format(
@@ -28,6 +28,7 @@ def changelist_request():
     return RequestFactory().get(reverse("admin:lab_run_changelist"))
 
 
+@pytest.mark.django_db
 @mock.patch.object(admin_actions, "validate_mandatory_fields", mock.Mock())
 @mock.patch.object(admin_actions, "validate_1_method_required", mock.Mock())
 @mock.patch.object(admin_actions, "validate_not_last_state", mock.Mock())
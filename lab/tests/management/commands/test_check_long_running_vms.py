@@ -12,13 +12,12 @@ from ...factories import ProjectFactory
 class CheckLongRunningVMsTest(TestCase):
     def setUp(self):
         self.token_patcher = patch(
-            "euphro_auth.jwt.tokens.EuphroToolsAPIToken.for_euphrosyne"
+            "euphro_tools.utils._get_euphrosyne_token", return_value="fake_token"
         )
-        self.mock_token = self.token_patcher.start()
-        self.mock_token.return_value.access_token = "fake_token"
+        self.token_patcher.start()
 
-        self.get_patcher = patch("requests.get")
-        self.mock_get = self.get_patcher.start()
+        self.get_patcher = patch("euphro_tools.client.get_session")
+        self.mock_get = self.get_patcher.start().return_value.request
         self.mock_get.return_value.ok = True
 
         self.now = datetime.now(timezone.utc)
@@ -52,6 +51,7 @@ class CheckLongRunningVMsTest(TestCase):
         call_command("check_long_running_vms", "60")
 
         self.mock_get.assert_called_once_with(
+            "GET",
             self._get_expected_api_call(60),
             timeout=10,
             headers={"Authorization": "Bearer fake_token"},
@@ -63,6 +63,7 @@ class CheckLongRunningVMsTest(TestCase):
         call_command("check_long_running_vms", "60")
 
         self.mock_get.assert_called_once_with(
+            "GET",
             self._get_expected_api_call(60),
             timeout=10,
             headers={"Authorization": "Bearer fake_token"},
@@ -81,6 +82,7 @@ class CheckLongRunningVMsTest(TestCase):
         call_command("check_long_running_vms", "60", "--send-alerts")
 
         self.mock_get.assert_called_once_with(
+            "GET",
             self._get_expected_api_call(60),
             timeout=10,
             headers={"Authorization": "Bearer fake_token"},
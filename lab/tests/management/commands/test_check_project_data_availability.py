@@ -27,15 +27,12 @@ def test_check_project_data_availability_only_checks_hot_projects():
 
     with (
         mock.patch(
-            "lab.management.commands.check_project_data_availability."
-            "EuphroToolsAPIToken.for_euphrosyne"
-        ) as token_mock,
-        mock.patch(
-            "lab.management.commands.check_project_data_availability.requests.get",
-            return_value=_available_response(available=True),
-        ) as get_mock,
+            "euphro_tools.utils._get_euphrosyne_token", return_value="fake-token"
+        ),
+        mock.patch("euphro_tools.client.get_session") as session_mock,
     ):
-        token_mock.return_value.access_token = "fake-token"
+        get_mock = session_mock.return_value.request
+        get_mock.return_value = _available_response(available=True)
 
         call_command("check_project_data_availability", stdout=StringIO())
 
@@ -45,6 +42,7 @@ def test_check_project_data_availability_only_checks_hot_projects():
     assert hot_project.is_data_available is True
     assert cooling_project.is_data_available is False
     get_mock.assert_called_once_with(
+        "GET",
         os.environ["EUPHROSYNE_TOOLS_API_URL"] + f"/data/available/{hot_project.slug}",
         timeout=10,
         headers={"Authorization": "Bearer fake-token"},
@@ -63,23 +61,20 @@ def test_check_project_data_availability_checks_all_projects_without_data_manage
 
     with (
         mock.patch(
-            "lab.management.commands.check_project_data_availability."
-            "EuphroToolsAPIToken.for_euphrosyne"
-        ) as token_mock,
+            "euphro_tools.utils._get_euphrosyne_token", return_value="fake-token"
+        ),
         mock.patch(
             "lab.management.commands.check_project_data_availability.apps.is_installed",
             return_value=False,
         ),
-        mock.patch(
-            "lab.management.commands.check_project_data_availability.requests.get",
-            return_value=_available_response(available=False),
-        ) as get_mock,
+        mock.patch("euphro_tools.client.get_session") as session_mock,
     ):
-        token_mock.return_value.access_token = "fake-token"
+        get_mock = session_mock.return_value.request
+        get_mock.return_value = _available_response(available=False)
 
         call_command("check_project_data_availability", stdout=StringIO())
 
-    requested_urls = {call.args[0] for call in get_mock.call_args_list}
+    requested_urls = {call.args[1] for call in get_mock.call_args_list}
 
     assert get_mock.call_count == 2
     assert requested_urls == {
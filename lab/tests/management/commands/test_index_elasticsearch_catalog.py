@@ -0,0 +1,195 @@
+import json
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from lab.elasticsearch.client import BulkIndexReport, CatalogIndexError
+from lab.elasticsearch.snapshot import SnapshotReport
+from lab.elasticsearch.tracking import get_dirty_documents, mark_documents_dirty
+
+COMMAND_MODULE = "lab.management.commands.index_elasticsearch_catalog"
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_publishes_new_generation():
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.create_index_generation.return_value = "catalog-20250101000000"
+        client.index_from_projects.return_value = BulkIndexReport(indexed=3)
+        client.delete_old_index_generations.return_value = []
+
+        call_command("index_elasticsearch_catalog", stdout=StringIO())
+
+    client.index_from_projects.assert_called_once()
+    assert (
+        client.index_from_projects.call_args.kwargs["index_name"]
+        == "catalog-20250101000000"
+    )
+    client.publish_index_generation.assert_called_once_with(
+        "catalog-20250101000000", expected_count=3
+    )
+    client.delete_old_index_generations.assert_called_once()
+    client.delete_index.assert_not_called()
+    client.rebuild_suggestions.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_discards_generation_failing_sanity_check():
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.create_index_generation.return_value = "catalog-20250101000000"
+        client.index_from_projects.return_value = BulkIndexReport(indexed=0)
+        client.publish_index_generation.side_effect = CatalogIndexError("empty")
+
+        with pytest.raises(CommandError):
+            call_command("index_elasticsearch_catalog", stdout=StringIO())
+
+    client.delete_index.assert_called_once_with("catalog-20250101000000")
+    client.delete_old_index_generations.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_incremental_indexes_dirty_documents():
+    mark_documents_dirty(["project-1", "object-2"])
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.is_rebuild_in_progress.return_value = False
+        client.get_live_index_generations.return_value = ["catalog-20250101000000"]
+        client.index_changes.return_value = BulkIndexReport(
+            indexed=1, failed=[{"_id": "object-2", "status": 500}]
+        )
+
+        call_command("index_elasticsearch_catalog", "--incremental", stdout=StringIO())
+
+    client.index_changes.assert_called_once_with({1}, {2}, skip_eros=False)
+    client.create_index_generation.assert_not_called()
+    # Failed documents are kept for the next run
+    assert get_dirty_documents().object_group_ids == {2}
+    assert not get_dirty_documents().project_ids
+    client.rebuild_suggestions.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_incremental_keeps_documents_marked_meanwhile():
+    mark_documents_dirty(["project-1"])
+
+    def index_changes(*args, **kwargs):
+        mark_documents_dirty(["project-1"])
+        return BulkIndexReport(indexed=1)
+
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.is_rebuild_in_progress.return_value = False
+        client.get_live_index_generations.return_value = ["catalog-20250101000000"]
+        client.index_changes.side_effect = index_changes
+
+        call_command("index_elasticsearch_catalog", "--incremental", stdout=StringIO())
+
+    assert get_dirty_documents().project_ids == {1}
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_incremental_keeps_suggestions_without_changes():
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.is_rebuild_in_progress.return_value = False
+        client.get_live_index_generations.return_value = ["catalog-20250101000000"]
+        client.index_changes.return_value = BulkIndexReport()
+
+        call_command("index_elasticsearch_catalog", "--incremental", stdout=StringIO())
+
+    client.rebuild_suggestions.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_incremental_skips_during_rebuild():
+    mark_documents_dirty(["project-1"])
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.is_rebuild_in_progress.return_value = True
+
+        call_command("index_elasticsearch_catalog", "--incremental", stdout=StringIO())
+
+    client.index_changes.assert_not_called()
+    assert get_dirty_documents().project_ids == {1}
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_incremental_falls_back_to_rebuild():
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.is_rebuild_in_progress.return_value = False
+        client.get_live_index_generations.return_value = []
+        client.create_index_generation.return_value = "catalog-20250101000000"
+        client.index_from_projects.return_value = BulkIndexReport(indexed=3)
+        client.delete_old_index_generations.return_value = []
+
+        call_command("index_elasticsearch_catalog", "--incremental", stdout=StringIO())
+
+    client.index_changes.assert_not_called()
+    client.publish_index_generation.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_with_workers():
+    with (
+        mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls,
+        mock.patch(f"{COMMAND_MODULE}.index_in_parallel") as index_in_parallel_mock,
+    ):
+        client = client_cls.return_value
+        client.create_index_generation.return_value = "catalog-20250101000000"
+        client.delete_old_index_generations.return_value = []
+        index_in_parallel_mock.return_value = BulkIndexReport(indexed=3)
+
+        call_command("index_elasticsearch_catalog", "--workers", "4", stdout=StringIO())
+
+    index_in_parallel_mock.assert_called_once_with(
+        4, "catalog-20250101000000", skip_eros=False
+    )
+    client.index_from_projects.assert_not_called()
+    client.publish_index_generation.assert_called_once_with(
+        "catalog-20250101000000", expected_count=3
+    )
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_writes_stats_report(tmp_path):
+    report_path = tmp_path / "report.json"
+    stdout = StringIO()
+    with mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls:
+        client = client_cls.return_value
+        client.create_index_generation.return_value = "catalog-20250101000000"
+        client.index_from_projects.return_value = BulkIndexReport(indexed=3)
+        client.delete_old_index_generations.return_value = []
+
+        call_command(
+            "index_elasticsearch_catalog", report=str(report_path), stdout=stdout
+        )
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["wall_time"] > 0
+    assert "publish" in report["phases"]
+    assert "suggestions" in report["phases"]
+    assert report["counters"]["sql_queries"] > 0
+    assert "total (wall)" in stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_index_elasticsearch_catalog_exports_snapshot(tmp_path):
+    with (
+        mock.patch(f"{COMMAND_MODULE}.CatalogClient") as client_cls,
+        mock.patch(f"{COMMAND_MODULE}.export_snapshot") as export_snapshot_mock,
+    ):
+        client = client_cls.return_value
+        client.create_index_generation.return_value = "catalog-20250101000000"
+        client.index_from_projects.return_value = BulkIndexReport(indexed=3)
+        client.delete_old_index_generations.return_value = []
+        export_snapshot_mock.return_value = SnapshotReport(items=3, written=5)
+
+        call_command(
+            "index_elasticsearch_catalog", snapshot=str(tmp_path), stdout=StringIO()
+        )
+
+    export_snapshot_mock.assert_called_once_with(str(tmp_path), client)
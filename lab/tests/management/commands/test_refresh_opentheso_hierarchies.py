@@ -0,0 +1,39 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from lab.thesauri.models import ConceptHierarchy
+from lab.thesauri.opentheso import OpenthesoError
+
+from ...factories import EraFactory, PeriodFactory
+
+
+@pytest.mark.django_db
+@mock.patch(
+    "lab.thesauri.opentheso.fetch_parent_ids_from_id",
+    side_effect=[["A"], OpenthesoError("Invalid response.")],
+)
+def test_refresh_opentheso_hierarchies(_):
+    PeriodFactory(concept_id="period")
+    EraFactory(concept_id="era")
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command("refresh_opentheso_hierarchies", stdout=stdout, stderr=stderr)
+
+    assert "1 concept hierarchies refreshed." in stdout.getvalue()
+    assert "th289/era (1 failures): Invalid response." in stderr.getvalue()
+    assert ConceptHierarchy.objects.get(concept_id="period").parent_ids == ["A"]
+
+
+@pytest.mark.django_db
+@mock.patch(
+    "lab.management.commands.refresh_opentheso_hierarchies.refresh_dating_parent_ids"
+)
+def test_refresh_opentheso_hierarchies_force(refresh_mock: mock.MagicMock):
+    refresh_mock.return_value = (0, 0)
+
+    call_command("refresh_opentheso_hierarchies", "--force", stdout=StringIO())
+
+    refresh_mock.assert_called_once_with(force=True)
@@ -30,3 +30,28 @@ class TestRunChecksCommand(TestCase):
         assert mock.call("send_employer_information_reminders") not in (
             mock_call_command.call_args_list
         )
+
+    @mock.patch("lab.management.commands.run_checks.apps.is_installed")
+    @mock.patch("lab.management.commands.run_checks.management.call_command")
+    def test_reconciles_lifecycle_operations_before_scheduling_cooling(
+        self, mock_call_command, mock_is_installed
+    ):
+        mock_is_installed.side_effect = lambda app_name: app_name == "data_management"
+
+        call_command("run_checks")
+
+        called_commands = [call.args[0] for call in mock_call_command.call_args_list]
+        assert called_commands.index(
+            "reconcile_lifecycle_operations"
+        ) < called_commands.index("schedule_project_cooling")
+
+    @mock.patch("lab.management.commands.run_checks.apps.is_installed")
+    @mock.patch("lab.management.commands.run_checks.management.call_command")
+    def test_refreshes_lifecycle_operation_stats(
+        self, mock_call_command, mock_is_installed
+    ):
+        mock_is_installed.side_effect = lambda app_name: app_name == "data_management"
+
+        call_command("run_checks")
+
+        mock_call_command.assert_any_call("refresh_lifecycle_operation_stats")
@@ -1,6 +1,20 @@
+import datetime
 from unittest import mock
 
-from ..thesauri.opentheso import fetch_parent_ids_from_id
+import pytest
+import requests
+from django.utils import timezone
+
+from ..thesauri.models import ConceptHierarchy
+from ..thesauri.opentheso import (
+    OpenthesoError,
+    fetch_parent_ids_from_id,
+    get_era_parent_ids,
+    get_parent_ids,
+    refresh_dating_parent_ids,
+    refresh_parent_ids,
+)
+from .factories import EraFactory, PeriodFactory
 
 
 @mock.patch("lab.thesauri.opentheso.requests")
@@ -19,3 +33,95 @@ def test_fetch_parent_ids_from_id(request_mock: mock.MagicMock):
         headers={"Accept": "application/json"},
         timeout=5,
     )
+
+
+@mock.patch("lab.thesauri.opentheso.requests.get")
+def test_fetch_parent_ids_from_id_raises_on_error(get_mock: mock.MagicMock):
+    get_mock.return_value.ok = False
+    with pytest.raises(OpenthesoError):
+        fetch_parent_ids_from_id("theso_id", "concept_id")
+
+    get_mock.side_effect = requests.exceptions.Timeout
+    with pytest.raises(OpenthesoError):
+        fetch_parent_ids_from_id("theso_id", "concept_id")
+
+
+@pytest.mark.django_db
+@mock.patch("lab.thesauri.opentheso.fetch_parent_ids_from_id", return_value=["A", "B"])
+def test_refresh_parent_ids_stores_missing_and_expired_concepts(
+    fetch_mock: mock.MagicMock,
+):
+    now = timezone.now()
+    ConceptHierarchy.objects.create(
+        theso_id="th1", concept_id="fresh", parent_ids=["X"], fetched_at=now
+    )
+    ConceptHierarchy.objects.create(
+        theso_id="th1",
+        concept_id="expired",
+        parent_ids=["X"],
+        fetched_at=now - datetime.timedelta(days=31),
+    )
+
+    assert refresh_parent_ids(
+        [("th1", "fresh"), ("th1", "expired"), ("th1", "new")]
+    ) == (2, 0)
+
+    assert fetch_mock.call_count == 2
+    assert get_parent_ids([("th1", "fresh"), ("th1", "expired"), ("th1", "new")]) == {
+        ("th1", "fresh"): ["X"],
+        ("th1", "expired"): ["A", "B"],
+        ("th1", "new"): ["A", "B"],
+    }
+
+
+@pytest.mark.django_db
+@mock.patch(
+    "lab.thesauri.opentheso.fetch_parent_ids_from_id",
+    side_effect=OpenthesoError("503 Unavailable"),
+)
+def test_refresh_parent_ids_records_failures(fetch_mock: mock.MagicMock):
+    ConceptHierarchy.objects.create(
+        theso_id="th1",
+        concept_id="expired",
+        parent_ids=["X"],
+        fetched_at=timezone.now() - datetime.timedelta(days=31),
+    )
+
+    assert refresh_parent_ids([("th1", "expired"), ("th1", "new")]) == (0, 2)
+
+    # Stale parent ids are kept, never fetched concepts are not returned
+    assert get_parent_ids([("th1", "expired"), ("th1", "new")]) == {
+        ("th1", "expired"): ["X"]
+    }
+    hierarchy = ConceptHierarchy.objects.get(concept_id="new")
+    assert hierarchy.failure_count == 1
+    assert hierarchy.last_error == "503 Unavailable"
+    assert hierarchy.failed_at
+
+    # Failed concepts are not retried right away, unless forced
+    assert refresh_parent_ids([("th1", "expired"), ("th1", "new")]) == (0, 0)
+    assert refresh_parent_ids([("th1", "new")], force=True) == (0, 1)
+    assert fetch_mock.call_count == 3
+    assert ConceptHierarchy.objects.get(concept_id="new").failure_count == 2
+
+
+@pytest.mark.django_db
+@mock.patch("lab.thesauri.opentheso.fetch_parent_ids_from_id", return_value=["A"])
+def test_refresh_dating_parent_ids(fetch_mock: mock.MagicMock):
+    PeriodFactory(concept_id="period")
+    era = EraFactory(concept_id="era")
+    EraFactory(concept_id=None)
+
+    assert refresh_dating_parent_ids() == (2, 0)
+
+    assert fetch_mock.call_count == 2
+    assert get_era_parent_ids(era.concept_id) == ["A"]
+    assert get_era_parent_ids("unknown") == []
+
+
+@pytest.mark.django_db
+def test_get_parent_ids_without_concepts_does_not_query(
+    django_assert_num_queries,
+):
+    with django_assert_num_queries(0):
+        assert get_parent_ids([]) == {}
@@ -1,3 +1,4 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 
 
@@ -38,3 +39,29 @@ class Period(ThesorusConceptModel):
 
 class Era(ThesorusConceptModel):
     OPENTHESO_THESO_ID = "th289"
+
+
+class ConceptHierarchy(models.Model):
+    """Parent concept IDs of an OpenTheso concept, as returned by the OpenTheso
+    expansion API. Stored to avoid calling OpenTheso when indexing the catalog."""
+
+    theso_id = models.CharField(max_length=255)
+    concept_id = models.CharField(max_length=255)
+    parent_ids = ArrayField(models.CharField(max_length=255), default=list)
+    fetched_at = models.DateTimeField(null=True, blank=True)
+
+    # Last failed fetch, kept until the next successful one
+    failed_at = models.DateTimeField(null=True, blank=True)
+    failure_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["theso_id", "concept_id"],
+                name="concept_hierarchy_unique_theso_id_concept_id",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.theso_id}/{self.concept_id}"
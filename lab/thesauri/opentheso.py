@@ -1,16 +1,39 @@
+"""Parent IDs of OpenTheso concepts.
+
+Parent IDs are fetched from OpenTheso by `refresh_parent_ids` (run by the
+`refresh_opentheso_hierarchies` command and before indexing the catalog) and
+stored in the database. Readers only query the database."""
+
+import datetime
+import functools
 import logging
-from functools import lru_cache
+import operator
+from collections import defaultdict
+from typing import Iterable
 
 import requests
+from django.db.models import Q
+from django.utils import timezone
 from requests import JSONDecodeError
 
-from .models import Era, Period
+from .models import ConceptHierarchy, Era, Period
 
 logger = logging.getLogger(__name__)
 
+# Stored parent IDs are fetched again after this delay
+PARENT_IDS_TTL = datetime.timedelta(days=30)
+# Delay before fetching a concept again after a failure
+FAILED_FETCH_RETRY_DELAY = datetime.timedelta(hours=6)
+
+Concept = tuple[str, str]  # (theso_id, concept_id)
+
+
+class OpenthesoError(Exception):
+    """Raised when parent IDs can not be fetched from OpenTheso."""
+
 
-@lru_cache
 def fetch_parent_ids_from_id(theso_id: str, concept_id: str) -> list[str]:
+    """Fetch parent IDs of a concept from OpenTheso."""
     try:
         response = requests.get(
             # pylint: disable=line-too-long
@@ -19,36 +42,108 @@ def fetch_parent_ids_from_id(theso_id: str, concept_id: str) -> list[str]:
             timeout=5,
         )
     except requests.exceptions.RequestException as e:
-        logger.error("Failed to fetch parent ids from OpenTheso: %s", e)
-        return []
+        raise OpenthesoError(str(e)) from e
     if not response.ok:
-        logger.error(
-            "Failed to fetch parent ids from OpenTheso: %s %s",
-            response.status_code,
-            response.text,
-        )
-        return []
+        raise OpenthesoError(f"{response.status_code} {response.text}")
     try:
         data = response.json()
     except JSONDecodeError as e:
-        logger.error(
-            "Failed to fetch parent ids from OpenTheso. Invalid JSON. %s\n%s",
-            e,
-            response.text,
-        )
-        return []
+        raise OpenthesoError(f"Invalid JSON. {e}\n{response.text}") from e
     if data and isinstance(data, dict):
         # We exclude the first item as it is common to all branches
         return [key.split("/")[-1] for key, _ in list(data.items())[1:]]
-    logger.error(
-        "Failed to fetch parent ids from OpenTheso. Invalid response. %s", response.text
-    )
-    return []
+    raise OpenthesoError(f"Invalid response. {response.text}")
+
+
+def get_parent_ids(concepts: Iterable[Concept]) -> dict[Concept, list[str]]:
+    """Return stored parent IDs of concepts, with a single query. Concepts which
+    were never fetched successfully are missing from the result."""
+    return {
+        (hierarchy.theso_id, hierarchy.concept_id): hierarchy.parent_ids
+        for hierarchy in _filter_hierarchies(concepts).filter(fetched_at__isnull=False)
+    }
+
 
+def get_era_parent_ids(concept_id: str) -> list[str]:
+    concept = (str(Era.OPENTHESO_THESO_ID), concept_id)
+    return get_parent_ids([concept]).get(concept, [])
 
-def fetch_era_parent_ids_from_id(concept_id: str):
-    return fetch_parent_ids_from_id(Era.OPENTHESO_THESO_ID, concept_id)
 
+def get_period_parent_ids(concept_id: str) -> list[str]:
+    concept = (str(Period.OPENTHESO_THESO_ID), concept_id)
+    return get_parent_ids([concept]).get(concept, [])
 
-def fetch_period_parent_ids_from_id(concept_id: str):
-    return fetch_parent_ids_from_id(Period.OPENTHESO_THESO_ID, concept_id)
+
+def refresh_parent_ids(
+    concepts: Iterable[Concept], force: bool = False
+) -> tuple[int, int]:
+    """Fetch parent IDs of concepts which are not stored or expired, and store
+    them. Failures are recorded and previously stored parent IDs are kept.
+    Returns the number of refreshed and failed concepts."""
+    unique_concepts = set(concepts)
+    now = timezone.now()
+    hierarchies = {
+        (hierarchy.theso_id, hierarchy.concept_id): hierarchy
+        for hierarchy in _filter_hierarchies(unique_concepts)
+    }
+    refreshed, failed = 0, 0
+    for theso_id, concept_id in sorted(unique_concepts):
+        hierarchy = hierarchies.get(
+            (theso_id, concept_id),
+            ConceptHierarchy(theso_id=theso_id, concept_id=concept_id),
+        )
+        if not force and not _needs_refresh(hierarchy, now):
+            continue
+        try:
+            hierarchy.parent_ids = fetch_parent_ids_from_id(theso_id, concept_id)
+        except OpenthesoError as e:
+            logger.error(
+                "Failed to fetch parent ids of %s from OpenTheso: %s", hierarchy, e
+            )
+            hierarchy.failed_at = now
+            hierarchy.failure_count += 1
+            hierarchy.last_error = str(e)
+            failed += 1
+        else:
+            hierarchy.fetched_at = now
+            hierarchy.failed_at = None
+            hierarchy.failure_count = 0
+            hierarchy.last_error = ""
+            refreshed += 1
+        hierarchy.save()
+    return refreshed, failed
+
+
+def refresh_dating_parent_ids(force: bool = False) -> tuple[int, int]:
+    """Refresh parent IDs of all periods and eras (see refresh_parent_ids)."""
+    concepts: list[Concept] = []
+    for model in (Period, Era):
+        concepts.extend(
+            (str(model.OPENTHESO_THESO_ID), concept_id)
+            for concept_id in model.objects.values_list("concept_id", flat=True)
+            if concept_id
+        )
+    return refresh_parent_ids(concepts, force=force)
+
+
+def _needs_refresh(hierarchy: ConceptHierarchy, now: datetime.datetime) -> bool:
+    if hierarchy.failed_at and hierarchy.failed_at > now - FAILED_FETCH_RETRY_DELAY:
+        return False
+    return not hierarchy.fetched_at or hierarchy.fetched_at <= now - PARENT_IDS_TTL
+
+
+def _filter_hierarchies(concepts: Iterable[Concept]):
+    concept_ids_by_theso: defaultdict[str, set[str]] = defaultdict(set)
+    for theso_id, concept_id in concepts:
+        concept_ids_by_theso[theso_id].add(concept_id)
+    if not concept_ids_by_theso:
+        return ConceptHierarchy.objects.none()
+    return ConceptHierarchy.objects.filter(
+        functools.reduce(
+            operator.or_,
+            (
+                Q(theso_id=theso_id, concept_id__in=concept_ids)
+                for theso_id, concept_ids in concept_ids_by_theso.items()
+            ),
+        )
+    )